@@ -2,59 +2,295 @@
 Base GraphQL client for Stash API operations
 """
 
+import asyncio
+import functools
+import gzip
+import json
 import logging
-from typing import Dict, Optional
+import random
+import time
+from typing import Dict, Hashable, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.api.queries import FIND_JOB_QUERY
+from src.api.ttl_cache import MISS, TTLCache
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON codec; fall back to the stdlib
+    orjson = None
+
+try:
+    import h2  # noqa: F401  (required by httpx for HTTP/2)
+    import httpx
+except ImportError:  # Optional HTTP/2 transport; fall back to requests
+    httpx = None
+
+try:
+    import aiohttp
+except ImportError:  # Optional asyncio transport for concurrent fetches
+    aiohttp = None
+
+# Transport-level failures from whichever HTTP client is in use
+if httpx is not None:
+    _HTTP_ERRORS: Tuple[type, ...] = (requests.exceptions.RequestException, httpx.HTTPError)
+else:
+    _HTTP_ERRORS = (requests.exceptions.RequestException,)
 
 logger = logging.getLogger("stash_manager.api")
 
 
+def _json_dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Request bodies smaller than this are not worth compressing
+GZIP_MIN_BYTES = 4096
+
+# Gateway errors worth retrying; only read queries are retried, since a mutation
+# may already have been accepted by Stash before the proxy gave up
+RETRY_STATUSES = frozenset({502, 503, 504})
+READ_RETRIES = 3
+RETRY_BACKOFF = 0.5
+RETRY_JITTER = 0.25
+
+
+def _is_read_query(query: str) -> bool:
+    """True unless the GraphQL document is a mutation"""
+    return not query.lstrip().startswith("mutation")
+
+
+def _retry_delay(response, attempt: int) -> float:
+    """Seconds to wait before retrying, honouring a numeric Retry-After header"""
+    retry_after = response.headers.get("Retry-After")
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return RETRY_BACKOFF * 2**attempt + random.uniform(0, RETRY_JITTER)
+
+
+def _check_graphql_errors(result: Dict) -> None:
+    """Raise if a GraphQL response carries an errors list"""
+    if "errors" in result:
+        errors = result["errors"]
+        error_msg = "; ".join([error.get("message", "Unknown error") for error in errors])
+        logger.error(f"GraphQL errors: {error_msg}")
+        raise Exception(f"GraphQL errors: {error_msg}")
+
+
+def _read_streamed(response: requests.Response, chunk_size: int = 65536) -> bytearray:
+    """Read a streamed response body into a single growing buffer
+
+    Avoids the chunk list plus joined copy that Response.content holds at peak.
+    """
+    buf = bytearray()
+    for chunk in response.iter_content(chunk_size):
+        buf += chunk
+    return buf
+
+
+def encode_payload(query: str, variables: Optional[Dict] = None) -> bytes:
+    """Pre-serialize a constant GraphQL request body for reuse with execute_query"""
+    return _json_dumps({"query": query, "variables": variables or {}})
+
+
+# Everything before the job ID in a findJob request body, serialized once
+_FIND_JOB_PAYLOAD_HEAD = (
+    b'{"query":' + _json_dumps(FIND_JOB_QUERY) + b',"variables":{"input":{"id":'
+)
+
+
+@functools.lru_cache(maxsize=8)
+def _find_job_payload(job_id: str) -> bytes:
+    """Request body for polling one job; reused across every poll of that job"""
+    return _FIND_JOB_PAYLOAD_HEAD + _json_dumps(job_id) + b"}}}"
+
+
+def _cache_key(name: str, args: tuple, kwargs: Dict) -> Hashable:
+    return (name, args, tuple(sorted(kwargs.items())))
+
+
+def cached_query(method):
+    """Cache a read-only client method's result in the client's TTL cache.
+
+    Empty results are not cached so transient failures are retried.
+    """
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        key = _cache_key(method.__name__, args, kwargs)
+        value = self._query_cache.get(key)
+        if value is not MISS:
+            logger.debug("Cache hit for %s", method.__name__)
+            return value
+        value = method(self, *args, **kwargs)
+        if value:
+            self._query_cache.set(key, value)
+        return value
+
+    return wrapper
+
+
 class BaseStashClient:
     """Base client for GraphQL operations with Stash API"""
 
-    def __init__(self, url: str, api_key: str):
+    def __init__(self, url: str, api_key: str, compress_requests: bool = False):
         """Initialize the Stash API client
 
         Args:
             url: Base URL for the Stash API
             api_key: API key for authentication
+            compress_requests: Gzip large request bodies; only enable for servers
+                that accept Content-Encoding: gzip
         """
         self.url = url
+        self.compress_requests = compress_requests
         self.graphql_url = f"{url}/graphql"
         self.api_key = api_key
-        self.headers = {"Content-Type": "application/json", "ApiKey": api_key}
+        self.headers = {
+            "Content-Type": "application/json",
+            "ApiKey": api_key,
+            "Accept-Encoding": "gzip, deflate",
+        }
+
+        # Reuse one pooled session so every GraphQL call benefits from keep-alive
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            # POST is outside urllib3's default allowed_methods, so only failed
+            # connects are retried here; execute_query retries read queries itself
+            max_retries=Retry(total=3, backoff_factor=0.5),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+        # With httpx[http2] installed, concurrent calls multiplex over one connection
+        self.client = None
+        if httpx is not None:
+            self.client = httpx.Client(
+                headers=self.headers,
+                timeout=httpx.Timeout(60.0, connect=5.0),
+                transport=httpx.HTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                    retries=3,
+                ),
+            )
+
+        # Short-lived cache for repeated list queries within a job cycle
+        self._query_cache = TTLCache(maxsize=16, ttl=60.0)
         logger.info(f"Initialized Stash API client for {url}")
 
-    def execute_query(self, query: str, variables: Optional[Dict] = None) -> Dict:
-        """Execute a GraphQL query against the Stash API"""
-        if variables is None:
-            variables = {}
+    def invalidate_cache(self):
+        """Drop cached query results, e.g. after a mutation"""
+        self._query_cache.clear()
+
+    def close(self):
+        """Release pooled connections held by the session"""
+        self.session.close()
+        if self.client is not None:
+            self.client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _post(self, body: bytes, stream: bool = False):
+        """POST an encoded JSON body to the GraphQL endpoint
+
+        With stream=True the requests transport defers reading the body so the
+        caller can read it with _read_streamed.
+        """
+        headers = None
+        if self.compress_requests and len(body) >= GZIP_MIN_BYTES:
+            body = gzip.compress(body, compresslevel=5)
+            headers = {"Content-Encoding": "gzip"}
+        if self.client is not None:
+            return self.client.post(self.graphql_url, content=body, headers=headers)
+        # Content-Type: application/json is already set on the session
+        return self.session.post(
+            self.graphql_url, data=body, headers=headers, timeout=(5, 60), stream=stream
+        )
+
+    def _post_read(self, body: bytes, stream: bool = False):
+        """POST a read-only request, retrying with backoff on gateway errors"""
+        for attempt in range(READ_RETRIES):
+            response = self._post(body, stream=stream)
+            if response.status_code not in RETRY_STATUSES:
+                return response
+            delay = _retry_delay(response, attempt)
+            logger.warning(
+                "GraphQL read got HTTP %s, retrying in %.1fs", response.status_code, delay
+            )
+            response.close()
+            time.sleep(delay)
+        return self._post(body, stream=stream)
 
-        payload = {"query": query, "variables": variables}
+    def execute_query(
+        self,
+        query: str = "",
+        variables: Optional[Dict] = None,
+        raw_payload: Optional[bytes] = None,
+        stream: bool = False,
+        read_only: Optional[bool] = None,
+    ) -> Dict:
+        """Execute a GraphQL query against the Stash API
 
+        Args:
+            query: GraphQL query string
+            variables: Query variables
+            raw_payload: Pre-encoded JSON request body (see encode_payload); when
+                given, query and variables are ignored
+            stream: Stream the response body; use for large list queries
+            read_only: Retry gateway errors; inferred from query when omitted,
+                and never assumed for raw_payload
+        """
         try:
-            logger.info(f"Sending GraphQL request to {self.graphql_url}")
-            logger.debug(f"Payload: {payload}")
+            logger.info("Sending GraphQL request to %s", self.graphql_url)
 
-            response = requests.post(self.graphql_url, headers=self.headers, json=payload)
+            if raw_payload is None:
+                raw_payload = encode_payload(query, variables)
+                if read_only is None:
+                    read_only = _is_read_query(query)
+            logger.debug("Payload: %r", raw_payload)
 
-            logger.info(f"Response status: {response.status_code}")
-            logger.debug(f"Response headers: {response.headers}")
-            logger.debug(f"Response text (first 500 chars): {response.text[:500]}")
+            if read_only:
+                response = self._post_read(raw_payload, stream=stream)
+            else:
+                response = self._post(raw_payload, stream=stream)
 
+            logger.info("Response status: %s", response.status_code)
+            if logger.isEnabledFor(logging.DEBUG):
+                # Decoding the body text is only worth it when someone will read it
+                logger.debug("Response headers: %s", response.headers)
+                logger.debug("Response text (first 500 chars): %s", response.text[:500])
+
+            # Error responses are never parsed as JSON
             response.raise_for_status()
-            result = response.json()
+            if stream and isinstance(response, requests.Response):
+                result = _json_loads(_read_streamed(response))
+            else:
+                result = _json_loads(response.content)
 
             # Check for GraphQL errors
-            if "errors" in result:
-                errors = result["errors"]
-                error_msg = "; ".join([error.get("message", "Unknown error") for error in errors])
-                logger.error(f"GraphQL errors: {error_msg}")
-                raise Exception(f"GraphQL errors: {error_msg}")
+            _check_graphql_errors(result)
 
             return result
-        except requests.exceptions.RequestException as e:
+        except _HTTP_ERRORS as e:
             logger.error(f"Request error: {str(e)}")
             logger.error(
                 f"Response text: {response.text if 'response' in locals() else 'No response'}"
@@ -67,6 +303,39 @@ class BaseStashClient:
             )
             raise Exception(f"API request failed: {str(e)}")
 
+    def open_async_session(self):
+        """Create an aiohttp session for execute_query_async; requires aiohttp"""
+        return aiohttp.ClientSession(
+            headers=self.headers,
+            connector=aiohttp.TCPConnector(limit=32, keepalive_timeout=75),
+            timeout=aiohttp.ClientTimeout(total=60, connect=5),
+        )
+
+    async def execute_query_async(
+        self, session, query: str, variables: Optional[Dict] = None
+    ) -> Dict:
+        """Coroutine version of execute_query on a session from open_async_session
+
+        Args:
+            session: aiohttp.ClientSession to post through
+            query: GraphQL query string
+            variables: Query variables
+        """
+        try:
+            logger.info("Sending async GraphQL request to %s", self.graphql_url)
+            async with session.post(
+                self.graphql_url, data=encode_payload(query, variables)
+            ) as response:
+                logger.info("Response status: %s", response.status)
+                response.raise_for_status()
+                result = await response.json(loads=_json_loads, content_type=None)
+        except (aiohttp.ClientError, asyncio.TimeoutError, ValueError) as e:
+            logger.error(f"Request error: {str(e)}")
+            raise Exception(f"API request failed: {str(e)}") from e
+
+        _check_graphql_errors(result)
+        return result
+
     def get_job_status(self, job_id: str) -> Dict:
         """Get the status of a job
 
@@ -76,26 +345,8 @@ class BaseStashClient:
         Returns:
             Job status information
         """
-        query = """
-        query FindJob($input: FindJobInput!) {
-            findJob(input: $input) {
-                id
-                status
-                subTasks {
-                    status
-                    description
-                }
-                description
-                progress
-                error
-            }
-        }
-        """
-
-        variables = {"input": {"id": job_id}}
-
         try:
-            result = self.execute_query(query, variables)
+            result = self.execute_query(raw_payload=_find_job_payload(job_id), read_only=True)
             job_data = result["data"]["findJob"]
 
             if not job_data:
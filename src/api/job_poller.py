@@ -0,0 +1,171 @@
+"""
+Shared polling of local Stash jobs
+
+Instead of every waiting caller polling findJob from its own sleeping thread, one
+asyncio task per Stash instance fetches the whole job queue each interval and
+wakes the callers whose jobs reached a terminal state.
+"""
+
+import asyncio
+import logging
+import threading
+from typing import Callable, Dict, List, Optional
+
+from src.api.queries import JOB_QUEUE_QUERY
+
+logger = logging.getLogger("stash_manager.job_poller")
+
+TERMINAL_JOB_STATES = frozenset({"FINISHED", "CANCELLED", "FAILED"})
+
+# First poll delay; grows towards the configured poll interval while nothing changes
+MIN_POLL_INTERVAL = 0.5
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_pollers: Dict[str, "JobPoller"] = {}
+_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """The process-wide event loop the pollers run on, started on first use"""
+    global _loop
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="stash-job-poller", daemon=True).start()
+        return _loop
+
+
+class _PendingJob:
+    __slots__ = ("event", "status", "waiters")
+
+    def __init__(self):
+        self.event = asyncio.Event()
+        self.status: Optional[Dict] = None
+        self.waiters = 0  # Callers awaiting the event; the job is dropped at zero
+
+
+class JobPoller:
+    """Polls one Stash instance's job queue on behalf of every waiting caller"""
+
+    def __init__(self, client, interval: float):
+        self.client = client
+        self.interval = interval
+        self._pending: Dict[str, _PendingJob] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._attempt = 0
+
+    def register(self, job_id: str) -> asyncio.Event:
+        """Track job_id, returning an event set once the job finishes
+
+        Must be called on the poller loop.
+        """
+        pending = self._pending.get(job_id)
+        if pending is None:
+            pending = self._pending[job_id] = _PendingJob()
+        pending.waiters += 1
+        # A new job restarts the back-off so short jobs are noticed quickly
+        self._attempt = 0
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        return pending.event
+
+    def wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        """Block the calling thread until job_id finishes
+
+        Returns:
+            The job's final status, or None if it did not finish within timeout
+        """
+        future = asyncio.run_coroutine_threadsafe(self._wait(job_id, timeout), _background_loop())
+        return future.result()
+
+    def watch(
+        self, job_id: str, timeout: float, on_finish: Callable[[Optional[Dict]], None]
+    ) -> None:
+        """Call on_finish with job_id's final status once it finishes, without blocking
+
+        on_finish runs on the poller loop, with None if the job did not finish
+        within timeout.
+        """
+        asyncio.run_coroutine_threadsafe(
+            self._watch(job_id, timeout, on_finish), _background_loop()
+        )
+
+    async def _watch(
+        self, job_id: str, timeout: float, on_finish: Callable[[Optional[Dict]], None]
+    ) -> None:
+        status = await self._wait(job_id, timeout)
+        try:
+            on_finish(status)
+        except Exception as e:
+            logger.error("Error handling completion of job %s: %s", job_id, e)
+
+    async def _wait(self, job_id: str, timeout: float) -> Optional[Dict]:
+        event = self.register(job_id)
+        pending = self._pending[job_id]
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            pending.waiters -= 1
+            if not pending.waiters:
+                self._pending.pop(job_id, None)
+        return pending.status
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending:
+            waiting = [job_id for job_id, job in self._pending.items() if job.status is None]
+            try:
+                statuses = await loop.run_in_executor(None, self._poll, waiting)
+            except Exception as e:
+                logger.error("Error polling Stash job queue: %s", e)
+                statuses = {}
+
+            for job_id, status in statuses.items():
+                pending = self._pending.get(job_id)
+                if pending is None:
+                    continue
+                state = status.get("status")
+                if state in TERMINAL_JOB_STATES:
+                    pending.status = status
+                    pending.event.set()
+                else:
+                    logger.debug(
+                        "Job %s status: %s (progress: %s)",
+                        job_id,
+                        state,
+                        status.get("progress", "unknown"),
+                    )
+
+            delay = min(self.interval, MIN_POLL_INTERVAL * (1.6**self._attempt))
+            self._attempt = min(self._attempt + 1, 32)
+            await asyncio.sleep(delay)
+
+    def _poll(self, job_ids: List[str]) -> Dict[str, Dict]:
+        """Fetch the status of each job with one jobQueue request"""
+        if not job_ids:
+            return {}
+        result = self.client.execute_query(JOB_QUEUE_QUERY)
+        queue = {job["id"]: job for job in (result.get("data") or {}).get("jobQueue") or []}
+        statuses = {}
+        for job_id in job_ids:
+            status = queue.get(job_id)
+            if status is None:
+                # Finished jobs drop out of the queue, so look those up directly
+                status = self.client.get_job_status(job_id)
+            statuses[job_id] = status
+        return statuses
+
+
+def get_job_poller(client, interval: float) -> JobPoller:
+    """The shared poller for client's Stash instance"""
+    with _lock:
+        poller = _pollers.get(client.url)
+        if poller is None:
+            poller = _pollers[client.url] = JobPoller(client, interval)
+        else:
+            # Poll through the most recent client; earlier ones may have been closed
+            poller.client = client
+            poller.interval = interval
+        return poller
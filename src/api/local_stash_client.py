@@ -3,10 +3,21 @@ Local Stash API client for local instance operations
 """
 
 import logging
-import time
-from typing import Dict, List, Optional
-
-from src.api.base_stash_client import BaseStashClient
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+from src.api.base_stash_client import BaseStashClient, cached_query, encode_payload
+from src.api.job_poller import get_job_poller
+from src.api.queries import (
+    CLEAN_MUTATION,
+    FIND_PERFORMERS_QUERY,
+    FIND_SCENES_QUERY,
+    GENERATE_MUTATION,
+    IDENTIFY_MUTATION,
+    SCAN_MUTATION,
+    SCENE_DESTROY_MUTATION,
+)
 from src.config.config import (
     get_job_timeout,
     get_performer_limit,
@@ -16,85 +27,126 @@ from src.config.config import (
 
 logger = logging.getLogger("stash_manager.local_stash_api")
 
+# Page size for iter_scenes; small enough that the first scenes arrive quickly
+SCENE_PAGE_SIZE = 100
+
+# Fixed job payloads are encoded once at import time
+_SCAN_PAYLOAD = encode_payload(
+    SCAN_MUTATION,
+    {
+        "input": {
+            "rescan": False,
+            "scanGenerateClipPreviews": True,
+            "scanGenerateCovers": True,
+            "scanGenerateImagePreviews": False,
+            "scanGeneratePhashes": True,
+            "scanGeneratePreviews": True,
+            "scanGenerateSprites": True,
+            "scanGenerateThumbnails": True,
+        }
+    },
+)
+
+_GENERATE_INPUT = {
+    "sprites": True,
+    "previews": True,
+    "imagePreviews": False,
+    "previewOptions": {
+        "previewSegments": 12,
+        "previewSegmentDuration": 0.75,
+        "previewExcludeStart": "0s",
+        "previewExcludeEnd": "0s",
+        "previewPreset": "SLOW",
+    },
+    "covers": True,
+    "clips": False,
+    "phashes": True,
+    "thumbnails": True,
+    "interactiveHeatmapsSpeeds": False,
+    "imageThumbnails": False,
+}
+_GENERATE_PAYLOAD = encode_payload(GENERATE_MUTATION, {"input": _GENERATE_INPUT})
+
+_IDENTIFY_PAYLOAD = encode_payload(
+    IDENTIFY_MUTATION,
+    {
+        "input": {
+            "sources": [{"source": {"stash_box_index": 0}}],
+            "options": {
+                "setCoverImage": True,
+                "setOrganizedFlag": True,
+                "includeMalePerformers": True,
+                "skipMultipleMatches": False,
+                "skipMultipleMatchTag": "",
+                "skipSingleNamePerformers": False,
+                "skipSingleNamePerformerTag": "",
+                "fieldOptions": [
+                    {"field": "TITLE", "strategy": "OVERWRITE", "createMissing": True},
+                    {"field": "STUDIO", "strategy": "OVERWRITE", "createMissing": True},
+                    {"field": "PERFORMERS", "strategy": "OVERWRITE", "createMissing": True},
+                    {"field": "TAGS", "strategy": "MERGE", "createMissing": True},
+                ],
+            },
+        }
+    },
+)
+
+_CLEAN_PAYLOAD = encode_payload(CLEAN_MUTATION, {"input": {"paths": [], "dryRun": False}})
+
 
 class LocalStashClient(BaseStashClient):
     """Client for interacting with local Stash API"""
 
+    def _run_trigger(self, payload: bytes, result_key: str, label: str, invalidate: bool) -> str:
+        """Send a pre-encoded job mutation and return the job ID it starts
+
+        Args:
+            payload: Encoded request body (see encode_payload)
+            result_key: Field under "data" holding the job ID
+            label: Human-readable task name for logging
+            invalidate: Whether the job changes library contents, staling cached queries
+        """
+        try:
+            result = self.execute_query(raw_payload=payload)
+            job_id = result["data"][result_key]
+            logger.info(f"Triggered {label} with job ID: {job_id}")
+        except Exception as e:
+            logger.error(f"Failed to trigger {label}: {e}")
+            raise
+
+        if invalidate:
+            # The library keeps changing until the job is done, so anything cached
+            # before or while it runs is dropped once it finishes
+            get_job_poller(self, get_poll_interval()).watch(
+                job_id, get_job_timeout(), lambda _status: self.invalidate_cache()
+            )
+        return job_id
+
     def trigger_scan(self) -> str:
         """Trigger a metadata scan in local Stash
 
         Returns:
             Job ID for the scan task
         """
-        query = """
-        mutation MetadataScan($input: ScanMetadataInput!) {
-            metadataScan(input: $input)
-        }
-        """
+        return self._run_trigger(_SCAN_PAYLOAD, "metadataScan", "metadata scan", invalidate=True)
 
-        variables = {
-            "input": {
-                "rescan": False,
-                "scanGenerateClipPreviews": True,
-                "scanGenerateCovers": True,
-                "scanGenerateImagePreviews": False,
-                "scanGeneratePhashes": True,
-                "scanGeneratePreviews": True,
-                "scanGenerateSprites": True,
-                "scanGenerateThumbnails": True,
-            }
-        }
-
-        try:
-            result = self.execute_query(query, variables)
-            job_id = result["data"]["metadataScan"]
-            logger.info(f"Triggered metadata scan with job ID: {job_id}")
-            return job_id
-        except Exception as e:
-            logger.error(f"Failed to trigger metadata scan: {e}")
-            raise
-
-    def trigger_generate(self) -> str:
+    def trigger_generate(self, scene_ids: Optional[List[str]] = None) -> str:
         """Trigger metadata generation in local Stash
 
+        Args:
+            scene_ids: Generate only for these scenes; all scenes when None
+
         Returns:
             Job ID for the generation task
         """
-        query = """
-        mutation MetadataGenerate($input: GenerateMetadataInput!) {
-            metadataGenerate(input: $input)
-        }
-        """
-
-        variables = {
-            "input": {
-                "sprites": True,
-                "previews": True,
-                "imagePreviews": False,
-                "previewOptions": {
-                    "previewSegments": 12,
-                    "previewSegmentDuration": 0.75,
-                    "previewExcludeStart": "0s",
-                    "previewExcludeEnd": "0s",
-                    "previewPreset": "SLOW",
-                },
-                "covers": True,
-                "clips": False,
-                "phashes": True,
-                "thumbnails": True,
-                "interactiveHeatmapsSpeeds": False,
-                "imageThumbnails": False,
-            }
-        }
-
-        try:
-            result = self.execute_query(query, variables)
-            job_id = result["data"]["metadataGenerate"]
-            logger.info(f"Triggered metadata generation with job ID: {job_id}")
-            return job_id
-        except Exception as e:
-            logger.error(f"Failed to trigger metadata generation: {e}")
-            raise
+        payload = _GENERATE_PAYLOAD
+        if scene_ids is not None:
+            payload = encode_payload(
+                GENERATE_MUTATION, {"input": {**_GENERATE_INPUT, "sceneIDs": list(scene_ids)}}
+            )
+        return self._run_trigger(
+            payload, "metadataGenerate", "metadata generation", invalidate=False
+        )
 
     def wait_for_job_completion(self, job_id: str) -> bool:
         """Wait for a job to complete
@@ -106,37 +158,20 @@ class LocalStashClient(BaseStashClient):
             True if job completed successfully, False otherwise
         """
         timeout = get_job_timeout()
-        poll_interval = get_poll_interval()
-        start_time = time.time()
-
         logger.info(f"Waiting for job {job_id} to complete (timeout: {timeout}s)")
 
-        while time.time() - start_time < timeout:
-            try:
-                status = self.get_job_status(job_id)
-
-                if status.get("status") in ["FINISHED", "CANCELLED", "FAILED"]:
-                    success = status.get("status") == "FINISHED"
-                    logger.info(f"Job {job_id} completed with status: {status.get('status')}")
-
-                    if not success and status.get("error"):
-                        logger.error(f"Job {job_id} error: {status.get('error')}")
-
-                    return success
-
-                logger.debug(
-                    f"Job {job_id} status: {status.get('status')} "
-                    f"(progress: {status.get('progress', 'unknown')})"
-                )
-
-                time.sleep(poll_interval)
-
-            except Exception as e:
-                logger.error(f"Error checking job {job_id} status: {e}")
-                time.sleep(poll_interval)
+        # One shared task polls the job queue for every waiting caller
+        status = get_job_poller(self, get_poll_interval()).wait(job_id, timeout)
+        if status is None:
+            logger.error(f"Job {job_id} timed out after {timeout} seconds")
+            return False
 
-        logger.error(f"Job {job_id} timed out after {timeout} seconds")
-        return False
+        state = status.get("status")
+        logger.info(f"Job {job_id} completed with status: {state}")
+        error = status.get("error")
+        if state != "FINISHED" and error:
+            logger.error(f"Job {job_id} error: {error}")
+        return state == "FINISHED"
 
     def trigger_identify(self) -> str:
         """Trigger scene identification in local Stash
@@ -144,41 +179,9 @@ class LocalStashClient(BaseStashClient):
         Returns:
             Job ID for the identify task
         """
-        query = """
-        mutation MetadataIdentify($input: IdentifyMetadataInput!) {
-            metadataIdentify(input: $input)
-        }
-        """
-
-        variables = {
-            "input": {
-                "sources": [{"source": {"stash_box_index": 0}}],
-                "options": {
-                    "setCoverImage": True,
-                    "setOrganizedFlag": True,
-                    "includeMalePerformers": True,
-                    "skipMultipleMatches": False,
-                    "skipMultipleMatchTag": "",
-                    "skipSingleNamePerformers": False,
-                    "skipSingleNamePerformerTag": "",
-                    "fieldOptions": [
-                        {"field": "TITLE", "strategy": "OVERWRITE", "createMissing": True},
-                        {"field": "STUDIO", "strategy": "OVERWRITE", "createMissing": True},
-                        {"field": "PERFORMERS", "strategy": "OVERWRITE", "createMissing": True},
-                        {"field": "TAGS", "strategy": "MERGE", "createMissing": True},
-                    ],
-                },
-            }
-        }
-
-        try:
-            result = self.execute_query(query, variables)
-            job_id = result["data"]["metadataIdentify"]
-            logger.info(f"Triggered metadata identify with job ID: {job_id}")
-            return job_id
-        except Exception as e:
-            logger.error(f"Failed to trigger metadata identify: {e}")
-            raise
+        return self._run_trigger(
+            _IDENTIFY_PAYLOAD, "metadataIdentify", "metadata identify", invalidate=True
+        )
 
     def trigger_clean(self) -> str:
         """Trigger clean/removal of scenes in local Stash
@@ -186,23 +189,9 @@ class LocalStashClient(BaseStashClient):
         Returns:
             Job ID for the clean task
         """
-        query = """
-        mutation MetadataClean($input: CleanMetadataInput!) {
-            metadataClean(input: $input)
-        }
-        """
-
-        variables = {"input": {"paths": [], "dryRun": False}}
-
-        try:
-            result = self.execute_query(query, variables)
-            job_id = result["data"]["metadataClean"]
-            logger.info(f"Triggered metadata clean with job ID: {job_id}")
-            return job_id
-        except Exception as e:
-            logger.error(f"Failed to trigger metadata clean: {e}")
-            raise
+        return self._run_trigger(_CLEAN_PAYLOAD, "metadataClean", "metadata clean", invalidate=True)
 
+    @cached_query
     def get_performers(self) -> List[Dict]:
         """Get all performers from local Stash
 
@@ -211,39 +200,10 @@ class LocalStashClient(BaseStashClient):
         """
         limit = get_performer_limit()
 
-        query = """
-        query FindPerformers($filter: FindFilterType) {
-            findPerformers(filter: $filter) {
-                count
-                performers {
-                    id
-                    name
-                    disambiguation
-                    gender
-                    ethnicity
-                    eye_color
-                    hair_color
-                    height
-                    measurements {
-                        cup_size
-                        band_size
-                        waist
-                        hip
-                    }
-                    career_start_year
-                    career_end_year
-                    aliases
-                    country
-                    scene_count
-                }
-            }
-        }
-        """
-
         variables = {"filter": {"per_page": limit, "sort": "name", "direction": "ASC"}}
 
         try:
-            result = self.execute_query(query, variables)
+            result = self.execute_query(FIND_PERFORMERS_QUERY, variables, stream=True)
             performers_data = result["data"]["findPerformers"]
             performers = performers_data["performers"]
 
@@ -254,6 +214,7 @@ class LocalStashClient(BaseStashClient):
             logger.error(f"Error fetching performers from local Stash: {e}")
             return []
 
+    @cached_query
     def get_all_scenes(
         self,
         limit: Optional[int] = None,
@@ -270,61 +231,10 @@ class LocalStashClient(BaseStashClient):
         Returns:
             List of scenes
         """
-        # Local Stash query structure
-        query = """
-        query FindScenes($filter: FindFilterType) {
-            findScenes(filter: $filter) {
-                count
-                scenes {
-                    id
-                    title
-                    organized
-                    date
-                    studio {
-                        id
-                        name
-                    }
-                    performers {
-                        id
-                        name
-                        gender
-                        ethnicity
-                        measurements
-                    }
-                    tags {
-                        id
-                        name
-                    }
-                }
-            }
-        }
-        """
-
-        per_page = limit if limit else get_scene_limit()
-        variables = {"filter": {"per_page": per_page}}
-
-        # For local Stash, add date filtering if provided
-        if start_date or end_date:
-            # Local Stash uses different date filtering syntax
-            if start_date and end_date:
-                # Date range for local Stash
-                variables["filter"]["date"] = {
-                    "value": f"{start_date} - {end_date}",
-                    "modifier": "BETWEEN",
-                }
-            elif start_date:
-                variables["filter"]["date"] = {
-                    "value": start_date,
-                    "modifier": "GREATER_THAN",
-                }
-            elif end_date:
-                variables["filter"]["date"] = {
-                    "value": end_date,
-                    "modifier": "LESS_THAN",
-                }
+        variables = self._scenes_filter_variables(limit, start_date, end_date)
 
         try:
-            result = self.execute_query(query, variables)
+            result = self.execute_query(FIND_SCENES_QUERY, variables, stream=True)
             scenes_data = result["data"]["findScenes"]
             scenes = scenes_data["scenes"]
 
@@ -335,6 +245,86 @@ class LocalStashClient(BaseStashClient):
             logger.error(f"Error fetching scenes from local Stash: {e}")
             return []
 
+    def iter_scenes(
+        self,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        per_page: int = SCENE_PAGE_SIZE,
+        scene_filter: Optional[Dict] = None,
+    ) -> Iterator[Dict]:
+        """Yield scenes from local Stash page by page
+
+        The next page is fetched in the background while the current one is
+        consumed, so callers can start processing before the full list arrives.
+
+        Args:
+            limit: Optional limit for the number of scenes to yield
+            start_date: Optional start date for the search (YYYY-MM-DD)
+            end_date: Optional end date for the search (YYYY-MM-DD)
+            per_page: Scenes requested per page
+            scene_filter: Optional Stash SceneFilterType criteria applied server-side
+        """
+        max_scenes = limit if limit else get_scene_limit()
+        per_page = min(per_page, max_scenes)
+        n_pages = math.ceil(max_scenes / per_page)
+
+        def fetch(page: int) -> List[Dict]:
+            variables = self._scenes_filter_variables(per_page, start_date, end_date, scene_filter)
+            variables["filter"]["page"] = page
+            result = self.execute_query(FIND_SCENES_QUERY, variables, stream=True)
+            return result["data"]["findScenes"]["scenes"]
+
+        remaining = max_scenes
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(fetch, 1)
+            for page in range(1, n_pages + 1):
+                try:
+                    scenes = future.result()
+                except Exception as e:
+                    logger.error(f"Error fetching scenes from local Stash (page {page}): {e}")
+                    return
+
+                # Start on the next page before handing this one to the caller
+                more = len(scenes) == per_page and page < n_pages
+                if more:
+                    future = executor.submit(fetch, page + 1)
+
+                logger.info("Retrieved %d scenes from local Stash (page %d)", len(scenes), page)
+                yield from scenes[:remaining]
+                remaining -= len(scenes)
+                if not more or remaining <= 0:
+                    return
+
+    @staticmethod
+    def _scenes_filter_variables(
+        limit: Optional[int],
+        start_date: Optional[str],
+        end_date: Optional[str],
+        scene_filter: Optional[Dict] = None,
+    ) -> Dict:
+        """Build findScenes variables for a limit, optional date range and scene filter"""
+        per_page = limit if limit else get_scene_limit()
+        variables: Dict = {"filter": {"per_page": per_page}}
+
+        # Date criteria belong in the scene filter, not the paging filter
+        date = None
+        if start_date and end_date:
+            date = {"value": start_date, "value2": end_date, "modifier": "BETWEEN"}
+        elif start_date:
+            date = {"value": start_date, "modifier": "GREATER_THAN"}
+        elif end_date:
+            date = {"value": end_date, "modifier": "LESS_THAN"}
+
+        if date and scene_filter:
+            # AND keeps the date applied to every OR branch of the caller's filter
+            variables["scene_filter"] = {"date": date, "AND": scene_filter}
+        elif date:
+            variables["scene_filter"] = {"date": date}
+        elif scene_filter:
+            variables["scene_filter"] = scene_filter
+        return variables
+
     def delete_scene(self, scene_id: str, delete_file: bool = True) -> bool:
         """Delete a scene from local Stash
 
@@ -345,19 +335,15 @@ class LocalStashClient(BaseStashClient):
         Returns:
             True if deletion was successful
         """
-        query = """
-        mutation SceneDestroy($input: SceneDestroyInput!) {
-            sceneDestroy(input: $input)
-        }
-        """
 
         variables = {
             "input": {"id": scene_id, "delete_file": delete_file, "delete_generated": True}
         }
 
         try:
-            result = self.execute_query(query, variables)
+            result = self.execute_query(SCENE_DESTROY_MUTATION, variables)
             success = result["data"]["sceneDestroy"]
+            self.invalidate_cache()
 
             if success:
                 logger.info(f"Successfully deleted scene {scene_id}")
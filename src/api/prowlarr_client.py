@@ -4,8 +4,11 @@ Prowlarr API client for torrent searching and downloading
 
 import logging
 from typing import Dict, List, Optional
+from xml.etree import ElementTree as ET
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger("stash_manager.prowlarr_client")
 
@@ -23,18 +26,39 @@ class ProwlarrClient:
         # Remove trailing slash from URL
         self.url = self.url.rstrip("/")
 
+        # Reuse connections across API, indexer and download calls; the pool holds one
+        # connection per concurrent scene search so none are dropped between calls
+        self.session = requests.Session()
+        self.session.headers["X-Api-Key"] = self.api_key
+        # Retry idempotent GETs on gateway errors; POSTs (adds, downloads) are not retried
+        adapter = HTTPAdapter(
+            pool_maxsize=max(8, config.get("max_concurrency", 8)),
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
         # Default to adult content categories for scene searching
         self.default_categories = config.get(
             "categories", "6000,6010,6020,6030,6040,6050,6060,6070"
         )
 
+    def close(self):
+        """Release pooled connections held by the session"""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _call_api(self, endpoint: str, params: Optional[Dict] = None) -> Optional[Dict]:
         """Make API call to Prowlarr"""
-        headers = {"X-Api-Key": self.api_key}
         full_url = f"{self.url}/api/v1/{endpoint}"
 
         try:
-            response = requests.get(full_url, headers=headers, params=params, timeout=30)
+            response = self.session.get(full_url, params=params, timeout=30)
             response.raise_for_status()
             return response.json()
         except requests.exceptions.RequestException as e:
@@ -52,12 +76,10 @@ class ProwlarrClient:
         search_url = f"{self.url}/{indexer_id}/api"
 
         try:
-            response = requests.get(search_url, params=params, timeout=30)
+            response = self.session.get(search_url, params=params, timeout=30)
             response.raise_for_status()
 
             # Parse XML response (Newznab/Torznab returns XML)
-            from xml.etree import ElementTree as ET
-
             root = ET.fromstring(response.content)
 
             results = []
@@ -175,10 +197,8 @@ class ProwlarrClient:
             # Use Prowlarr's download endpoint to send to configured download client
             data = {"indexerId": indexer_id, "downloadUrl": download_url}
 
-            headers = {"X-Api-Key": self.api_key, "Content-Type": "application/json"}
-            response = requests.post(
+            response = self.session.post(
                 f"{self.url}/api/v1/download",
-                headers=headers,
                 json=data,
                 timeout=30,
             )
@@ -0,0 +1,213 @@
+"""
+GraphQL documents shared by the Stash API clients
+"""
+
+from functools import lru_cache
+from typing import Tuple
+
+# Job polling: only the fields the loop reads - this runs every poll interval
+FIND_JOB_QUERY = """
+query FindJob($input: FindJobInput!) {
+    findJob(input: $input) {
+        id
+        status
+        progress
+        error
+    }
+}
+"""
+
+# Every queued or running job in one request, for the shared job poller
+JOB_QUEUE_QUERY = """
+query JobQueue {
+    jobQueue {
+        id
+        status
+        progress
+        error
+    }
+}
+"""
+
+
+# Local Stash
+SCAN_MUTATION = """
+mutation MetadataScan($input: ScanMetadataInput!) {
+    metadataScan(input: $input)
+}
+"""
+
+GENERATE_MUTATION = """
+mutation MetadataGenerate($input: GenerateMetadataInput!) {
+    metadataGenerate(input: $input)
+}
+"""
+
+IDENTIFY_MUTATION = """
+mutation MetadataIdentify($input: IdentifyMetadataInput!) {
+    metadataIdentify(input: $input)
+}
+"""
+
+CLEAN_MUTATION = """
+mutation MetadataClean($input: CleanMetadataInput!) {
+    metadataClean(input: $input)
+}
+"""
+
+# List queries only select fields the filters read; responses can be large
+FIND_PERFORMERS_QUERY = """
+query FindPerformers($filter: FindFilterType) {
+    findPerformers(filter: $filter) {
+        count
+        performers {
+            id
+            name
+            gender
+            ethnicity
+            measurements {
+                cup_size
+                band_size
+                waist
+                hip
+            }
+        }
+    }
+}
+"""
+
+FIND_SCENES_QUERY = """
+query FindScenes($filter: FindFilterType, $scene_filter: SceneFilterType) {
+    findScenes(filter: $filter, scene_filter: $scene_filter) {
+        count
+        scenes {
+            id
+            title
+            date
+            studio {
+                id
+                name
+            }
+            performers {
+                id
+                name
+                gender
+                ethnicity
+                measurements
+            }
+            tags {
+                id
+                name
+            }
+        }
+    }
+}
+"""
+
+SCENE_DESTROY_MUTATION = """
+mutation SceneDestroy($input: SceneDestroyInput!) {
+    sceneDestroy(input: $input)
+}
+"""
+
+
+# StashDB: only what the add-scene filters and Whisparr lookups read. Scene
+# details are free text and can run to kilobytes per scene, so they are not fetched.
+QUERY_SCENES_QUERY = """
+query QueryScenes($input: SceneQueryInput!) {
+    queryScenes(input: $input) {
+        count
+        scenes {
+            id
+            title
+            date
+            studio {
+                id
+                name
+            }
+            performers {
+                performer {
+                    id
+                    name
+                    gender
+                    ethnicity
+                    measurements {
+                        band_size
+                        cup_size
+                        waist
+                        hip
+                    }
+                }
+            }
+            tags {
+                id
+                name
+            }
+        }
+    }
+}
+"""
+
+
+# Static budget for the documents above, checked once at import. Keeps a query
+# edit from quietly adding deep fan-out (each nesting level under a list field
+# multiplies the rows the server resolves).
+MAX_SELECTION_DEPTH = 6
+
+
+def selection_depth(document: str) -> int:
+    """Deepest selection-set nesting in a GraphQL document, counted by braces"""
+    depth = deepest = 0
+    for char in document:
+        if char == "{":
+            depth += 1
+            deepest = max(deepest, depth)
+        elif char == "}":
+            depth -= 1
+    return deepest
+
+
+def _check_query_budgets() -> None:
+    for name, document in globals().items():
+        if not (name.endswith("_QUERY") or name.endswith("_MUTATION")):
+            continue
+        depth = selection_depth(document)
+        if depth > MAX_SELECTION_DEPTH:
+            raise ValueError(
+                f"{name} nests {depth} selection levels, over the budget of {MAX_SELECTION_DEPTH}"
+            )
+
+
+_check_query_budgets()
+
+
+# Measurement subfields selected by QUERY_SCENES_QUERY
+MEASUREMENT_FIELDS = ("band_size", "cup_size", "waist", "hip")
+_MEASUREMENTS_BLOCK = """                    measurements {
+                        band_size
+                        cup_size
+                        waist
+                        hip
+                    }
+"""
+
+
+@lru_cache(maxsize=None)
+def query_scenes_query(measurement_fields: Tuple[str, ...] = MEASUREMENT_FIELDS) -> str:
+    """QUERY_SCENES_QUERY selecting only the given measurement subfields
+
+    An empty tuple drops the measurements block entirely.
+    """
+    unknown = set(measurement_fields) - set(MEASUREMENT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown measurement fields: {sorted(unknown)}")
+    if measurement_fields:
+        lines = "".join(
+            f"                        {field}\n"
+            for field in MEASUREMENT_FIELDS
+            if field in measurement_fields
+        )
+        block = f"                    measurements {{\n{lines}                    }}\n"
+    else:
+        block = ""
+    return QUERY_SCENES_QUERY.replace(_MEASUREMENTS_BLOCK, block)
@@ -3,7 +3,7 @@ Unified Stash API interface for backward compatibility
 This maintains the same interface as the original StashAPI class
 """
 
-from typing import Dict, List, Optional, Union
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from src.api.local_stash_client import LocalStashClient
 from src.api.stashdb_client import StashDBClient
@@ -30,6 +30,20 @@ class StashAPI:
             self._client = LocalStashClient(url, api_key)
             self._is_stashdb = False
 
+    def invalidate_cache(self):
+        """Drop cached query results held by the underlying client"""
+        self._client.invalidate_cache()
+
+    def close(self):
+        """Release pooled connections held by the underlying client"""
+        self._client.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def execute_query(self, query: str, variables: Optional[Dict] = None) -> Dict:
         """Execute a GraphQL query"""
         return self._client.execute_query(query, variables)
@@ -56,12 +70,12 @@ class StashAPI:
             return self._client.trigger_scan()
         raise NotImplementedError("Scan not available for this client type")
 
-    def trigger_generate(self) -> str:
+    def trigger_generate(self, scene_ids: Optional[List[str]] = None) -> str:
         """Trigger metadata generation (local Stash only)"""
         if self._is_stashdb:
             raise NotImplementedError("Generate not available for StashDB")
         if isinstance(self._client, LocalStashClient):
-            return self._client.trigger_generate()
+            return self._client.trigger_generate(scene_ids)
         raise NotImplementedError("Generate not available for this client type")
 
     def trigger_identify(self) -> str:
@@ -86,15 +100,46 @@ class StashAPI:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         direction: str = "ASC",
+        measurement_fields: Optional[Tuple[str, ...]] = None,
     ) -> List[Dict]:
         """Get all scenes - behavior depends on client type"""
         if self._is_stashdb and isinstance(self._client, StashDBClient):
-            return self._client.get_all_scenes(limit, start_date, end_date, direction)
+            return self._client.get_all_scenes(
+                limit, start_date, end_date, direction, measurement_fields
+            )
         elif isinstance(self._client, LocalStashClient):
             return self._client.get_all_scenes(limit, start_date, end_date)
         else:
             raise NotImplementedError("Scene listing not available for this client type")
 
+    def iter_scenes(
+        self,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        scene_filter: Optional[Dict] = None,
+        direction: str = "ASC",
+        measurement_fields: Optional[Tuple[str, ...]] = None,
+        on_count: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[Dict]:
+        """Stream scenes page by page
+
+        scene_filter applies to local Stash; direction, measurement_fields and
+        on_count to StashDB.
+        """
+        if self._is_stashdb and isinstance(self._client, StashDBClient):
+            return self._client.iter_scenes(
+                limit,
+                start_date,
+                end_date,
+                direction,
+                measurement_fields=measurement_fields,
+                on_count=on_count,
+            )
+        if isinstance(self._client, LocalStashClient):
+            return self._client.iter_scenes(limit, start_date, end_date, scene_filter=scene_filter)
+        raise NotImplementedError("Scene streaming not available for this client type")
+
     def get_performers(self) -> List[Dict]:
         """Get performers (local Stash only)"""
         if self._is_stashdb:
@@ -2,144 +2,364 @@
 StashDB API client for external StashDB operations
 """
 
+import asyncio
 import logging
-from typing import Dict, List, Optional
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 
-from src.api.base_stash_client import BaseStashClient
+from src.api.base_stash_client import BaseStashClient, aiohttp, cached_query
+from src.api.queries import MEASUREMENT_FIELDS, QUERY_SCENES_QUERY, query_scenes_query
 from src.config.config import get_scene_limit
 
 logger = logging.getLogger("stash_manager.stashdb_api")
 
+# Largest page size requested when the server answers page 1 quickly
+MAX_PER_PAGE = 500
+FAST_PAGE_SECONDS = 1.0
+
+# Upper bound on concurrent page requests per wave; keep <= the session pool_maxsize
+MAX_PAGE_WORKERS = 8
+
+# StashDB dates are normally YYYY-MM-DD (optionally followed by a time)
+_ISO_DATE_PREFIX = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _shift_date(date_str: str, days: int) -> str:
+    """Shift a YYYY-MM-DD date by a number of days, leaving unparsable input as-is"""
+    try:
+        return (date.fromisoformat(date_str) + timedelta(days=days)).isoformat()
+    except ValueError:
+        return date_str
+
+
+def _past_date_range(
+    scenes: List[Dict], direction: str, start_date: Optional[str], end_date: Optional[str]
+) -> bool:
+    """Check whether a date-sorted page has walked past the requested range"""
+    if not scenes or not (start_date and end_date):
+        return False
+    last_date = (scenes[-1].get("date") or "")[:10]
+    if not last_date:
+        return False
+    if direction == "DESC":
+        return last_date < start_date
+    return last_date > end_date
+
+
+def _query_scenes_payload(result: Optional[Dict]) -> Optional[Dict]:
+    """Extract the queryScenes payload from a GraphQL response"""
+    if not result or "data" not in result or "queryScenes" not in result["data"]:
+        logger.warning("No data returned from StashDB query.")
+        return None
+    return result["data"]["queryScenes"]
+
+
+def _page_plan(first: int, per_page: int, last: int) -> List[Tuple[int, int]]:
+    """List (page, per_page) pairs for pages first..last inclusive"""
+    return [(page, per_page) for page in range(first, last + 1)]
+
 
 class StashDBClient(BaseStashClient):
     """Client for interacting with external StashDB API"""
 
-    def get_all_scenes(
+    @staticmethod
+    def _scenes_page_variables(
+        page: int,
+        per_page: int,
+        direction: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+    ) -> Dict:
+        """Build queryScenes variables for one page of a date-sorted listing"""
+        variables = {
+            "input": {
+                "page": page,
+                "per_page": per_page,
+                "sort": "DATE",
+                "direction": direction,
+            }
+        }
+
+        # Handle date filtering for StashDB. The server only takes one bound, so with
+        # a full range we bound the side we start paging from and stop client-side
+        # once the sort order walks past the other end (see _past_date_range).
+        # StashDB's modifiers are exclusive, so widen by a day to stay inclusive.
+        if end_date and (direction == "DESC" or not start_date):
+            # Scenes up to and including end_date
+            variables["input"]["date"] = {
+                "value": _shift_date(end_date, 1),
+                "modifier": "LESS_THAN",
+            }
+        elif start_date:
+            # Scenes from start_date onward
+            variables["input"]["date"] = {
+                "value": _shift_date(start_date, -1),
+                "modifier": "GREATER_THAN",
+            }
+
+        return variables
+
+    def _fetch_scenes_page(
+        self,
+        page: int,
+        per_page: int,
+        direction: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        max_scenes: int,
+        query: str = QUERY_SCENES_QUERY,
+    ) -> Optional[Dict]:
+        """Fetch a single page of scenes, returning the queryScenes payload or None"""
+        variables = self._scenes_page_variables(page, per_page, direction, start_date, end_date)
+
+        logger.info(
+            "Fetching page %d from StashDB with limit=%s, dates=%s to %s",
+            page,
+            max_scenes,
+            start_date,
+            end_date,
+        )
+
+        try:
+            return _query_scenes_payload(self.execute_query(query, variables, stream=True))
+        except Exception as e:
+            logger.error(f"Error fetching scenes from StashDB (page {page}): {e}")
+            return None
+
+    async def _fetch_scene_pages_async(
+        self,
+        pages: List[Tuple[int, int]],
+        direction: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        query: str = QUERY_SCENES_QUERY,
+    ) -> Dict[Tuple[int, int], Optional[List[Dict]]]:
+        """Fetch several pages as coroutines on one aiohttp session"""
+
+        async def fetch(session, page: int, per_page: int) -> Optional[Dict]:
+            variables = self._scenes_page_variables(page, per_page, direction, start_date, end_date)
+            try:
+                result = await self.execute_query_async(session, query, variables)
+                return _query_scenes_payload(result)
+            except Exception as e:
+                logger.error(f"Error fetching scenes from StashDB (page {page}): {e}")
+                return None
+
+        logger.info(f"Fetching {len(pages)} pages from StashDB concurrently")
+        async with self.open_async_session() as session:
+            results = await asyncio.gather(*(fetch(session, *key) for key in pages))
+        return {
+            key: page_data.get("scenes") if page_data else None
+            for key, page_data in zip(pages, results, strict=True)
+        }
+
+    def _fetch_scene_pages(
+        self,
+        pages: List[Tuple[int, int]],
+        direction: str,
+        start_date: Optional[str],
+        end_date: Optional[str],
+        max_scenes: int,
+        query: str = QUERY_SCENES_QUERY,
+    ) -> Dict[Tuple[int, int], Optional[List[Dict]]]:
+        """Fetch several (page, per_page) pages concurrently (None on failure)
+
+        Uses asyncio + aiohttp when available, otherwise a thread pool over the
+        pooled HTTP session.
+        """
+        if aiohttp is not None:
+            return asyncio.run(
+                self._fetch_scene_pages_async(pages, direction, start_date, end_date, query)
+            )
+
+        fetched: Dict[Tuple[int, int], Optional[List[Dict]]] = {}
+        with ThreadPoolExecutor(max_workers=len(pages)) as executor:
+            futures = {
+                executor.submit(
+                    self._fetch_scenes_page,
+                    page,
+                    per_page,
+                    direction,
+                    start_date,
+                    end_date,
+                    max_scenes,
+                    query,
+                ): (page, per_page)
+                for page, per_page in pages
+            }
+            for future in as_completed(futures):
+                page_data = future.result()
+                fetched[futures[future]] = page_data.get("scenes") if page_data else None
+        return fetched
+
+    def iter_scenes(
         self,
         limit: Optional[int] = None,
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         direction: str = "ASC",
-    ) -> List[Dict]:
-        """Get all scenes from StashDB with optional filtering
+        per_page: int = 100,
+        measurement_fields: Optional[Tuple[str, ...]] = None,
+        on_count: Optional[Callable[[int], None]] = None,
+    ) -> Iterator[Dict]:
+        """Yield scenes from StashDB in sort order
+
+        The first page tells us the total count, so the remaining pages are fetched
+        in waves of up to MAX_PAGE_WORKERS concurrent requests. The next wave is
+        fetched in the background while the current one is consumed, and paging
+        stops once the sort order walks past the requested date range. Scenes are
+        not filtered to the date range client-side; callers check each scene's
+        date themselves.
 
         Args:
-            limit: Maximum number of scenes to retrieve
+            limit: Maximum number of scenes to yield
             start_date: Filter scenes created after this date (YYYY-MM-DD)
             end_date: Filter scenes created before this date (YYYY-MM-DD)
             direction: Sort direction ("ASC" or "DESC")
-
-        Returns:
-            List of scene data from StashDB
+            per_page: Scenes requested per page; StashDB seems to have lower
+                limits, so start conservative
+            measurement_fields: Performer measurement subfields to select
+                (None selects all of them)
+            on_count: Called once with the number of scenes expected, from page 1's
+                count; fewer may arrive if paging stops early
         """
-        if limit is None:
-            limit = get_scene_limit()
-
-        query = """
-        query QueryScenes($input: SceneQueryInput!) {
-            queryScenes(input: $input) {
-                count
-                scenes {
-                    id
-                    title
-                    details
-                    date
-                    studio {
-                        id
-                        name
-                    }
-                    performers {
-                        performer {
-                            id
-                            name
-                            gender
-                            ethnicity
-                            measurements {
-                                band_size
-                                cup_size
-                                waist
-                                hip
-                            }
-                        }
-                    }
-                    tags {
-                        id
-                        name
-                    }
-                }
-            }
-        }
-        """
-
-        all_scenes: List[Dict] = []
-        page = 1
-        per_page = 100  # StashDB seems to have lower limits, start conservative
         max_scenes = limit if limit else get_scene_limit()
+        # Small limits fit in one page so nothing past max_scenes is requested
+        per_page = min(per_page, max_scenes)
+        query = query_scenes_query(
+            MEASUREMENT_FIELDS if measurement_fields is None else tuple(measurement_fields)
+        )
 
-        while len(all_scenes) < max_scenes:
-            variables = {
-                "input": {
-                    "page": page,
-                    "per_page": per_page,
-                    "sort": "DATE",
-                    "direction": direction,
-                }
-            }
+        if start_date and end_date:
+            logger.info(f"Setting date range filter: {start_date} to {end_date} (inclusive)")
 
-            # Handle date filtering for StashDB
-            if start_date and end_date:
-                logger.info(
-                    f"Setting date range filter: {start_date} to {end_date} "
-                    f"(inclusive) - Page {page}"
-                )
-                variables["input"]["date"] = {
-                    "value": start_date,
-                    "modifier": "GREATER_THAN",
-                }
-            elif start_date:
-                # Only start date provided - get scenes from this date onward (inclusive)
-                variables["input"]["date"] = {
-                    "value": start_date,
-                    "modifier": "GREATER_THAN",
-                }
-            elif end_date:
-                # Only end date provided - get scenes up to this date (inclusive)
-                variables["input"]["date"] = {
-                    "value": end_date,
-                    "modifier": "LESS_THAN",
-                }
+        started = time.monotonic()
+        first_page = self._fetch_scenes_page(
+            1, per_page, direction, start_date, end_date, max_scenes, query
+        )
+        elapsed = time.monotonic() - started
+        scenes = (first_page or {}).get("scenes") or []
+        if not scenes:
+            logger.info("No more scenes found on StashDB.")
+            return
+        logger.info("Retrieved %d scenes from StashDB (page 1)", len(scenes))
 
-            logger.info(
-                f"Fetching page {page} from StashDB with limit={max_scenes}, "
-                f"dates={start_date} to {end_date}"
+        target = min(max_scenes, first_page.get("count") or 0)
+        if on_count is not None:
+            on_count(max(target, len(scenes)))
+        n_pages = math.ceil(target / per_page)
+        offset = len(scenes)
+        done = len(scenes) < per_page or _past_date_range(scenes, direction, start_date, end_date)
+
+        # n_pages comes from page 1's count, so the plan never issues a trailing
+        # empty request; the short/empty page checks below are only a fallback.
+        plan = _page_plan(2, per_page, n_pages)
+        big_page = per_page * 2
+        if (
+            not done
+            and big_page <= MAX_PER_PAGE
+            and elapsed < FAST_PAGE_SECONDS
+            and target > big_page
+        ):
+            # Page 1 came back quickly: pull the rest in double-size pages. Page 2
+            # stays at the base size so the larger pages line up with offset 2*per_page;
+            # that only holds for exactly double, so capped sizes keep the base plan.
+            logger.info(f"First page took {elapsed:.2f}s, raising page size to {big_page} scenes")
+            plan = [(2, per_page)] + _page_plan(2, big_page, math.ceil(target / big_page))
+
+        def fetch_wave(wave: List[Tuple[int, int]]):
+            return wave, self._fetch_scene_pages(
+                wave, direction, start_date, end_date, max_scenes, query
             )
 
-            try:
-                result = self.execute_query(query, variables)
-                if not result or "data" not in result or "queryScenes" not in result["data"]:
-                    logger.warning("No data returned from StashDB query.")
-                    break
+        remaining = max_scenes
+        position = 0
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            pending = None
+            if not done and plan:
+                pending = executor.submit(fetch_wave, plan[:MAX_PAGE_WORKERS])
+            yield from scenes[:remaining]
+            remaining -= len(scenes)
 
-                scenes_data = result["data"]["queryScenes"]
-                scenes = scenes_data.get("scenes", [])
+            while pending is not None and remaining > 0:
+                wave, pages = pending.result()
+                pending = None
 
-                if not scenes:
-                    logger.info("No more scenes found on StashDB.")
-                    break
+                # Take pages in order, stopping at the first failed or short page
+                ready = []
+                position += len(wave)
+                for page, size in wave:
+                    page_scenes = pages.get((page, size))
+                    if page_scenes is None and size != per_page:
+                        # Back off to the base page size for whatever is left
+                        logger.warning(
+                            f"Page {page} of {size} scenes failed, retrying at {per_page} per page"
+                        )
+                        plan = _page_plan(offset // per_page + 1, per_page, n_pages)
+                        position = 0
+                        break
+                    if not page_scenes:
+                        logger.info(f"No more scenes found on StashDB at page {page}.")
+                        done = True
+                        break
+                    ready.append(page_scenes)
+                    offset += len(page_scenes)
+                    logger.info(
+                        "Retrieved %d scenes from StashDB (page %d)", len(page_scenes), page
+                    )
+                    if len(page_scenes) < size:
+                        done = True
+                        break  # Last page
+                    if _past_date_range(page_scenes, direction, start_date, end_date):
+                        logger.info(f"Page {page} is past the requested date range, stopping.")
+                        done = True
+                        break
 
-                all_scenes.extend(scenes)
-                logger.info(
-                    f"Retrieved {len(scenes)} scenes from StashDB. Total: {len(all_scenes)}"
-                )
+                # Start on the next wave before handing this one to the caller
+                if not done and position < len(plan):
+                    pending = executor.submit(
+                        fetch_wave, plan[position : position + MAX_PAGE_WORKERS]
+                    )
+                for page_scenes in ready:
+                    yield from page_scenes[:remaining]
+                    remaining -= len(page_scenes)
+                    if remaining <= 0:
+                        break
 
-                if len(scenes) < per_page:
-                    break  # Last page
-                page += 1
+    @cached_query
+    def get_all_scenes(
+        self,
+        limit: Optional[int] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        direction: str = "ASC",
+        measurement_fields: Optional[Tuple[str, ...]] = None,
+    ) -> List[Dict]:
+        """Get all scenes from StashDB with optional filtering
 
-            except Exception as e:
-                logger.error(f"Error fetching scenes from StashDB: {e}")
-                break  # Exit loop on error
+        Collects iter_scenes and, when both dates are given, drops scenes outside
+        the range.
+
+        Args:
+            limit: Maximum number of scenes to retrieve
+            start_date: Filter scenes created after this date (YYYY-MM-DD)
+            end_date: Filter scenes created before this date (YYYY-MM-DD)
+            direction: Sort direction ("ASC" or "DESC")
+            measurement_fields: Performer measurement subfields to select
+                (None selects all of them)
 
+        Returns:
+            List of scene data from StashDB
+        """
+        all_scenes = list(
+            self.iter_scenes(
+                limit, start_date, end_date, direction, measurement_fields=measurement_fields
+            )
+        )
         logger.info(
             f"Retrieved total of {len(all_scenes)} scenes from StashDB before date filtering"
         )
@@ -147,53 +367,59 @@ class StashDBClient(BaseStashClient):
         # Debug logging to see what dates we actually got
         logger.info("Sample scene dates from StashDB:")
         for i, scene in enumerate(all_scenes[:5]):  # Log first 5 scenes
-            scene_date = scene.get("date", "No date")
-            scene_title = scene.get("title", "No title")[:50]
-            logger.info(f"  Scene {i + 1}: '{scene_title}' - Date: {scene_date}")
+            logger.info(
+                "  Scene %d: '%s' - Date: %s",
+                i + 1,
+                scene.get("title", "No title")[:50],
+                scene.get("date", "No date"),
+            )
 
         # Post-process date filtering for StashDB when both start and end dates are provided
         if start_date and end_date:
-            from datetime import datetime
-
-            filtered_scenes = []
-
             try:
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-
-                for scene in all_scenes:
-                    scene_date_str = scene.get("date")
-                    if scene_date_str:
-                        try:
-                            # Handle various date formats from StashDB
-                            if len(scene_date_str) == 10:  # YYYY-MM-DD
-                                scene_dt = datetime.strptime(scene_date_str, "%Y-%m-%d")
-                            elif len(scene_date_str) > 10:  # YYYY-MM-DD with time
-                                scene_dt = datetime.strptime(scene_date_str[:10], "%Y-%m-%d")
-                            else:
-                                logger.warning(f"Unexpected date format: {scene_date_str}")
-                                filtered_scenes.append(scene)  # Include if we can't parse
-                                continue
-
-                            # Inclusive range check: start_date <= scene_date <= end_date
-                            if start_dt <= scene_dt <= end_dt:
-                                filtered_scenes.append(scene)
-                        except ValueError as e:
-                            # If date parsing fails, include the scene to be safe
-                            logger.warning(f"Could not parse scene date '{scene_date_str}': {e}")
-                            filtered_scenes.append(scene)
-                    else:
-                        # If no date, exclude from date-filtered results
-                        logger.debug("Scene has no date, excluding from date range filter")
-
-                logger.info(
-                    f"Filtered to {len(filtered_scenes)} scenes within date range "
-                    f"{start_date} to {end_date}"
-                )
-                return filtered_scenes
-
+                start_key = date.fromisoformat(start_date).isoformat()
+                end_key = date.fromisoformat(end_date).isoformat()
             except ValueError as e:
                 logger.error(f"Date parsing error in filter parameters: {e}")
                 return all_scenes  # Return unfiltered if input date parsing fails
 
-        return all_scenes[:max_scenes]
+            filtered_scenes = []
+            append = filtered_scenes.append
+            match_iso = _ISO_DATE_PREFIX.match
+            sget = dict.get
+
+            for scene in all_scenes:
+                scene_date_str = sget(scene, "date")
+                if not scene_date_str:
+                    # If no date, exclude from date-filtered results
+                    logger.debug("Scene has no date, excluding from date range filter")
+                    continue
+
+                # Fixed-width YYYY-MM-DD strings order lexically, no parsing needed
+                if match_iso(scene_date_str):
+                    # Inclusive range check: start_date <= scene_date <= end_date
+                    if start_key <= scene_date_str[:10] <= end_key:
+                        append(scene)
+                    continue
+
+                # Slow path for non-ISO dates from StashDB
+                if len(scene_date_str) < 10:
+                    logger.warning(f"Unexpected date format: {scene_date_str}")
+                    append(scene)  # Include if we can't parse
+                    continue
+                try:
+                    scene_key = date.fromisoformat(scene_date_str[:10])
+                    if start_key <= scene_key.isoformat() <= end_key:
+                        append(scene)
+                except ValueError as e:
+                    # If date parsing fails, include the scene to be safe
+                    logger.warning(f"Could not parse scene date '{scene_date_str}': {e}")
+                    append(scene)
+
+            logger.info(
+                f"Filtered to {len(filtered_scenes)} scenes within date range "
+                f"{start_date} to {end_date}"
+            )
+            return filtered_scenes
+
+        return all_scenes
@@ -0,0 +1,39 @@
+import threading
+import time
+from typing import Any, Dict, Hashable, Tuple
+
+# Returned by TTLCache.get for absent or expired keys, so None can be cached
+MISS = object()
+
+
+class TTLCache:
+    """Small thread-safe TTL cache for idempotent query results"""
+
+    def __init__(self, maxsize: int = 16, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return MISS
+            value, expiry = entry
+            if expiry < time.monotonic():
+                del self._data[key]
+                return MISS
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                # Evict the entry closest to expiry
+                oldest = min(self._data, key=lambda k: self._data[k][1])
+                del self._data[oldest]
+            self._data[key] = (value, time.monotonic() + self.ttl)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
@@ -1,7 +1,23 @@
 import logging
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.api.ttl_cache import MISS, TTLCache
+
+# Titles per bulk import request in add_series_batch
+ADD_BATCH_SIZE = 25
+# Concurrent Whisparr requests in add_series_batch; matches the session's connection pool
+REQUEST_WORKERS = 8
+# (connect, read) seconds, so an unresponsive Whisparr cannot hang a job
+REQUEST_TIMEOUT = (5, 30)
+
+# Scene lookups by (Whisparr URL, title), shared by every client in the process so
+# runs close together, and scenes of one series, do not repeat them
+_lookup_cache = TTLCache(maxsize=1024, ttl=300.0)
 
 
 class WhisparrApi:
@@ -12,17 +28,35 @@ class WhisparrApi:
         self.api_key = config.get("api_key")
         self.root_folder = config.get("root_folder", "/data")
 
+        # Reuse connections across calls instead of a new handshake per request
+        self.session = requests.Session()
+        self.session.headers.update({"X-Api-Key": self.api_key, "Content-Type": "application/json"})
+        # Retry idempotent GETs on gateway errors; POSTs (adds, downloads) are not retried
+        adapter = HTTPAdapter(
+            pool_maxsize=8,
+            max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def close(self):
+        """Release pooled connections held by the session."""
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
     def _call_api(self, endpoint, method="GET", params=None, json=None):
         """A helper function to call the Whisparr API."""
-        headers = {"X-Api-Key": self.api_key, "Content-Type": "application/json"}
         full_url = f"{self.url}/api/v3/{endpoint}"
 
         try:
-            if method == "GET":
-                response = requests.get(full_url, headers=headers, params=params)
-            elif method == "POST":
-                response = requests.post(full_url, headers=headers, json=json)
-
+            response = self.session.request(
+                method, full_url, params=params, json=json, timeout=REQUEST_TIMEOUT
+            )
             response.raise_for_status()
 
             # Check if response has content and is JSON
@@ -47,16 +81,23 @@ class WhisparrApi:
 
     def search_scene(self, title):
         """Search for a scene in Whisparr's database."""
+        key = (self.url, title)
+        match = _lookup_cache.get(key)
+        if match is not MISS:
+            return match
+
         encoded_title = urllib.parse.quote(title)
         search_url = f"lookup/scene?term={encoded_title}"
 
         result = self._call_api(search_url)
-
-        if result and len(result) > 0:
-            return result[0]  # Return first match
-        else:
+        if result is None:
+            # The call failed; leave it uncached so the next attempt retries
             return None
 
+        match = result[0] if len(result) > 0 else None  # First match
+        _lookup_cache.set(key, match)
+        return match
+
     def check_scene_exists(self, foreign_id):
         """Check if a scene already exists in Whisparr."""
         movies = self._call_api("movie")
@@ -67,38 +108,30 @@ class WhisparrApi:
                     return True
         return False
 
-    def add_series(self, title):
-        """Find scene in Whisparr database, check if exists, add if not, then search."""
+    def _existing_foreign_ids(self):
+        """Foreign IDs of every scene already in Whisparr, from one movie listing."""
+        movies = self._call_api("movie") or []
+        return {movie.get("foreignId") for movie in movies}
 
-        logging.info(f"Processing scene: {title}")
-
-        # 1. Search Whisparr's database for the scene
+    def _lookup_scene_data(self, title):
+        """Whisparr's movie record for a title, or None if it cannot be added."""
         search_result = self.search_scene(title)
 
         if not search_result:
             logging.error(f"Scene '{title}' not found in Whisparr database")
             return None
 
-        # 2. Extract scene data
         scene_data = search_result.get("movie", {})
-        scene_title = scene_data.get("title")
-        title_slug = scene_data.get("titleSlug")
-        foreign_id = scene_data.get("foreignId")
-
-        if not all([scene_title, foreign_id]):
+        if not all([scene_data.get("title"), scene_data.get("foreignId")]):
             logging.error(f"Missing required data for scene '{title}'")
             return None
+        return scene_data
 
-        # 3. Check if scene already exists
-        if self.check_scene_exists(foreign_id):
-            logging.info(f"Scene '{title}' already exists in Whisparr")
-            return {"status": "already_exists", "title": scene_title}
-
-        # 4. Add scene to Whisparr
-        movie_payload = {
-            "title": scene_title,
-            "titleSlug": title_slug,
-            "foreignId": foreign_id,
+    def _movie_payload(self, scene_data):
+        return {
+            "title": scene_data.get("title"),
+            "titleSlug": scene_data.get("titleSlug"),
+            "foreignId": scene_data.get("foreignId"),
             "qualityProfileId": 1,
             "rootFolderPath": self.root_folder,
             "monitored": True,
@@ -107,7 +140,105 @@ class WhisparrApi:
             },
         }
 
-        result = self._call_api("movie", method="POST", json=movie_payload)
+    def _add_movies(self, payloads):
+        """Add several scenes in one bulk import, falling back to one POST each.
+
+        Returns the created movie records keyed by foreign ID.
+        """
+        created = self._call_api("movie/import", method="POST", json=payloads)
+        if isinstance(created, list):
+            return {movie.get("foreignId"): movie for movie in created if "id" in movie}
+
+        logging.warning("Whisparr bulk import failed, adding scenes one at a time")
+
+        def add(payload):
+            return self._call_api("movie", method="POST", json=payload)
+
+        added = {}
+        with ThreadPoolExecutor(max_workers=REQUEST_WORKERS) as executor:
+            for payload, result in zip(payloads, executor.map(add, payloads), strict=True):
+                if result and "id" in result:
+                    added[payload["foreignId"]] = result
+        return added
+
+    def add_series_batch(self, titles, batch_size=ADD_BATCH_SIZE, progress_callback=None):
+        """add_series for many titles, with one existence check and bulk imports.
+
+        Returns one add_series-style result (or None on failure) per title, in order.
+        progress_callback(done, total) is called after each batch.
+        """
+        results = [None] * len(titles)
+        existing = self._existing_foreign_ids()
+
+        def lookup(title):
+            logging.info(f"Processing scene: {title}")
+            try:
+                return self._lookup_scene_data(title)
+            except Exception as e:
+                logging.error(f"Error looking up scene '{title}' in Whisparr: {e}")
+                return None
+
+        with ThreadPoolExecutor(max_workers=REQUEST_WORKERS) as executor:
+            # Every distinct title is queued up front, so later batches are looked up
+            # while earlier ones are imported; a repeated title is looked up once
+            lookups = {title: executor.submit(lookup, title) for title in dict.fromkeys(titles)}
+
+            for start in range(0, len(titles), batch_size):
+                batch = titles[start : start + batch_size]
+
+                pending = {}
+                for offset, title in enumerate(batch):
+                    scene_data = lookups[title].result()
+                    if scene_data is None:
+                        continue
+                    foreign_id = scene_data["foreignId"]
+                    scene_title = scene_data["title"]
+                    if foreign_id in existing:
+                        logging.info(f"Scene '{title}' already exists in Whisparr")
+                        results[start + offset] = {"status": "already_exists", "title": scene_title}
+                        continue
+                    # Also catches the same scene appearing twice in one run
+                    existing.add(foreign_id)
+                    pending[start + offset] = self._movie_payload(scene_data)
+
+                added = self._add_movies(list(pending.values())) if pending else {}
+                for index, payload in pending.items():
+                    movie = added.get(payload["foreignId"])
+                    if movie:
+                        logging.info(
+                            f"Successfully added and searched for scene: {payload['title']}"
+                        )
+                        results[index] = {
+                            "status": "added",
+                            "title": payload["title"],
+                            "id": movie["id"],
+                        }
+                    else:
+                        logging.error(f"Failed to add scene '{titles[index]}' to Whisparr")
+
+                if progress_callback:
+                    progress_callback(min(start + batch_size, len(titles)), len(titles))
+
+        return results
+
+    def add_series(self, title):
+        """Find scene in Whisparr database, check if exists, add if not, then search."""
+
+        logging.info(f"Processing scene: {title}")
+
+        # 1. Search Whisparr's database for the scene
+        scene_data = self._lookup_scene_data(title)
+        if not scene_data:
+            return None
+        scene_title = scene_data["title"]
+
+        # 2. Check if scene already exists
+        if self.check_scene_exists(scene_data["foreignId"]):
+            logging.info(f"Scene '{title}' already exists in Whisparr")
+            return {"status": "already_exists", "title": scene_title}
+
+        # 3. Add scene to Whisparr
+        result = self._call_api("movie", method="POST", json=self._movie_payload(scene_data))
 
         if result and "id" in result:
             logging.info(f"Successfully added and searched for scene: {scene_title}")
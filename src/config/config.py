@@ -1,12 +1,36 @@
+import copy
 import logging
 import os
-from typing import Any, Dict, Optional
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
 from src.core.database_manager import DatabaseManager
 
 # Global database instance
 _db = None
 
+# Environment variables read by get_config, part of the memo key
+_CONFIG_ENV_VARS = (
+    "STASH_URL",
+    "STASH_API_KEY",
+    "WHISPARR_URL",
+    "WHISPARR_API_KEY",
+    "WHISPARR_ROOT_FOLDER",
+    "PROWLARR_URL",
+    "PROWLARR_API_KEY",
+    "PROWLARR_CATEGORIES",
+    "PROWLARR_ENABLED",
+    "PROWLARR_MAX_CONCURRENCY",
+)
+_config_memo: Dict[Any, Dict] = {}
+_config_memo_lock = threading.Lock()
+# (memo key, Config) for typed_config
+_typed_config_memo: Tuple[Any, Optional["Config"]] = (None, None)
+# Filter rules per context, valid while the database's config_version is unchanged
+_rules_memo: Dict[str, Tuple[int, List[Dict]]] = {}
+
 
 def get_database() -> DatabaseManager:
     """Get the global database instance."""
@@ -17,6 +41,17 @@ def get_database() -> DatabaseManager:
     return _db
 
 
+def _env_int(name: str, default: int, minimum: int = 1) -> int:
+    """Integer environment variable, falling back to default when unset or invalid."""
+    value = os.environ.get(name, "")
+    try:
+        return max(minimum, int(value))
+    except ValueError:
+        if value:
+            logging.warning(f"Invalid {name} {value!r}, using {default}.")
+        return default
+
+
 def validate_config(config, strict=True):
     """Validates the provided configuration."""
     if not config:
@@ -109,6 +144,8 @@ def get_config(strict=True):
                     "PROWLARR_CATEGORIES", "6000,6010,6020,6030,6040,6050,6060,6070"
                 ),
                 "enabled": os.environ.get("PROWLARR_ENABLED", "false").lower() == "true",
+                # Parallel scene searches; keep within the indexers' rate limits
+                "max_concurrency": _env_int("PROWLARR_MAX_CONCURRENCY", 8),
             },
             "jobs": {
                 "enabled_jobs": enabled_jobs,
@@ -149,9 +186,77 @@ def get_config(strict=True):
         return None
 
 
+def _config_key(strict: bool) -> Tuple:
+    db = get_database()
+    return (strict, db.config_version, tuple(os.environ.get(name) for name in _CONFIG_ENV_VARS))
+
+
+def get_config_cached(strict=True):
+    """get_config, memoized until settings, filter rules or the environment change.
+
+    Returns a copy, so callers may modify it freely.
+    """
+    key = _config_key(strict)
+    config = _config_memo.get(key)
+    if config is None:
+        config = get_config(strict=strict)
+        if config is None:
+            return None
+        with _config_memo_lock:
+            _config_memo.clear()
+            _config_memo[key] = config
+    return copy.deepcopy(config)
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Settings read on every request, parsed once per configuration change"""
+
+    timezone: ZoneInfo
+    stash_url: Optional[str]
+    stash_api_key: Optional[str]
+
+    @classmethod
+    def from_dict(cls, config: Dict) -> "Config":
+        timezone_name = config.get("main", {}).get("timezone", "UTC")
+        try:
+            timezone = ZoneInfo(timezone_name)
+        except (ZoneInfoNotFoundError, ValueError):
+            logging.warning(f"Unknown timezone {timezone_name!r}, using UTC.")
+            timezone = ZoneInfo("UTC")
+        stash = config.get("stash", {})
+        return cls(
+            timezone=timezone,
+            stash_url=stash.get("url"),
+            stash_api_key=stash.get("api_key"),
+        )
+
+
+def typed_config(strict=True) -> Optional[Config]:
+    """Config for the current configuration, memoized like get_config_cached"""
+    global _typed_config_memo
+    key = _config_key(strict)
+    memo_key, settings = _typed_config_memo
+    if memo_key != key or settings is None:
+        config = get_config_cached(strict=strict)
+        if config is None:
+            return None
+        settings = Config.from_dict(config)
+        _typed_config_memo = (key, settings)
+    return settings
+
+
 def get_filter_rules(context: str):
-    """Get filter rules for a specific context from database."""
+    """Get filter rules for a specific context from database.
+
+    Memoized until the rules or settings change; returns copies callers may modify.
+    """
     db = get_database()
+    version = db.config_version
+    memo = _rules_memo.get(context)
+    if memo is not None and memo[0] == version:
+        return [dict(rule) for rule in memo[1]]
+
     rules = db.get_filter_rules(context)
     logging.info(f"Found {len(rules)} rules for context '{context}' in database.")
 
@@ -167,7 +272,9 @@ def get_filter_rules(context: str):
         }
         yaml_rules.append(yaml_rule)
 
-    return yaml_rules
+    # A write during the read bumps config_version past `version`, so it is refetched
+    _rules_memo[context] = (version, yaml_rules)
+    return [dict(rule) for rule in yaml_rules]
 
 
 def save_filter_rules(rules: list, context: str):
@@ -202,6 +309,12 @@ def set_setting(section: str, key: str, value):
     db.set_setting(section, key, value)
 
 
+def set_settings(updates: Dict[str, Dict[str, Any]]):
+    """Set several settings at once, given as {section: {key: value}}."""
+    db = get_database()
+    db.set_settings(updates)
+
+
 def get_job_timeout():
     """Returns the job timeout in seconds."""
     return get_setting("processing", "job_timeout", 1800)
@@ -1,10 +1,11 @@
 import json
 import logging
+import os
 import sqlite3
 import threading
 import time
 from datetime import datetime, timezone
-from typing import Any, Optional, Union
+from typing import Any, Iterator, Optional, Union
 
 
 class DatabaseManager:
@@ -13,8 +14,6 @@ class DatabaseManager:
 
     def __new__(cls, db_path: str = None):
         if db_path is None:
-            import os
-
             db_path = os.environ.get("DATABASE_PATH", "/config/stash_manager.db")
 
         with cls._lock:
@@ -28,12 +27,12 @@ class DatabaseManager:
             return
 
         if db_path is None:
-            import os
-
             db_path = os.environ.get("DATABASE_PATH", "/config/stash_manager.db")
 
         self.db_path = db_path
         self.conn = None
+        # Bumped on every settings or filter rule write; keys the config memo
+        self.config_version = 0
         self._initialized = True
         self.connect()
         self.init_db()
@@ -216,6 +215,24 @@ class DatabaseManager:
             ON CONFLICT(section, key) DO UPDATE SET value = excluded.value;
         """
         self.execute_query(query, (section, key, json.dumps(value)))
+        self.config_version += 1
+
+    def set_settings(self, updates: dict[str, dict[str, Any]]) -> None:
+        """Write {section: {key: value}} settings in one statement and transaction."""
+        rows = [
+            (section, key, json.dumps(value))
+            for section, values in updates.items()
+            for key, value in values.items()
+        ]
+        if not rows:
+            return
+        placeholders = ", ".join(["(?, ?, ?)"] * len(rows))
+        query = f"""
+            INSERT INTO settings (section, key, value) VALUES {placeholders}
+            ON CONFLICT(section, key) DO UPDATE SET value = excluded.value;
+        """
+        self.execute_query(query, tuple(param for row in rows for param in row))
+        self.config_version += 1
 
     def get_filter_rules(self, context: str) -> list[dict[str, Any]]:
         rows = self.execute_query(
@@ -242,13 +259,16 @@ class DatabaseManager:
         result = self.execute_query(
             query, (context, name, field, operator, value, action, priority)
         )
+        self.config_version += 1
         return result if isinstance(result, int) else None
 
     def delete_filter_rule(self, rule_id: int) -> None:
         self.execute_query("DELETE FROM filter_rules WHERE id = ?", (rule_id,))
+        self.config_version += 1
 
     def delete_filter_rules_by_context(self, context: str) -> None:
         self.execute_query("DELETE FROM filter_rules WHERE context = ?", (context,))
+        self.config_version += 1
 
     def start_job_run(self, job_name: str, dry_run: bool = False) -> Optional[int]:
         query = """
@@ -285,6 +305,46 @@ class DatabaseManager:
             return [dict(row) for row in rows]
         return []
 
+    def count_pending_tasks(self, task_type: str) -> int:
+        query = "SELECT COUNT(*) FROM tasks WHERE type = ? AND status = 'pending'"
+        row = self.execute_query(query, (task_type,), fetch="one")
+        return row[0] if isinstance(row, sqlite3.Row) else 0
+
+    def iter_pending_tasks(
+        self, task_type: str, chunk_size: int = 500
+    ) -> Iterator[list[dict[str, Any]]]:
+        """Pending tasks oldest first, in lists of up to chunk_size, one query per list
+
+        Pages by id, so tasks marked done between lists do not shift later ones.
+        """
+        query = """
+            SELECT * FROM tasks WHERE type = ? AND status = 'pending' AND id > ?
+            ORDER BY id LIMIT ?
+        """
+        last_id = 0
+        while True:
+            rows = self.execute_query(
+                query, (task_type, last_id, chunk_size), fetch="all"
+            )
+            if not rows or not isinstance(rows, list):
+                return
+            tasks = [dict(row) for row in rows]
+            yield tasks
+            if len(tasks) < chunk_size:
+                return
+            last_id = tasks[-1]["id"]
+
+    def mark_tasks_done(self, task_ids: list[int]) -> None:
+        """Mark tasks completed with one UPDATE"""
+        if not task_ids:
+            return
+        placeholders = ",".join("?" * len(task_ids))
+        query = f"""
+            UPDATE tasks SET status = 'completed', updated_at = CURRENT_TIMESTAMP
+            WHERE id IN ({placeholders})
+        """
+        self.execute_query(query, tuple(task_ids))
+
     # One-time search methods
     def record_one_time_search(
         self, start_date: str, end_date: str, status: str = "running"
@@ -301,8 +361,6 @@ class DatabaseManager:
         self, search_id: int, status: str, results: Optional[dict] = None
     ):
         """Update a one-time search with completion status and results"""
-        import json
-
         results_json = json.dumps(results) if results else None
 
         query = """
@@ -315,8 +373,6 @@ class DatabaseManager:
 
     def get_recent_one_time_searches(self, limit: int = 10) -> list[dict[str, Any]]:
         """Get recent one-time searches with results"""
-        import json
-
         query = """
             SELECT id, start_date, end_date, status, results,
                    created_at, completed_at, duration_seconds
@@ -344,8 +400,6 @@ class DatabaseManager:
 
     def get_one_time_search(self, search_id: int) -> Optional[dict[str, Any]]:
         """Get a specific one-time search by ID"""
-        import json
-
         query = """
             SELECT id, start_date, end_date, status, results,
                    created_at, completed_at, duration_seconds
@@ -1,9 +1,10 @@
 import logging
+import os
 import re
 import threading
 import time
 
-from src.config.config import get_config
+from src.config.config import get_config_cached, typed_config
 from src.core.logging_config import setup_logging
 from src.core.scheduler import scheduler
 from src.core.signal_handlers import shutdown_event
@@ -11,7 +12,8 @@ from src.core.database_manager import DatabaseManager
 from src.web.processor import (
     add_new_scenes_to_whisparr,
     add_new_scenes_with_prowlarr,
-    generate_metadata,
+    generate_metadata_bulk,
+    get_stashdb_api,
 )
 
 
@@ -52,7 +54,7 @@ def run_scheduler():
 def setup_jobs():
     """Setup scheduled jobs based on configuration"""
     try:
-        config = get_config(strict=False)
+        config = get_config_cached(strict=False)
         if not config:
             logging.error("Could not load config for setting up jobs.")
             return
@@ -178,24 +180,22 @@ def _job_wrapper(job_name):
     """Wrapper function to execute jobs with proper error handling"""
     try:
         logging.info(f"Starting job: {job_name}")
-        config = get_config()
+        config = get_config_cached()
 
         if not config:
             logging.error("Could not load config for job execution")
             return
 
         if job_name == "add_new_scenes_to_whisparr":
-            from src.api.stash_api import StashAPI
-
             stashdb_api_key = config.get("stashdb", {}).get("api_key")
-            stashdb_api = StashAPI(url="https://stashdb.org", api_key=stashdb_api_key)
-            add_new_scenes_to_whisparr(config, stashdb_api)
+            add_new_scenes_to_whisparr(config, get_stashdb_api(stashdb_api_key))
 
         elif job_name == "clean_existing_scenes":
             from src.api.stash_api import StashAPI
 
-            local_stash_url = config.get("local_stash", {}).get("url")
-            local_stash_api_key = config.get("local_stash", {}).get("api_key")
+            settings = typed_config()
+            local_stash_url = settings.stash_url
+            local_stash_api_key = settings.stash_api_key
 
             if local_stash_url and local_stash_api_key:
                 local_stash_api = StashAPI(
@@ -216,21 +216,44 @@ def _job_wrapper(job_name):
             )
 
         elif job_name == "generate_metadata":
+            from src.api.stash_api import StashAPI
+
             db = DatabaseManager()
-            tasks = db.get_pending_tasks()
-            for task in tasks:
-                if task["type"] == "generate_metadata":
-                    scene_id = task["scene_id"]
-                    if not _validate_scene_id(scene_id):
-                        logging.error(
-                            f"Invalid scene_id in task: {scene_id}. Skipping."
-                        )
-                        continue
-                    generate_metadata(config, scene_id)
+            settings = typed_config()
+            local_stash_url = settings.stash_url
+            local_stash_api_key = settings.stash_api_key
 
-        elif job_name == "add_new_scenes_with_prowlarr":
-            import os
+            if not db.count_pending_tasks("generate_metadata"):
+                logging.info("No pending metadata tasks")
+            elif local_stash_url and local_stash_api_key:
+                local_stash_api = StashAPI(
+                    url=local_stash_url, api_key=local_stash_api_key
+                )
+                # A chunk of tasks at a time; one metadataGenerate job per batch of
+                # scenes, not one per scene
+                for chunk in db.iter_pending_tasks("generate_metadata"):
+                    tasks = []
+                    for task in chunk:
+                        scene_id = task["scene_id"]
+                        if not _validate_scene_id(scene_id):
+                            logging.error(
+                                f"Invalid scene_id in task: {scene_id}. Skipping."
+                            )
+                            continue
+                        tasks.append(task)
+                    scene_ids = [task["scene_id"] for task in tasks]
+                    generated = set(
+                        generate_metadata_bulk(config, local_stash_api, scene_ids)
+                    )
+                    db.mark_tasks_done(
+                        [task["id"] for task in tasks if task["scene_id"] in generated]
+                    )
+            else:
+                logging.error(
+                    "Local Stash configuration missing for generate_metadata job"
+                )
 
+        elif job_name == "add_new_scenes_with_prowlarr":
             from src.api.stash_api import StashAPI
 
             stash_url = os.environ.get("STASH_URL")
@@ -1,22 +1,69 @@
+# Optional dependencies: orjson, when installed, encodes the buffered log entries;
+# pyahocorasick matches multi-word log searches in one pass per entry.
+
+import json
 import logging
 import os
-from collections import deque
+from collections import OrderedDict, deque
+from functools import lru_cache
+from itertools import chain, islice
 from logging.handlers import RotatingFileHandler
-from threading import Lock
-from typing import Any, Dict, List, Optional
+from threading import Condition, Lock
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
 
 import coloredlogs
 
+try:
+    import orjson
+except ImportError:  # Optional fast JSON codec; fall back to the stdlib
+    orjson = None
+
+try:
+    import ahocorasick
+except ImportError:  # Optional C extension; fall back to a substring check per word
+    ahocorasick = None
+
+
+class _BufferedLog(NamedTuple):
+    """A log entry with what streaming and search need, computed once on append"""
+
+    entry: Dict[str, Any]
+    encoded: bytes  # entry as JSON
+    message_lc: str
+    logger_lc: str
+
+
 # Global log buffer for real-time streaming
-_log_buffer: deque = deque(maxlen=1000)  # Keep last 1000 log entries
+LOG_BUFFER_SIZE = 1000  # Keep last 1000 log entries; older ones are evicted on append
+_log_buffer: deque = deque(maxlen=LOG_BUFFER_SIZE)
 _log_buffer_lock = Lock()
-_log_listeners: List = []  # Store SSE listeners
+# Notified on every append; SSE streams wait on it and read the shared buffer
+# from their own cursor instead of each holding a queue of copies
+_log_appended = Condition(_log_buffer_lock)
+_log_seq = 0  # Entries appended so far; cursors count against this
+_log_generation = 0  # Bumped whenever the buffer changes; invalidates search results
+
+# Recent search results by (level, query): the position a limited scan stopped
+# at (0 if it covered everything) and the positions it matched after that. A
+# query typed after one of its prefixes only matches a subset of the prefix's
+# results, so it filters those instead of the whole buffer.
+SEARCH_CACHE_SIZE = 32
+_search_cache: "OrderedDict[Tuple[Optional[str], str], Tuple[int, List[int]]]" = OrderedDict()
+_search_cache_generation = 0
+_search_cache_lock = Lock()
+
+
+def _encode_entry(log_entry: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(log_entry)
+    return json.dumps(log_entry).encode("utf-8")
 
 
 class BufferedHandler(logging.Handler):
     """Custom handler that stores logs in memory buffer for real-time streaming."""
 
     def emit(self, record):
+        global _log_seq, _log_generation
         try:
             msg = self.format(record)
             log_entry = {
@@ -29,42 +76,56 @@ class BufferedHandler(logging.Handler):
                 "formatted": msg,
             }
 
-            with _log_buffer_lock:
-                _log_buffer.append(log_entry)
-
-            # Notify all SSE listeners
-            for listener in _log_listeners[:]:  # Copy list to avoid modification during iteration
-                try:
-                    listener(log_entry)
-                except Exception:
-                    # Remove broken listeners
-                    if listener in _log_listeners:
-                        _log_listeners.remove(listener)
-
+            buffered = _BufferedLog(
+                log_entry,
+                _encode_entry(log_entry),
+                log_entry["message"].lower(),
+                log_entry["logger"].lower(),
+            )
+            with _log_appended:
+                _log_buffer.append(buffered)
+                _log_seq += 1
+                _log_generation += 1
+                _log_appended.notify_all()
         except Exception:
             self.handleError(record)
 
 
-def add_log_listener(listener):
-    """Add a listener for real-time log streaming."""
-    _log_listeners.append(listener)
-
-
-def remove_log_listener(listener):
-    """Remove a log listener."""
-    if listener in _log_listeners:
-        _log_listeners.remove(listener)
-
-
 def get_log_buffer(
     limit: Optional[int] = None, level_filter: Optional[str] = None
 ) -> List[Dict[str, Any]]:
     """Get logs from the buffer with optional filtering."""
+    level = level_filter.upper() if level_filter else None
     with _log_buffer_lock:
-        logs = list(_log_buffer)
+        newest = _newest_entries(_log_buffer, limit, level)
+    return [buffered.entry for buffered in newest]
+
+
+def get_encoded_log_buffer(
+    limit: Optional[int] = None,
+    level_filter: Optional[str] = None,
+    search: Optional[str] = None,
+) -> List[bytes]:
+    """get_log_buffer, but each entry as the JSON bytes encoded when it was logged.
+
+    search keeps entries whose message or logger name contains each of its
+    whitespace-separated words (lower-case).
+    """
+    level = level_filter.upper() if level_filter else None
+    if not search:
+        # Nothing to search: only the newest limit entries are read
+        with _log_buffer_lock:
+            newest = _newest_entries(_log_buffer, limit, level)
+        return [buffered.encoded for buffered in newest]
 
-    if level_filter:
-        logs = [log for log in logs if log["level"] == level_filter.upper()]
+    with _log_buffer_lock:
+        entries = list(_log_buffer)
+        generation = _log_generation
+
+    if level:
+        entries = [buffered for buffered in entries if buffered.entry["level"] == level]
+    entries = _search_entries(entries, generation, level, search, limit)
+    logs = [buffered.encoded for buffered in entries]
 
     if limit:
         logs = logs[-limit:]
@@ -72,6 +133,141 @@ def get_log_buffer(
     return logs
 
 
+def _newest_entries(
+    records: deque, limit: Optional[int], level: Optional[str]
+) -> List[_BufferedLog]:
+    """The newest limit records (all without a limit), of level if given, oldest first."""
+    newest = reversed(records)
+    if level:
+        newest = (buffered for buffered in newest if buffered.entry["level"] == level)
+    kept = list(islice(newest, limit) if limit else newest)
+    kept.reverse()
+    return kept
+
+
+def _search_entries(
+    entries: List[_BufferedLog],
+    generation: int,
+    level: Optional[str],
+    search: str,
+    limit: Optional[int] = None,
+) -> List[_BufferedLog]:
+    """Entries matching search; with a limit, at least the newest limit of them.
+
+    Scans back from the newest entry and stops once limit entries match. When a
+    prefix of search is cached, its matches are checked first and only entries
+    older than its scan reached are read from the buffer.
+    """
+    global _search_cache_generation
+    cached = None
+    with _search_cache_lock:
+        if _search_cache_generation != generation:
+            _search_cache.clear()
+            _search_cache_generation = generation
+        for end in range(len(search), 0, -1):
+            key = (level, search[:end])
+            cached = _search_cache.get(key)
+            if cached is not None:
+                _search_cache.move_to_end(key)
+                break
+
+    if cached is None:
+        start, candidates = len(entries), ()
+    else:
+        start, positions = cached
+        if end == len(search) and (start == 0 or (limit and len(positions) >= limit)):
+            return [entries[position] for position in positions]
+        candidates = reversed(positions)
+
+    matches = _search_predicate(search)
+    found: List[int] = []
+    stop = 0
+    for position in chain(candidates, range(start - 1, -1, -1)):
+        if matches(entries[position]):
+            found.append(position)
+            if limit and len(found) >= limit:
+                stop = position
+                break
+    found.reverse()
+
+    with _search_cache_lock:
+        if _search_cache_generation == generation:
+            _search_cache[(level, search)] = (stop, found)
+            if len(_search_cache) > SEARCH_CACHE_SIZE:
+                _search_cache.popitem(last=False)
+    return [entries[position] for position in found]
+
+
+@lru_cache(maxsize=SEARCH_CACHE_SIZE)
+def _word_automaton(words: Tuple[str, ...]):
+    """An Aho-Corasick automaton over the search words, if available"""
+    if ahocorasick is None:
+        return None
+
+    automaton = ahocorasick.Automaton()
+    for index, word in enumerate(words):
+        automaton.add_word(word, index)
+    automaton.make_automaton()
+    return automaton
+
+
+def _search_predicate(search: str) -> Callable[[_BufferedLog], bool]:
+    """Test for entries whose message or logger name contains every word of search.
+
+    A query typed after one of its prefixes only lengthens its last word or adds
+    another, so it never matches an entry the prefix did not.
+    """
+    words = tuple(sorted(set(search.split())))
+    if not words:
+        return lambda buffered: True
+    if len(words) == 1:
+        word = words[0]
+        return lambda buffered: word in buffered.message_lc or word in buffered.logger_lc
+
+    automaton = _word_automaton(words)
+    if automaton is None:
+        return lambda buffered: all(
+            word in buffered.message_lc or word in buffered.logger_lc for word in words
+        )
+
+    def matches(buffered: _BufferedLog) -> bool:
+        found = {index for _, index in automaton.iter(buffered.message_lc)}
+        if len(found) < len(words):
+            found.update(index for _, index in automaton.iter(buffered.logger_lc))
+        return len(found) == len(words)
+
+    return matches
+
+
+def clear_log_buffer() -> None:
+    """Drop every buffered entry."""
+    global _log_generation
+    with _log_buffer_lock:
+        _log_buffer.clear()
+        _log_generation += 1
+
+
+def get_log_tail(limit: int) -> Tuple[int, List[bytes]]:
+    """The last limit buffered entries as JSON bytes, and the cursor just past them."""
+    with _log_buffer_lock:
+        tail = _newest_entries(_log_buffer, limit, None)
+        return _log_seq, [buffered.encoded for buffered in tail]
+
+
+def read_logs_since(cursor: int, timeout: float) -> Tuple[int, List[bytes]]:
+    """Entries (as JSON bytes) appended after cursor, waiting up to timeout for one.
+
+    Returns the new cursor with the entries. A reader that fell further behind
+    than the buffer holds skips what was overwritten.
+    """
+    with _log_appended:
+        if _log_seq == cursor:
+            _log_appended.wait(timeout)
+        size = len(_log_buffer)
+        count = min(_log_seq - cursor, size)
+        return _log_seq, [_log_buffer[i].encoded for i in range(size - count, size)]
+
+
 def setup_logging(config):
     """Setup logging based on configuration"""
     log_level = config.get("logs", {}).get("level", "INFO").upper()
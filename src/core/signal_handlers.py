@@ -24,6 +24,13 @@ def _do_cleanup():
     except Exception as e:
         logging.error(f"Error clearing scheduler: {e}")
 
+    try:
+        from src.config.config import get_database
+
+        get_database().close()
+    except Exception as e:
+        logging.error(f"Error closing database: {e}")
+
 
 def signal_handler(signum, frame):
     """Handle shutdown signals gracefully"""
@@ -6,6 +6,32 @@ class ValidationError(Exception):
     pass
 
 
+# Ordered for error messages; the sets give O(1) membership checks
+VALID_OPERATORS = (
+    "include",
+    "exclude",
+    "is_larger_than",
+    "is_smaller_than",
+    "equals",
+    "not_equals",
+    "contains",
+    "not_contains",
+    "starts_with",
+    "ends_with",
+    "regex",
+)
+_VALID_OPERATOR_SET = frozenset(VALID_OPERATORS)
+
+VALID_ACTIONS = ("accept", "reject")
+_VALID_ACTION_SET = frozenset(VALID_ACTIONS)
+
+VALID_SORT_DIRECTIONS = ("ASC", "DESC")
+_VALID_SORT_DIRECTION_SET = frozenset(VALID_SORT_DIRECTIONS)
+
+# Compiled once rather than looked up in re's cache on every run_job request
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+
 def validate_string(
     value: str,
     field_name: str,
@@ -40,24 +66,11 @@ def validate_string(
 
 def validate_operator(value: str) -> str:
     """Validate filter operator"""
-    valid_operators = [
-        "include",
-        "exclude",
-        "is_larger_than",
-        "is_smaller_than",
-        "equals",
-        "not_equals",
-        "contains",
-        "not_contains",
-        "starts_with",
-        "ends_with",
-        "regex",
-    ]
     value = validate_string(value, "operator", required=True)
 
-    if value not in valid_operators:
+    if value not in _VALID_OPERATOR_SET:
         raise ValidationError(
-            f"Invalid operator. Must be one of: {', '.join(valid_operators)}"
+            f"Invalid operator. Must be one of: {', '.join(VALID_OPERATORS)}"
         )
 
     return value
@@ -65,12 +78,11 @@ def validate_operator(value: str) -> str:
 
 def validate_action(value: str) -> str:
     """Validate filter action"""
-    valid_actions = ["accept", "reject"]
     value = validate_string(value, "action", required=True)
 
-    if value not in valid_actions:
+    if value not in _VALID_ACTION_SET:
         raise ValidationError(
-            f"Invalid action. Must be one of: {', '.join(valid_actions)}"
+            f"Invalid action. Must be one of: {', '.join(VALID_ACTIONS)}"
         )
 
     return value
@@ -132,20 +144,20 @@ def validate_job_parameters(job_name: str, params: Dict[str, Any]) -> Dict[str,
             start_date = validate_string(
                 params["start_date"], "start_date", required=False
             )
-            if start_date and not re.match(r"^\d{4}-\d{2}-\d{2}$", start_date):
+            if start_date and not _DATE_PATTERN.match(start_date):
                 raise ValidationError("Start date must be in YYYY-MM-DD format")
             validated["start_date"] = start_date
 
         if params.get("end_date"):
             end_date = validate_string(params["end_date"], "end_date", required=False)
-            if end_date and not re.match(r"^\d{4}-\d{2}-\d{2}$", end_date):
+            if end_date and not _DATE_PATTERN.match(end_date):
                 raise ValidationError("End date must be in YYYY-MM-DD format")
             validated["end_date"] = end_date
 
         validated["dry_run"] = str(params.get("dry_run", "false")).lower() == "true"
 
         sort_direction = params.get("sort_direction", "DESC")
-        if sort_direction not in ["ASC", "DESC"]:
+        if sort_direction not in _VALID_SORT_DIRECTION_SET:
             raise ValidationError("Sort direction must be ASC or DESC")
         validated["sort_direction"] = sort_direction
 
@@ -1,7 +1,13 @@
 import logging
-from typing import Tuple
+from typing import Dict, List, Tuple
 
-from src.filters.filter import _check_condition, _get_value_from_path
+from src.filters.filter import RuleEvaluator, compile_rule
+from src.filters.rule_stats import (
+    load_rule_stats,
+    order_by_match_rate,
+    rule_key,
+    save_rule_stats,
+)
 
 logger = logging.getLogger("stash_manager.add_scenes_filter")
 
@@ -11,8 +17,13 @@ class AddScenesFilter:
     Filter engine specifically for adding scenes from StashDB to Whisparr.
     Uses StashDB data structure and conservative logic.
     Default: REJECT (only add explicitly accepted scenes)
+
+    Rules are evaluated with the ones that matched most often in earlier runs
+    first, without changing any decision; call save_rule_stats() after a job.
     """
 
+    STATS_CONTEXT = "add_scenes"
+
     def __init__(self, config: dict, conditions: dict):
         # Get rules directly from database instead of from config
         from src.config.config import get_filter_rules
@@ -20,21 +31,23 @@ class AddScenesFilter:
         rules = get_filter_rules("add_scenes")
         self.filter_config = {"rules": rules}
         self.conditions = conditions
+        compiled = self._compile_rules(rules)
+        keys = [rule_key(name, field, op, value) for name, field, op, _, _, value in compiled]
+        order = order_by_match_rate(
+            keys, [rule[3] for rule in compiled], load_rule_stats(self.STATS_CONTEXT)
+        )
+        self._compiled_rules = [compiled[i][:5] for i in order]
+        self._rule_keys = [keys[i] for i in order]
+        # [matches, evaluations] per compiled rule for this run
+        self._rule_counts = [[0, 0] for _ in order]
         logger.info(f"Initialized AddScenesFilter with {len(rules)} rules from database")
 
-    def should_add_scene(self, scene: dict) -> Tuple[bool, str]:
-        """
-        Evaluates if a scene from StashDB should be added to Whisparr.
-        Conservative approach: only add scenes that explicitly match 'accept' rules.
-        """
-        scene_title = scene.get("title", "Untitled")
-        logger.debug(f"Filtering scene for addition: {scene_title}")
-
-        rules = self.filter_config.get("rules", [])
-        if not rules:
-            logger.warning("No add_scenes rules found - will reject by default")
-
-        # Process rules in order - first match wins
+    @staticmethod
+    def _compile_rules(
+        rules: List[Dict],
+    ) -> List[Tuple[str, str, str, str, RuleEvaluator, object]]:
+        """Resolve each rule once into (name, field, operator, action, evaluator, value)."""
+        compiled = []
         for i, rule in enumerate(rules):
             rule_name = rule.get("name", f"Rule {i + 1}")
 
@@ -47,20 +60,117 @@ class AddScenesFilter:
                 logger.warning(f"Skipping malformed rule '{rule_name}'")
                 continue
 
-            scene_value = _get_value_from_path(scene, field)
-            condition_matches, matched_value = _check_condition(scene_value, operator, value, field)
+            compiled.append(
+                (
+                    rule_name,
+                    field,
+                    operator,
+                    action.lower(),
+                    compile_rule(field, operator, value),
+                    value,
+                )
+            )
+        return compiled
 
-            if condition_matches:
-                field_label = self.conditions.get(field, {}).get("label", field)
-                reason = f"{field_label} {operator} {matched_value}"
+    def required_measurement_fields(self) -> Tuple[str, ...]:
+        """Performer measurement subfields referenced by the rules, for query projection"""
+        prefix = "performers.performer.measurements."
+        return tuple(
+            sorted(
+                {
+                    field[len(prefix) :]
+                    for _, field, _, _, _ in self._compiled_rules
+                    if field.startswith(prefix)
+                }
+            )
+        )
 
-                if action.lower() == "accept":
-                    logger.debug(f"Scene '{scene_title}' ACCEPTED by rule '{rule_name}': {reason}")
-                    return True, f"Accepted: {reason}"
-                else:
-                    logger.debug(f"Scene '{scene_title}' REJECTED by rule '{rule_name}': {reason}")
-                    return False, f"Rejected: {reason}"
+    def _decide(
+        self, scene_title: str, rule_name: str, field: str, operator: str, action: str, matched
+    ) -> Tuple[bool, str]:
+        field_label = self.conditions.get(field, {}).get("label", field)
+        reason = f"{field_label} {operator} {matched}"
+
+        if action == "accept":
+            logger.debug("Scene '%s' ACCEPTED by rule '%s': %s", scene_title, rule_name, reason)
+            return True, f"Accepted: {reason}"
+        logger.debug("Scene '%s' REJECTED by rule '%s': %s", scene_title, rule_name, reason)
+        return False, f"Rejected: {reason}"
+
+    def should_add_scene(self, scene: dict) -> Tuple[bool, str]:
+        """
+        Evaluates if a scene from StashDB should be added to Whisparr.
+        Conservative approach: only add scenes that explicitly match 'accept' rules.
+        """
+        scene_title = scene.get("title", "Untitled")
+        logger.debug("Filtering scene for addition: %s", scene_title)
+
+        if not self._compiled_rules:
+            logger.warning("No add_scenes rules found - will reject by default")
+
+        # Process rules in order - first match wins
+        for counts, (rule_name, field, operator, action, evaluate) in zip(
+            self._rule_counts, self._compiled_rules, strict=True
+        ):
+            condition_matches, matched_value = evaluate(scene)
+            counts[1] += 1
+
+            if condition_matches:
+                counts[0] += 1
+                return self._decide(scene_title, rule_name, field, operator, action, matched_value)
 
         # No rules matched - default REJECT for safety
-        logger.debug(f"Scene '{scene_title}' did not match any rules → REJECT (add_scenes default)")
+        logger.debug(
+            "Scene '%s' did not match any rules → REJECT (add_scenes default)", scene_title
+        )
         return False, "No rules matched - default reject"
+
+    def classify_scenes(self, scenes: List[Dict]) -> List[Tuple[bool, str]]:
+        """
+        Evaluate should_add_scene for a whole batch, returning decisions in input order.
+        Works rule by rule over the scenes no earlier rule has decided, so each rule's
+        state stays hot across the batch while keeping first-match-wins semantics.
+        """
+        if not self._compiled_rules:
+            logger.warning("No add_scenes rules found - will reject by default")
+
+        default = (False, "No rules matched - default reject")
+        decisions: List[Tuple[bool, str]] = [default] * len(scenes)
+        undecided = range(len(scenes))
+
+        for counts, (rule_name, field, operator, action, evaluate) in zip(
+            self._rule_counts, self._compiled_rules, strict=True
+        ):
+            counts[1] += len(undecided)
+            still_undecided = []
+            for idx in undecided:
+                scene = scenes[idx]
+                condition_matches, matched_value = evaluate(scene)
+                if condition_matches:
+                    counts[0] += 1
+                    decisions[idx] = self._decide(
+                        scene.get("title", "Untitled"),
+                        rule_name,
+                        field,
+                        operator,
+                        action,
+                        matched_value,
+                    )
+                else:
+                    still_undecided.append(idx)
+            undecided = still_undecided
+            if not undecided:
+                break
+
+        return decisions
+
+    def save_rule_stats(self) -> None:
+        """Persist this run's per-rule match counts to order the rules next time"""
+        save_rule_stats(
+            self.STATS_CONTEXT,
+            {
+                key: counts
+                for key, counts in zip(self._rule_keys, self._rule_counts, strict=True)
+                if counts[1]
+            },
+        )
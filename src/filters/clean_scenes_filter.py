@@ -1,7 +1,7 @@
 import logging
-from typing import Tuple
+from typing import Dict, List, Optional, Tuple
 
-from src.filters.filter import _check_condition, _get_value_from_path
+from src.filters.filter import RuleEvaluator, compile_rule
 
 logger = logging.getLogger("stash_manager.clean_scenes_filter")
 
@@ -14,26 +14,17 @@ class CleanScenesFilter:
     """
 
     def __init__(self, config: dict, conditions: dict):
-        self.conditions = conditions
-        logger.info("Initialized CleanScenesFilter")
-
-    def should_keep_scene(self, scene: dict) -> Tuple[bool, str]:
-        """
-        Evaluates if a scene in local Stash should be kept.
-        Conservative approach: only delete scenes that explicitly match 'reject' rules.
-        """
         # Get rules directly from database instead of from config
         from src.config.config import get_filter_rules
 
-        rules = get_filter_rules("clean_scenes")
-
-        scene_title = scene.get("title", "Untitled")
-        logger.debug(f"Filtering scene for cleaning: {scene_title}")
-
-        if not rules:
-            logger.warning("No clean_scenes rules found - will keep by default")
+        self.conditions = conditions
+        self._compiled_rules = self._compile_rules(get_filter_rules("clean_scenes"))
+        logger.info("Initialized CleanScenesFilter")
 
-        # Process rules in order - first match wins
+    @staticmethod
+    def _compile_rules(rules: List[Dict]) -> List[Tuple[str, str, str, str, RuleEvaluator]]:
+        """Resolve each rule once into (name, field, operator, action, evaluator)."""
+        compiled = []
         for i, rule in enumerate(rules):
             rule_name = rule.get("name", f"Rule {i + 1}")
 
@@ -46,25 +37,112 @@ class CleanScenesFilter:
                 logger.warning(f"Skipping malformed rule '{rule_name}'")
                 continue
 
-            scene_value = _get_value_from_path(scene, field)
-            condition_matches, matched_value = _check_condition(scene_value, operator, value, field)
+            compiled.append(
+                (rule_name, field, operator, action.lower(), compile_rule(field, operator, value))
+            )
+        return compiled
 
-            if condition_matches:
-                field_label = self.conditions.get(field, {}).get("label", field)
+    @staticmethod
+    def server_prefilter() -> Optional[Dict]:
+        """
+        Build a Stash scene_filter matching every scene a reject rule could match.
+        Scenes outside it can only be kept, so the clean job need not fetch them.
+        The full rule list is still evaluated client-side on what is returned.
+        Returns None when some reject rule cannot be expressed server-side.
+        """
+        from src.config.config import get_filter_rules
 
-                display_value = matched_value
-                if isinstance(matched_value, dict) and "name" in matched_value:
-                    display_value = matched_value["name"]
+        criteria = []
+        for rule in get_filter_rules("clean_scenes"):
+            if rule.get("action", "accept").lower() != "reject":
+                continue
+            # Only title substring rules map onto a scene_filter criterion by name
+            if rule.get("field") != "title" or rule.get("match") != "include":
+                return None
+            values = [v.strip() for v in str(rule.get("value") or "").split(",")]
+            if not all(values):
+                return None
+            criteria.extend({"title": {"value": v, "modifier": "INCLUDES"}} for v in values)
+
+        if not criteria:
+            return None
+
+        # SceneFilterType nests alternatives through its OR field
+        scene_filter = criteria[-1]
+        for criterion in reversed(criteria[:-1]):
+            scene_filter = {**criterion, "OR": scene_filter}
+        return scene_filter
+
+    def _decide(
+        self, scene_title: str, rule_name: str, field: str, operator: str, action: str, matched
+    ) -> Tuple[bool, str]:
+        field_label = self.conditions.get(field, {}).get("label", field)
+
+        display_value = matched
+        if isinstance(matched, dict) and "name" in matched:
+            display_value = matched["name"]
+
+        reason = f"{field_label} {operator} {display_value}"
+
+        if action == "reject":
+            logger.debug("Scene '%s' REJECTED by rule '%s': %s", scene_title, rule_name, reason)
+            return False, f"Rejected: {reason}"
+        logger.debug("Scene '%s' ACCEPTED by rule '%s': %s", scene_title, rule_name, reason)
+        return True, f"Accepted: {reason}"
 
-                reason = f"{field_label} {operator} {display_value}"
+    def should_keep_scene(self, scene: dict) -> Tuple[bool, str]:
+        """
+        Evaluates if a scene in local Stash should be kept.
+        Conservative approach: only delete scenes that explicitly match 'reject' rules.
+        """
+        scene_title = scene.get("title", "Untitled")
+        logger.debug("Filtering scene for cleaning: %s", scene_title)
 
-                if action.lower() == "reject":
-                    logger.debug(f"Scene '{scene_title}' REJECTED by rule '{rule_name}': {reason}")
-                    return False, f"Rejected: {reason}"
-                else:
-                    logger.debug(f"Scene '{scene_title}' ACCEPTED by rule '{rule_name}': {reason}")
-                    return True, f"Accepted: {reason}"
+        if not self._compiled_rules:
+            logger.warning("No clean_scenes rules found - will keep by default")
+
+        # Process rules in order - first match wins
+        for rule_name, field, operator, action, evaluate in self._compiled_rules:
+            condition_matches, matched_value = evaluate(scene)
+
+            if condition_matches:
+                return self._decide(scene_title, rule_name, field, operator, action, matched_value)
 
         # No rules matched - default ACCEPT for safety (preserve curated library)
-        logger.debug(f"Scene '{scene_title}' did not match any rules and will be kept by default.")
+        logger.debug("Scene '%s' did not match any rules and will be kept by default.", scene_title)
         return True, "No rules matched - default keep"
+
+    def classify_scenes(self, scenes: List[Dict]) -> List[Tuple[bool, str]]:
+        """
+        Evaluate should_keep_scene for a whole batch, returning decisions in input order.
+        Works rule by rule over the scenes no earlier rule has decided, keeping
+        first-match-wins semantics.
+        """
+        if not self._compiled_rules:
+            logger.warning("No clean_scenes rules found - will keep by default")
+
+        default = (True, "No rules matched - default keep")
+        decisions: List[Tuple[bool, str]] = [default] * len(scenes)
+        undecided = range(len(scenes))
+
+        for rule_name, field, operator, action, evaluate in self._compiled_rules:
+            still_undecided = []
+            for idx in undecided:
+                scene = scenes[idx]
+                condition_matches, matched_value = evaluate(scene)
+                if condition_matches:
+                    decisions[idx] = self._decide(
+                        scene.get("title", "Untitled"),
+                        rule_name,
+                        field,
+                        operator,
+                        action,
+                        matched_value,
+                    )
+                else:
+                    still_undecided.append(idx)
+            undecided = still_undecided
+            if not undecided:
+                break
+
+        return decisions
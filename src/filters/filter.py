@@ -1,9 +1,19 @@
+import functools
 import logging
 import re
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
 
 logger = logging.getLogger("stash_manager.filter")
 
+_MEASUREMENT_PATHS = frozenset({"performers.cup_size", "performers.waist", "performers.hip"})
+
+# Measurements like "38DD-20-34" or "36D-24-36", and "38-20-34" without a cup size
+_MEASUREMENTS_WITH_CUP = re.compile(r"(\d+)([A-Z]+)-(\d+)-(\d+)")
+_MEASUREMENTS_WITHOUT_CUP = re.compile(r"(\d+)-(\d+)-(\d+)")
+
+# Evaluates one rule against a scene, returning (matches, matched_value)
+RuleEvaluator = Callable[[Dict], Tuple[bool, Any]]
+
 
 def _is_cup_size_match(scene_cup: str, rule_cup: str) -> bool:
     """
@@ -25,9 +35,8 @@ def _parse_measurements(measurements_str: str) -> Dict[str, Any]:
     if not measurements_str:
         return {"cup_size": None, "waist": None, "hip": None}
 
-    # Pattern to match measurements like "38DD-20-34" or "36D-24-36"
-    pattern_with_cup = r"(\d+)([A-Z]+)-(\d+)-(\d+)"
-    match = re.match(pattern_with_cup, measurements_str.strip())
+    measurements_str = measurements_str.strip()
+    match = _MEASUREMENTS_WITH_CUP.match(measurements_str)
 
     if match:
         cup_size = match.group(2)
@@ -36,9 +45,7 @@ def _parse_measurements(measurements_str: str) -> Dict[str, Any]:
 
         return {"cup_size": cup_size, "waist": waist, "hip": hip}
 
-    # Pattern to match measurements like "38-20-34"
-    pattern_without_cup = r"(\d+)-(\d+)-(\d+)"
-    match = re.match(pattern_without_cup, measurements_str.strip())
+    match = _MEASUREMENTS_WITHOUT_CUP.match(measurements_str)
 
     if match:
         # It matched, but there's no cup size. Return None for cup_size.
@@ -67,7 +74,7 @@ def _get_value_from_path(data: Dict, path: str) -> Any:
         return len(performers)
 
     # Handle special parsed measurement fields
-    if path in ["performers.cup_size", "performers.waist", "performers.hip"]:
+    if path in _MEASUREMENT_PATHS:
         performers = data.get("performers", [])
         if not isinstance(performers, list):
             return None
@@ -85,17 +92,21 @@ def _get_value_from_path(data: Dict, path: str) -> Any:
         return results if results else None
 
     # Original logic for all other paths
-    keys = path.split(".")
+    return _walk_keys(data, tuple(path.split(".")))
+
+
+def _walk_keys(data: Any, keys: Tuple[str, ...]) -> Any:
+    """Walk pre-split path keys, fanning out over any list encountered."""
     current_value = data
     for i, key in enumerate(keys):
         if current_value is None:
             return None
         if isinstance(current_value, list):
             # If we have a list, collect the value from each item in the list
-            remaining_path = ".".join(keys[i:])
+            remaining_keys = keys[i:]
             results = []
             for item in current_value:
-                value = _get_value_from_path(item, remaining_path)
+                value = _walk_keys(item, remaining_keys)
                 if value is not None:
                     if isinstance(value, list):
                         results.extend(value)
@@ -109,6 +120,14 @@ def _get_value_from_path(data: Dict, path: str) -> Any:
     return current_value
 
 
+def _compile_path(path: str) -> Callable[[Dict], Any]:
+    """Return a getter equivalent to _get_value_from_path(data, path)."""
+    if path == "performers.count" or path in _MEASUREMENT_PATHS:
+        return lambda data: _get_value_from_path(data, path)
+    keys = tuple(path.split("."))
+    return lambda data: _walk_keys(data, keys)
+
+
 def _check_condition(
     scene_value: Any, operator: str, rule_value: Any, field: Optional[str] = None
 ) -> Tuple[bool, Any]:
@@ -120,6 +139,36 @@ def _check_condition(
     - 'include': Returns True if the scene CONTAINS the rule value
     - 'exclude': Returns True if the scene DOES NOT CONTAIN the rule value
     """
+    return _match_values(
+        scene_value,
+        operator,
+        _normalize_rule_values(rule_value),
+        rule_value,
+        bool(field and "tags" in field),
+    )
+
+
+def _normalize_rule_values(rule_value: Any) -> List[str]:
+    """Lower-case and split a rule value into the strings scene values are matched against."""
+    if rule_value is not None:
+        if isinstance(rule_value, list):
+            return [str(v).lower().strip() for v in rule_value]
+        return [v.strip() for v in str(rule_value).lower().split(",")]
+    return []
+
+
+def _match_values(
+    scene_value: Any,
+    operator: str,
+    rule_values_lower: List[str],
+    rule_value: Any,
+    is_tags: bool,
+    rule_value_set: Optional[FrozenSet[str]] = None,
+) -> Tuple[bool, Any]:
+    """_check_condition with the rule side already normalized.
+
+    rule_value_set is frozenset(rule_values_lower), for exact tag name lookups.
+    """
     if scene_value is None:
         if operator == "include":
             # Scene has no value, so it doesn't include anything
@@ -132,31 +181,26 @@ def _check_condition(
     if not isinstance(scene_value, list):
         scene_value = [scene_value]
 
-    if rule_value is not None:
-        if isinstance(rule_value, list):
-            rule_values_lower = [str(v).lower().strip() for v in rule_value]
-        else:
-            rule_values_lower = [v.strip() for v in str(rule_value).lower().split(",")]
-    else:
-        rule_values_lower = []
+    if is_tags and rule_value_set is None:
+        rule_value_set = frozenset(rule_values_lower)
 
     if operator == "include":
         # INCLUDE: Return True if scene contains ANY of the rule values
         for s_val_orig in scene_value:
             s_val_to_check = s_val_orig
-            if field and "tags" in field and isinstance(s_val_orig, dict) and "name" in s_val_orig:
+            if is_tags and isinstance(s_val_orig, dict) and "name" in s_val_orig:
                 s_val_to_check = s_val_orig["name"]
 
             s_val_lower = str(s_val_to_check).lower()
 
-            for r_val in rule_values_lower:
-                is_match = False
-                if field and "tags" in field:
-                    is_match = r_val == s_val_lower
-                else:
-                    is_match = _is_cup_size_match(s_val_lower, r_val) or (r_val in s_val_lower)
+            if is_tags:
+                # Tag names match exactly, so one set lookup covers every rule value
+                if s_val_lower in rule_value_set:
+                    return True, s_val_orig
+                continue
 
-                if is_match:
+            for r_val in rule_values_lower:
+                if _is_cup_size_match(s_val_lower, r_val) or (r_val in s_val_lower):
                     return True, s_val_orig
         return False, None
 
@@ -165,21 +209,19 @@ def _check_condition(
         # This is the FIXED logic - opposite of include
         for s_val_orig in scene_value:
             s_val_to_check = s_val_orig
-            if field and "tags" in field and isinstance(s_val_orig, dict) and "name" in s_val_orig:
+            if is_tags and isinstance(s_val_orig, dict) and "name" in s_val_orig:
                 s_val_to_check = s_val_orig["name"]
 
             s_val_lower = str(s_val_to_check).lower()
 
-            for r_val in rule_values_lower:
-                is_match = False
-                if field and "tags" in field:
-                    is_match = r_val == s_val_lower
-                else:
-                    is_match = r_val in s_val_lower
+            if is_tags:
+                is_match = s_val_lower in rule_value_set
+            else:
+                is_match = any(r_val in s_val_lower for r_val in rule_values_lower)
 
-                if is_match:
-                    # Found the excluded value in the scene, so rule DOESN'T match
-                    return False, None
+            if is_match:
+                # Found the excluded value in the scene, so rule DOESN'T match
+                return False, None
 
         # Went through all scene values and didn't find any excluded values
         # So the scene successfully excludes the rule value - rule matches
@@ -202,3 +244,32 @@ def _check_condition(
 
     logger.warning(f"Unknown operator '{operator}' used in filter rule.")
     return False, None
+
+
+def compile_rule(field: str, operator: str, rule_value: Any) -> RuleEvaluator:
+    """
+    Pre-bind a rule's field path, operator and normalized values into one callable.
+    evaluator(scene) is equivalent to
+    _check_condition(_get_value_from_path(scene, field), operator, rule_value, field).
+    Compiled rules are cached, so repeated compilation of the same rule is free.
+    """
+    if isinstance(rule_value, list):
+        return _compile_rule(field, operator, tuple(rule_value), True)
+    return _compile_rule(field, operator, rule_value, False)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_rule(field: str, operator: str, rule_value: Any, is_list: bool) -> RuleEvaluator:
+    if is_list:
+        rule_value = list(rule_value)
+    get_value = _compile_path(field)
+    rule_values_lower = _normalize_rule_values(rule_value)
+    is_tags = "tags" in field
+    rule_value_set = frozenset(rule_values_lower) if is_tags else None
+
+    def evaluate(scene: Dict) -> Tuple[bool, Any]:
+        return _match_values(
+            get_value(scene), operator, rule_values_lower, rule_value, is_tags, rule_value_set
+        )
+
+    return evaluate
@@ -0,0 +1,83 @@
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+logger = logging.getLogger("stash_manager.rule_stats")
+
+# Sidecar file next to the database; statistics only, safe to delete
+RULE_STATS_FILENAME = "filter_rule_stats.json"
+
+_lock = threading.Lock()
+
+
+def _stats_path() -> Path:
+    db_path = Path(os.environ.get("DATABASE_PATH", "/config/stash_manager.db"))
+    return db_path.parent / RULE_STATS_FILENAME
+
+
+def rule_key(name: str, field: str, operator: str, value) -> str:
+    """Identify a rule across runs by its content rather than its position"""
+    return f"{name}|{field}|{operator}|{value}"
+
+
+def load_rule_stats(context: str) -> Dict[str, List[int]]:
+    """Saved [matches, evaluations] per rule key for a filter context"""
+    try:
+        with _stats_path().open(encoding="utf-8") as f:
+            return json.load(f).get(context, {})
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not read filter rule statistics: {e}")
+        return {}
+
+
+def save_rule_stats(context: str, counts: Dict[str, List[int]]) -> None:
+    """Add one run's [matches, evaluations] per rule key to the saved totals"""
+    if not counts:
+        return
+    path = _stats_path()
+    with _lock:
+        try:
+            with path.open(encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+        saved = data.setdefault(context, {})
+        for key, (matches, evaluations) in counts.items():
+            totals = saved.setdefault(key, [0, 0])
+            totals[0] += matches
+            totals[1] += evaluations
+        try:
+            tmp_path = path.with_name(f"{path.name}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(data, f)
+            tmp_path.replace(path)
+        except OSError as e:
+            logger.warning(f"Could not write filter rule statistics: {e}")
+
+
+def order_by_match_rate(keys: Sequence[str], actions: Sequence[str], stats: Dict) -> List[int]:
+    """Evaluation order for first-match-wins rules, most often matching first
+
+    Only runs of consecutive rules sharing an action are reordered: within such a
+    run the first match gives the same decision whichever rule it is, while moving
+    a rule past one with a different action would change the outcome.
+    """
+    order: List[int] = []
+    start = 0
+    for end in range(1, len(keys) + 1):
+        if end == len(keys) or actions[end] != actions[start]:
+            run = range(start, end)
+            order.extend(sorted(run, key=lambda i: -_match_rate(stats.get(keys[i]))))
+            start = end
+    return order
+
+
+def _match_rate(counts) -> float:
+    if not counts or not counts[1]:
+        return 0.0
+    return counts[0] / counts[1]
@@ -6,11 +6,34 @@ This module implements the filtering logic for scenes based on performer attribu
 
 import logging
 import re
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # Optional C extension; fall back to a plain substring scan
+    ahocorasick = None
 
 logger = logging.getLogger("stash_manager.filter")
 
 
+def _performers_soa(
+    performers: List[Dict],
+) -> Tuple[List[str], List[str], List[str], List[str]]:
+    """Unpack performer dicts once into parallel (names, genders, ethnicities,
+    measurements) columns so the filter loops avoid repeated dict lookups."""
+    names = []
+    genders = []
+    ethnicities = []
+    measurements = []
+    for performer in performers:
+        names.append(performer.get("name", "unknown"))
+        # Safe handling of gender - use an empty string if gender is None
+        genders.append((performer.get("gender") or "").lower())
+        ethnicities.append(performer.get("ethnicity", ""))
+        measurements.append(performer.get("measurements", ""))
+    return names, genders, ethnicities, measurements
+
+
 class SceneFilter:
     """Filter scenes based on configurable criteria"""
 
@@ -43,6 +66,9 @@ class SceneFilter:
         self.keywords = self.keyword_config.get("keywords", [])
         self.case_sensitive = self.keyword_config.get("case_sensitive", False)
 
+        # Build the keyword matcher once so each title is scanned in O(len(title))
+        self._kw_ac = self._build_keyword_automaton() if self.keywords else None
+
         logger.info(f"Initialized scene filter with {len(self.ethnicity_values)} ethnicity values")
         logger.info(
             f"Cup size exceptions: {len(self.exceptions_to_large)} large, {len(self.force_to_small)} small"  # noqa: E501
@@ -72,21 +98,21 @@ class SceneFilter:
                 logger.info(f"Scene {scene_id} ({title}) matched keyword filter: {reason}")
                 return True, reason
             else:
-                logger.debug(f"Scene {scene_id} ({title}) passed keyword filter")
+                logger.debug("Scene %s (%s) passed keyword filter", scene_id, title)
         else:
-            logger.debug(f"Keyword filter disabled or empty, skipping for scene {scene_id}")
+            logger.debug("Keyword filter disabled or empty, skipping for scene %s", scene_id)
 
         # Skip if scene has no performers
         if not performers:
-            logger.debug(f"Scene {scene_id} ({title}) has no performers, keeping")
+            logger.debug("Scene %s (%s) has no performers, keeping", scene_id, title)
             return False, "No performers to filter"
 
+        # Unpack performer fields once into parallel columns
+        names, genders, ethnicities, measurements = _performers_soa(performers)
+
         # Apply ethnicity filter if enabled
         if self.ethnicity_enabled:
-            for performer in performers:
-                name = performer.get("name", "unknown")
-                ethnicity = performer.get("ethnicity", "")
-
+            for name, ethnicity in zip(names, ethnicities, strict=True):
                 # Check if ethnicity is in our list of filtered values
                 if ethnicity and any(
                     value.lower() in ethnicity.lower() for value in self.ethnicity_values
@@ -97,74 +123,98 @@ class SceneFilter:
 
         # Apply cup size filter if enabled
         if self.cup_size_enabled:
-            # Check for females with large cup sizes or unknown cup sizes
-            has_female = False
-            has_large_cup = False
-            has_unknown_cup = False
-            small_cup_performers = []
-
-            for performer in performers:
-                # FIX: Safe handling of gender - use an empty string if gender is None
-                gender = (performer.get("gender") or "").lower()
-                name = performer.get("name", "unknown")
-                measurements = performer.get("measurements", "")
-
-                # Skip males for cup size check
-                if gender == "male":
-                    continue
-
-                # Mark as having female performer
-                has_female = True
-
-                # Check exceptions first
-                if name in self.exceptions_to_large:
-                    logger.debug(f"Performer {name} is in exceptions_to_large list")
-                    has_large_cup = True
-                    continue
-
-                if name in self.force_to_small:
-                    logger.debug(f"Performer {name} is in force_to_small list")
-                    small_cup_performers.append(name)
-                    continue
-
-                # If no measurements info, count as unknown
-                if not measurements:
-                    logger.debug(f"Performer {name} has no measurements info")
-                    has_unknown_cup = True
-                    continue
-
-                # Check if performer has large cup size
-                if re.search(self.larger_cup_pattern, measurements):
-                    logger.debug(f"Performer {name} has large cup size: {measurements}")
-                    has_large_cup = True
-                # Check if performer has small cup size
-                elif re.search(self.small_cup_pattern, measurements):
-                    logger.debug(f"Performer {name} has small cup size: {measurements}")
-                    small_cup_performers.append(name)
-                else:
-                    # If we can't determine from the pattern, treat as unknown
-                    logger.debug(f"Performer {name} has unknown cup size: {measurements}")
-                    has_unknown_cup = True
+            small_cup_performers = self._classify_cupsize(names, genders, measurements)
 
             # If scene has female performers but none have large cup or unknown cup sizes
-            if has_female and not has_large_cup and not has_unknown_cup and small_cup_performers:
+            if small_cup_performers:
                 reason = f"Scene only has small cup performers: {', '.join(small_cup_performers)}"
                 logger.info(f"Scene {scene_id} ({title}) will be removed: {reason}")
                 return True, reason
 
         # If we get here, scene passes all filters
-        logger.debug(f"Scene {scene_id} ({title}) passes all filters, keeping")
+        logger.debug("Scene %s (%s) passes all filters, keeping", scene_id, title)
         return False, "Passed all filters"
 
+    def _classify_cupsize(
+        self, names: List[str], genders: List[str], measurements: List[str]
+    ) -> List[str]:
+        """Classify performers by cup size, operating on parallel columns
+
+        Returns:
+            Names of small cup performers if the scene has female performers and none
+            of them have a large or unknown cup size, otherwise an empty list
+        """
+        # Any female with a large or unknown cup size keeps the scene
+        small_cup_performers = []
+
+        for idx in range(len(names)):
+            # Skip males for cup size check
+            if genders[idx] == "male":
+                continue
+
+            name = names[idx]
+            measurement = measurements[idx]
+
+            # Check exceptions first
+            if name in self.exceptions_to_large:
+                logger.debug("Performer %s is in exceptions_to_large list", name)
+                return []
+
+            if name in self.force_to_small:
+                logger.debug("Performer %s is in force_to_small list", name)
+                small_cup_performers.append(name)
+                continue
+
+            # If no measurements info, count as unknown
+            if not measurement:
+                logger.debug("Performer %s has no measurements info", name)
+                return []
+
+            # Check if performer has large cup size
+            if re.search(self.larger_cup_pattern, measurement):
+                logger.debug("Performer %s has large cup size: %s", name, measurement)
+                return []
+            # Check if performer has small cup size
+            elif re.search(self.small_cup_pattern, measurement):
+                logger.debug("Performer %s has small cup size: %s", name, measurement)
+                small_cup_performers.append(name)
+            else:
+                # If we can't determine from the pattern, treat as unknown
+                logger.debug("Performer %s has unknown cup size: %s", name, measurement)
+                return []
+
+        return small_cup_performers
+
+    def _build_keyword_automaton(self):
+        """Build an Aho-Corasick automaton over the keywords, if available"""
+        if ahocorasick is None:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for keyword in self.keywords:
+            automaton.add_word(keyword if self.case_sensitive else keyword.lower(), keyword)
+        automaton.make_automaton()
+        return automaton
+
     def _check_title_keywords(self, scene_data: Dict) -> Tuple[bool, str]:
         """Check if scene title contains any unwanted keywords"""
         scene_id = scene_data.get("id", "unknown")
         title = scene_data.get("title", "")
 
         if not title:
-            logger.debug(f"Scene {scene_id} has no title to check")
+            logger.debug("Scene %s has no title to check", scene_id)
             return False, "No title to check"
 
+        if self._kw_ac is not None:
+            haystack = title if self.case_sensitive else title.lower()
+            for _, keyword in self._kw_ac.iter(haystack):
+                reason = f"Title contains unwanted keyword: '{keyword}'"
+                logger.info(f"Scene {scene_id} ({title}) matched keyword: {keyword}")
+                return True, reason
+
+            logger.debug("Scene %s (%s) passes keyword filter", scene_id, title)
+            return False, "No unwanted keywords in title"
+
         # Check each keyword
         for keyword in self.keywords:
             if self.case_sensitive:
@@ -179,5 +229,5 @@ class SceneFilter:
                     return True, reason
 
         # If no keywords matched
-        logger.debug(f"Scene {scene_id} ({title}) passes keyword filter")
+        logger.debug("Scene %s (%s) passes keyword filter", scene_id, title)
         return False, "No unwanted keywords in title"
@@ -1,7 +1,8 @@
 import logging
+import threading
 from typing import Dict, List, Tuple
 
-from src.config.config import get_database
+from src.config.config import get_database, get_filter_rules
 
 logger = logging.getLogger("stash_manager.rule_sync")
 
@@ -23,14 +24,15 @@ class RuleSyncManager:
         "tags": "tags",
         "performers.count": "performers.count",
     }
+    REVERSE_FIELD_MAPPINGS = {v: k for k, v in FIELD_MAPPINGS.items()}
 
     def __init__(self):
         self.db = get_database()
+        self._create_sync_settings_table()
         self._load_sync_settings()
 
-    def _load_sync_settings(self):
-        """Load sync settings from database."""
-        # First, ensure the table exists
+    def _create_sync_settings_table(self):
+        """Ensure the sync settings table exists."""
         self.db.execute_query("""
             CREATE TABLE IF NOT EXISTS rule_sync_settings (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -43,6 +45,8 @@ class RuleSyncManager:
             )
         """)
 
+    def _load_sync_settings(self):
+        """Load sync settings from database."""
         row = self.db.execute_query(
             "SELECT sync_enabled, sync_direction FROM rule_sync_settings LIMIT 1", fetch="one"
         )
@@ -63,8 +67,10 @@ class RuleSyncManager:
             )
 
     def get_sync_settings(self) -> Dict:
-        """Get current sync settings."""
-        self._load_sync_settings()
+        """Get current sync settings.
+
+        Settings are only written through update_sync_settings, which reloads them.
+        """
         return {"enabled": self.sync_enabled, "direction": self.sync_direction}
 
     def map_field(self, field: str, from_context: str, to_context: str) -> str:
@@ -72,9 +78,7 @@ class RuleSyncManager:
         if from_context == "add_scenes" and to_context == "clean_scenes":
             return self.FIELD_MAPPINGS.get(field, field)
         elif from_context == "clean_scenes" and to_context == "add_scenes":
-            # Reverse mapping
-            reverse_mappings = {v: k for k, v in self.FIELD_MAPPINGS.items()}
-            return reverse_mappings.get(field, field)
+            return self.REVERSE_FIELD_MAPPINGS.get(field, field)
         return field
 
     def convert_rule(self, rule: Dict, from_context: str, to_context: str) -> Dict:
@@ -85,8 +89,6 @@ class RuleSyncManager:
 
     def are_rules_in_sync(self) -> Tuple[bool, str]:
         """Check if add_scenes and clean_scenes rules are currently in sync."""
-        from src.config.config import get_filter_rules
-
         add_rules = get_filter_rules("add_scenes")
         clean_rules = get_filter_rules("clean_scenes")
 
@@ -102,18 +104,18 @@ class RuleSyncManager:
                 f"vs {len(clean_rules)} clean rules",
             )
 
-        # Convert add rules to clean format and compare
+        # Map add rule fields to clean format and compare (read-only, no rule copies)
         for i, add_rule in enumerate(add_rules):
-            converted_rule = self.convert_rule(add_rule, "add_scenes", "clean_scenes")
+            mapped_field = self.map_field(add_rule["field"], "add_scenes", "clean_scenes")
             clean_rule = clean_rules[i]
 
             # Compare the essential fields
             if (
-                converted_rule["field"] != clean_rule["field"]
-                or converted_rule.get("match", converted_rule.get("operator"))
+                mapped_field != clean_rule["field"]
+                or add_rule.get("match", add_rule.get("operator"))
                 != clean_rule.get("match", clean_rule.get("operator"))
-                or converted_rule.get("value") != clean_rule.get("value")
-                or converted_rule.get("action") != clean_rule.get("action")
+                or add_rule.get("value") != clean_rule.get("value")
+                or add_rule.get("action") != clean_rule.get("action")
             ):
                 return (
                     False,
@@ -181,7 +183,7 @@ class RuleSyncManager:
 
         # Clear existing rules in target context
         logger.info(f"Deleting existing rules from {target_context}")
-        self.db.execute_query("DELETE FROM filter_rules WHERE context = ?", (target_context,))
+        self.db.delete_filter_rules_by_context(target_context)
 
         # Convert and add rules to target context
         for i, rule in enumerate(rules):
@@ -198,3 +200,21 @@ class RuleSyncManager:
             )
 
         logger.info(f"Successfully synced {len(rules)} rules to {target_context}")
+
+
+_shared_manager = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_rule_sync_manager() -> RuleSyncManager:
+    """Shared RuleSyncManager, so requests don't reload sync settings each time.
+
+    Settings changes go through update_sync_settings on this same instance, which
+    reloads them, so it never goes stale.
+    """
+    global _shared_manager
+    if _shared_manager is None:
+        with _shared_manager_lock:
+            if _shared_manager is None:
+                _shared_manager = RuleSyncManager()
+    return _shared_manager
@@ -1,6 +1,10 @@
+# Optional dependency: orjson, when installed, encodes and decodes jsonify and
+# request JSON bodies.
+
 import os
 
 from flask import Flask, g
+from flask.json.provider import DefaultJSONProvider
 
 from src.core.database_manager import DatabaseManager
 from src.core.job_setup import setup_jobs
@@ -14,10 +18,42 @@ from src.web.routes.prowlarr_routes import prowlarr_bp
 from src.web.routes.settings_routes import settings_bp
 from src.web.routes.task_routes import task_bp
 
+try:
+    import orjson
+except ImportError:  # Optional fast JSON codec; fall back to Flask's provider
+    orjson = None
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """Flask's JSON provider with orjson doing the encoding and decoding
+
+    Output matches the default provider's: keys sorted, dates as HTTP dates and
+    other types Flask supports handed to its default hook.
+    """
+
+    _OPTIONS = (
+        orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if orjson
+        else 0
+    )
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            # Formatting options (e.g. indent in debug mode) go to the stdlib
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._OPTIONS).decode()
+
+    def loads(self, s, **kwargs):
+        if kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
 
 def create_app():
     """Create and configure Flask application"""
     app = Flask(__name__, template_folder="templates")
+    if orjson is not None:
+        app.json = _OrjsonProvider(app)
 
     # Get or generate persistent SECRET_KEY
     db = DatabaseManager()
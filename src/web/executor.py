@@ -0,0 +1,83 @@
+"""
+Background execution of manually triggered jobs
+
+Manual runs are submitted to one bounded thread pool instead of each starting a
+thread of its own, and a job still queued or running is not submitted twice.
+"""
+
+import atexit
+import logging
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger("stash_manager.executor")
+
+MAX_WORKERS = 4
+# Finished jobs whose status stays queryable
+MAX_FINISHED_JOBS = 100
+
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="job")
+atexit.register(EXECUTOR.shutdown, wait=False, cancel_futures=True)
+
+_jobs: "OrderedDict[str, Tuple[str, Future]]" = OrderedDict()  # job id -> (job name, future)
+_active: Dict[str, str] = {}  # job name -> id of its queued or running job
+_lock = threading.Lock()
+
+
+def submit_job(job_name: str, fn: Callable, *args, **kwargs) -> Tuple[str, bool]:
+    """Queue fn(*args, **kwargs) on the job pool
+
+    Returns:
+        The job id and True, or the id of the job_name run already queued or
+        running and False
+    """
+    with _lock:
+        job_id = _active.get(job_name)
+        if job_id is not None:
+            return job_id, False
+        job_id = uuid.uuid4().hex
+        future = EXECUTOR.submit(fn, *args, **kwargs)
+        _jobs[job_id] = (job_name, future)
+        _active[job_name] = job_id
+    # Outside the lock: the callback runs right away if the job already finished
+    future.add_done_callback(lambda done: _job_finished(job_id, job_name, done))
+    logger.info("Queued job %s (%s)", job_name, job_id)
+    return job_id, True
+
+
+def _job_finished(job_id: str, job_name: str, future: Future) -> None:
+    error = None if future.cancelled() else future.exception()
+    if error is not None:
+        logger.error("Job %s (%s) failed: %s", job_name, job_id, error, exc_info=error)
+    with _lock:
+        if _active.get(job_name) == job_id:
+            del _active[job_name]
+        finished = [key for key, (_, job) in _jobs.items() if job.done()]
+        for key in finished[: max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del _jobs[key]
+
+
+def get_job_status(job_id: str) -> Optional[Dict]:
+    """Status of a submitted job, or None if the id is unknown or long finished"""
+    with _lock:
+        job = _jobs.get(job_id)
+    if job is None:
+        return None
+
+    job_name, future = job
+    status = {"job_id": job_id, "job_name": job_name}
+    if future.running():
+        status["status"] = "running"
+    elif not future.done():
+        status["status"] = "queued"
+    elif future.cancelled():
+        status["status"] = "cancelled"
+    elif future.exception() is not None:
+        status["status"] = "failed"
+        status["error"] = str(future.exception())
+    else:
+        status["status"] = "finished"
+    return status
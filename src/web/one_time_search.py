@@ -1,14 +1,34 @@
 # src/one_time_search.py
+#
+# Optional dependency: fastrlock provides a faster RLock for the per-job progress
+# locks; threading.RLock is used when it is not installed. orjson, when installed,
+# encodes the JSON responses.
 
+import json
 import logging
+import os
+import queue
+import re
 import threading
-from datetime import datetime, timedelta
-from typing import Dict  # Import Dict
+import time
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
 
-from flask import Blueprint, jsonify, render_template, request
+from flask import Blueprint, Response, current_app, jsonify, render_template, request
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON codec; fall back to Flask's jsonify
+    orjson = None
+
+try:
+    from fastrlock.rlock import RLock
+except ImportError:  # Optional C-level RLock; fall back to the stdlib
+    from threading import RLock
 
 from src.api.stash_api import StashAPI
-from src.config.config import get_config, get_database
+from src.config.config import get_config_cached, get_database
 from src.core.utils import set_active_page
 from src.web.processor import add_new_scenes_to_whisparr
 
@@ -21,61 +41,197 @@ one_time_search_bp = Blueprint("one_time_search", __name__, url_prefix="/one-tim
 # GLOBAL JOB TRACKING (Module-level)
 # ============================================================================
 
-_job_lock = threading.Lock()
+# Progress entries are copy-on-write snapshots: writers publish a new dict with a
+# single assignment, so readers (UI polling) never take a lock or see a dict
+# that is being mutated. Each job has its own lock serializing its writers, so
+# jobs never contend with each other; _registry_lock only guards creating them.
+_registry_lock = threading.Lock()
+_job_locks: Dict[str, RLock] = {}
 _active_jobs: Dict = {}  # Store job details
+_cancel_events: Dict[str, threading.Event] = {}  # Set to ask a running job to stop
 _job_progress: Dict = {}  # Store progress information
 
+# Progress change notification for /stream subscribers: writers bump the
+# sequence number after publishing a snapshot (outside their job lock)
+_progress_changed = threading.Condition()
+_progress_seq = 0
+
+# Seconds between SSE keep-alive comments while nothing changes
+STREAM_KEEPALIVE = 15.0
+
+# Searches run one at a time: _submit_search reserves the job lock before queueing,
+# so a single persistent worker fed by a queue replaces a thread per request
+_search_queue: queue.Queue = queue.Queue()
+_search_worker_thread: Optional[threading.Thread] = None
+_search_worker_lock = threading.Lock()
+
+_stash_api_singleton: Optional[StashAPI] = None
+_stash_api_lock = threading.Lock()
+
+# Progress callback throttling: seconds / scenes between published updates
+PROGRESS_MIN_INTERVAL = 0.25
+PROGRESS_MIN_SCENES = 50
+
+_presets_cache: Tuple[Optional[date], Optional[Dict]] = (None, None)
+
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# (log line, progress message) for the searching phase, indexed by dry_run
+_SEARCHING_MESSAGES = (
+    (
+        "🔥 LIVE SEARCH: Searching and adding scenes from {start_date} to {end_date}",
+        "Searching scenes from {start_date} to {end_date}...",
+    ),
+    (
+        "🔍 DRY RUN: Searching scenes from {start_date} to {end_date} (no scenes will be added)",
+        "DRY RUN: Searching scenes from {start_date} to {end_date}...",
+    ),
+)
+
 # ============================================================================
 # JOB MANAGEMENT FUNCTIONS
 # ============================================================================
 
 
+def _job_lock(job_name):
+    """The writer lock for job_name, created on first use"""
+    lock = _job_locks.get(job_name)
+    if lock is None:
+        with _registry_lock:
+            lock = _job_locks.setdefault(job_name, RLock())
+    return lock
+
+
+@lru_cache(maxsize=1)
+def _stash_credentials() -> Tuple[str, str]:
+    """STASH_URL and STASH_API_KEY, read once on first successful use"""
+    stash_url = os.environ.get("STASH_URL")
+    stash_api_key = os.environ.get("STASH_API_KEY")
+    if not stash_url or not stash_api_key:
+        # Not cached, so the next job start checks again
+        raise Exception("Missing Stash configuration")
+    return stash_url, stash_api_key
+
+
+def _get_stash_api() -> StashAPI:
+    """The process-wide local Stash client, so its connection pool outlives each job"""
+    global _stash_api_singleton
+    if _stash_api_singleton is None:
+        with _stash_api_lock:
+            if _stash_api_singleton is None:
+                stash_url, stash_api_key = _stash_credentials()
+                _stash_api_singleton = StashAPI(url=stash_url, api_key=stash_api_key)
+    return _stash_api_singleton
+
+
+class JobCancelledError(Exception):
+    """Raised inside a job once cancellation was requested"""
+
+
+def _notify_progress():
+    """Wake /stream subscribers after a progress snapshot was published"""
+    global _progress_seq
+    with _progress_changed:
+        _progress_seq += 1
+        _progress_changed.notify_all()
+
+
 def is_job_running(job_name):
     """Check if a specific job is currently running"""
     return job_name in _active_jobs
 
 
 def get_job_details(job_name):
-    """Get details about a running job"""
-    return _active_jobs.get(job_name, {})
+    """Get details about the current (or last) run of a job"""
+    return _job_progress.get(job_name, {}).get("details", {})
 
 
 def acquire_job_lock(job_name, job_details=None):
     """Try to acquire lock for a job. Returns True if successful."""
-    with _job_lock:
+    # Build everything up front; the critical section is just the two dict stores.
+    # Nothing that does I/O (database, logging) may run under a job lock.
+    initial_progress = {
+        "status": "starting",
+        "progress": 0,
+        "message": "Initializing...",
+        "start_time_ns": time.time_ns(),
+        "scenes_processed": 0,
+        "scenes_added": 0,
+        "errors": [],
+        # Kept in the progress snapshot so one lookup serves the page
+        "details": job_details or {},
+    }
+    cancel_event = threading.Event()
+    with _job_lock(job_name):
         if job_name in _active_jobs:
             return False
-        _active_jobs[job_name] = job_details or {}
-        _job_progress[job_name] = {
-            "status": "starting",
-            "progress": 0,
-            "message": "Initializing...",
-            "start_time": datetime.now().isoformat(),
-            "scenes_processed": 0,
-            "scenes_added": 0,
-            "errors": [],
-        }
-        return True
+        _active_jobs[job_name] = initial_progress["details"]
+        _cancel_events[job_name] = cancel_event
+        _job_progress[job_name] = initial_progress
+    _notify_progress()
+    return True
 
 
 def update_job_progress(job_name, **kwargs):
     """Update job progress information"""
-    with _job_lock:
-        if job_name in _job_progress:
-            _job_progress[job_name].update(kwargs)
+    with _job_lock(job_name):
+        current = _job_progress.get(job_name)
+        if current is None:
+            return
+        _job_progress[job_name] = {**current, **kwargs}
+    _notify_progress()
+
 
+def release_job_lock(job_name, **final_progress):
+    """Release lock for a job, merging any final progress fields into its snapshot
 
-def release_job_lock(job_name):
-    """Release lock for a job"""
-    with _job_lock:
-        _active_jobs.pop(job_name, None)
+    Releasing a job that is not running is a no-op.
+    """
+    end_time_ns = time.time_ns()
+    with _job_lock(job_name):
+        if job_name not in _active_jobs:
+            return
+        del _active_jobs[job_name]
+        _cancel_events.pop(job_name, None)
         # Keep progress info for a while after completion
-        if job_name in _job_progress:
-            _job_progress[job_name]["end_time"] = datetime.now().isoformat()
+        current = _job_progress.get(job_name)
+        if current is not None:
+            _job_progress[job_name] = {**current, **final_progress, "end_time_ns": end_time_ns}
+    _notify_progress()
+
+
+def _format_ts(ns):
+    """ISO-8601 local time for a time.time_ns() stamp"""
+    return datetime.fromtimestamp(ns / 1e9).isoformat()
+
+
+def _progress_for_response(progress):
+    """Progress snapshot with its raw *_time_ns stamps formatted as ISO start/end times"""
+    if "start_time_ns" not in progress and "end_time_ns" not in progress:
+        return progress
+    response = dict(progress)
+    for field in ("start_time", "end_time"):
+        ns = response.pop(f"{field}_ns", None)
+        if ns is not None:
+            response[field] = _format_ts(ns)
+    return response
+
+
+def request_job_cancel(job_name):
+    """Ask a running job to stop; it releases its own lock once it has.
+
+    Returns True if the job was running.
+    """
+    cancel_event = _cancel_events.get(job_name)
+    if cancel_event is None:
+        return False
+    cancel_event.set()
+    update_job_progress(job_name, status="cancelling", message="Cancelling search...")
+    return True
 
 
 def get_job_progress(job_name):
-    """Get current progress for a job"""
+    """Get current progress for a job (a snapshot; do not mutate)"""
     return _job_progress.get(job_name, {})
 
 
@@ -87,16 +243,13 @@ def get_job_progress(job_name):
 def one_time_search_job(start_date, end_date, search_config=None):
     """
     Enhanced one-time search with progress tracking and detailed logging
+
+    Runs the search reserved by _submit_search, which already holds the job lock.
     """
     job_name = "one_time_search"
-    job_details = {
-        "start_date": start_date,
-        "end_date": end_date,
-        "config": search_config or {},
-    }
-
-    if not acquire_job_lock(job_name, job_details):
-        logger.warning("One-time search already running - skipping")
+    cancel_event = _cancel_events.get(job_name)
+    if cancel_event is None:
+        logger.warning("One-time search was not reserved - skipping")
         return
 
     # Extract dry_run flag from search_config
@@ -104,7 +257,12 @@ def one_time_search_job(start_date, end_date, search_config=None):
 
     # Record search in database
     db = get_database()
-    search_id = db.record_one_time_search(start_date, end_date, "running")
+    try:
+        search_id = db.record_one_time_search(start_date, end_date, "running")
+    except Exception as e:
+        # Give up the reservation, or no search could ever start again
+        release_job_lock(job_name, status="failed", message=f"Search failed: {e}")
+        raise
 
     try:
         update_job_progress(
@@ -115,7 +273,7 @@ def one_time_search_job(start_date, end_date, search_config=None):
             dry_run=dry_run,  # Track dry run status in progress
         )
 
-        config = get_config(strict=True)
+        config = get_config_cached(strict=True)
         if not config:
             raise Exception("Could not load configuration")
 
@@ -127,43 +285,41 @@ def one_time_search_job(start_date, end_date, search_config=None):
             dry_run=dry_run,
         )
 
-        import os
-
-        stash_url = os.environ.get("STASH_URL")
-        stash_api_key = os.environ.get("STASH_API_KEY")
-
-        if not stash_url or not stash_api_key:
-            raise Exception("Missing Stash configuration")
-
-        stash_api = StashAPI(url=stash_url, api_key=stash_api_key)
+        stash_api = _get_stash_api()
 
         # Log dry run status prominently
-        if dry_run:
-            logger.info(
-                f"🔍 DRY RUN: Searching scenes from {start_date} to {end_date} (no scenes "
-                "will be added)"
-            )
-            update_job_progress(
-                job_name,
-                status="searching",
-                message=(f"DRY RUN: Searching scenes from {start_date} to {end_date}..."),
-                progress=20,
-                dry_run=True,
-            )
-        else:
-            logger.info(
-                f"🔥 LIVE SEARCH: Searching and adding scenes from {start_date} to {end_date}"
-            )
-            update_job_progress(
-                job_name,
-                status="searching",
-                message=(f"Searching scenes from {start_date} to {end_date}..."),
-                progress=20,
-                dry_run=False,
-            )
+        log_template, message_template = _SEARCHING_MESSAGES[bool(dry_run)]
+        logger.info(log_template.format(start_date=start_date, end_date=end_date))
+        update_job_progress(
+            job_name,
+            status="searching",
+            message=message_template.format(start_date=start_date, end_date=end_date),
+            progress=20,
+            dry_run=bool(dry_run),
+        )
+
+        # Enhanced version of add_new_scenes_to_whisparr with progress callbacks.
+        # The callback fires once per scene; publish at most every
+        # PROGRESS_MIN_INTERVAL seconds or PROGRESS_MIN_SCENES scenes, plus the
+        # final update, since the UI polls far less often than that.
+        last_emit_ts = 0.0
+        last_emit_current = None
 
-        # Enhanced version of add_new_scenes_to_whisparr with progress callbacks
         def progress_callback(current, total, message=""):
+            nonlocal last_emit_ts, last_emit_current
+            if cancel_event.is_set():
+                raise JobCancelledError()
+            now = time.monotonic()
+            if (
+                last_emit_current is not None
+                and current != total
+                and now - last_emit_ts < PROGRESS_MIN_INTERVAL
+                and abs(current - last_emit_current) < PROGRESS_MIN_SCENES
+            ):
+                return
+            last_emit_ts = now
+            last_emit_current = current
+
             progress = 20 + int((current / total) * 70) if total > 0 else 20
             update_job_progress(
                 job_name,
@@ -182,6 +338,7 @@ def one_time_search_job(start_date, end_date, search_config=None):
             progress_callback=progress_callback,
             dry_run=dry_run,
             sort_direction="ASC",  # One-time search should start from oldest
+            cancel_event=cancel_event,
         )
 
         # Log final status with dry run context
@@ -194,9 +351,15 @@ def one_time_search_job(start_date, end_date, search_config=None):
             status_message = f"Search completed - {result.get('scenes_added', 0)} scenes added"
             logger.info(f"✅ {status_message}")
 
-        update_job_progress(
+        logger.info(f"One-time search completed: {start_date} to {end_date} (dry_run: {dry_run})")
+
+        # Database record carries the dry_run info
+        result["dry_run"] = dry_run
+        _finalize_job(
             job_name,
-            status="completed",
+            search_id,
+            "completed",
+            result,
             message=status_message,
             progress=100,
             scenes_added=result.get("scenes_added", 0),
@@ -204,31 +367,95 @@ def one_time_search_job(start_date, end_date, search_config=None):
             dry_run=dry_run,
         )
 
-        # Update database record with dry_run info
-        result["dry_run"] = dry_run
-        db.finish_one_time_search(search_id, "completed", result)
-
-        logger.info(f"One-time search completed: {start_date} to {end_date} (dry_run: {dry_run})")
+    except JobCancelledError:
+        logger.info(f"One-time search cancelled: {start_date} to {end_date}")
+        _finalize_job(
+            job_name,
+            search_id,
+            "cancelled",
+            {"dry_run": dry_run},
+            message="Search cancelled by user",
+            dry_run=dry_run,
+        )
 
     except Exception as e:
         error_msg = str(e)
-        logger.error(f"Error in one-time search: {error_msg}")
-
-        update_job_progress(
+        logger.exception("One-time search failed")
+        _finalize_job(
             job_name,
-            status="failed",
+            search_id,
+            "failed",
+            {"error": error_msg, "dry_run": dry_run},
             message=f"Search failed: {error_msg}",
             progress=0,
             dry_run=dry_run,
         )
 
-        # Update database record
-        db.finish_one_time_search(search_id, "failed", {"error": error_msg, "dry_run": dry_run})
-
     finally:
+        # Normally released by _finalize_job; this covers a failure inside it
         release_job_lock(job_name)
 
 
+def _finalize_job(job_name, search_id, status, results, **progress):
+    """Record a one-time search's outcome, then publish it and release the lock
+
+    The final progress fields land in the same snapshot update as the release.
+    """
+    get_database().finish_one_time_search(search_id, status, results)
+    release_job_lock(job_name, status=status, **progress)
+
+
+def _json_response(obj):
+    """JSON response encoded with orjson when available"""
+    if orjson is None:
+        return jsonify(obj)
+    return current_app.response_class(orjson.dumps(obj), mimetype="application/json")
+
+
+def _parse_iso_date(value):
+    """Parse a strict YYYY-MM-DD string, raising ValueError otherwise"""
+    # date.fromisoformat also accepts forms like "20240101" since Python 3.11
+    if not _ISO_DATE.fullmatch(value):
+        raise ValueError(f"Invalid date: {value!r}")
+    return date.fromisoformat(value)
+
+
+def _search_worker():
+    """Run queued searches one after another on a single long-lived thread"""
+    while True:
+        args = _search_queue.get()
+        try:
+            one_time_search_job(*args)
+        except Exception as e:
+            logger.error(f"Unhandled error in one-time search worker: {e}")
+        finally:
+            _search_queue.task_done()
+
+
+def _submit_search(start_date, end_date, search_config=None):
+    """Reserve the job lock and queue a search for the worker thread
+
+    Starts the worker on first use. Returns False, queueing nothing, if a search
+    is already reserved or running.
+    """
+    global _search_worker_thread
+    job_details = {
+        "start_date": start_date,
+        "end_date": end_date,
+        "config": search_config or {},
+    }
+    if not acquire_job_lock("one_time_search", job_details):
+        return False
+    with _search_worker_lock:
+        if _search_worker_thread is None or not _search_worker_thread.is_alive():
+            _search_worker_thread = threading.Thread(
+                target=_search_worker, name="OneTimeSearchWorker", daemon=True
+            )
+            _search_worker_thread.start()
+    _search_queue.put((start_date, end_date, search_config))
+    return True
+
+
 def add_new_scenes_to_whisparr_with_progress(
     config,
     stash_api,
@@ -237,10 +464,14 @@ def add_new_scenes_to_whisparr_with_progress(
     progress_callback=None,
     dry_run=False,
     sort_direction: str = "ASC",  # Add sort_direction here
+    cancel_event=None,
 ):
     """
     Enhanced version of add_new_scenes_to_whisparr with progress tracking.
     This is a wrapper around your existing processor function.
+
+    JobCancelledError raised by progress_callback (or once cancel_event is set)
+    propagates to the caller instead of being reported as a failure.
     """
 
     def update_progress(current: int, total: int, message: str = ""):
@@ -248,15 +479,16 @@ def add_new_scenes_to_whisparr_with_progress(
         if progress_callback:
             try:
                 progress_callback(current, total, message)
+            except JobCancelledError:
+                raise
             except Exception as e:
                 logger.warning(f"Progress callback error: {e}")
 
     try:
-        # Step 1: Initialize
-        update_progress(0, 100, "Initializing search...")
-
-        update_progress(10, 100, "Connecting to StashDB...")
-        update_progress(20, 100, f"Searching scenes from {start_date} to {end_date}...")
+        # one_time_search_job has already published the "searching" status, and
+        # the processor reports per-scene progress from here on
+        if cancel_event is not None and cancel_event.is_set():
+            raise JobCancelledError()
 
         # Call your existing function
         result = add_new_scenes_to_whisparr(
@@ -269,19 +501,22 @@ def add_new_scenes_to_whisparr_with_progress(
             sort_direction=sort_direction,  # Pass the sort_direction
         )
 
-        update_progress(90, 100, "Finalizing results...")
-
         # Format results for consistency
         if not isinstance(result, dict):
-            result = {"scenes_added": 0, "total_found": 0, "errors": []}
-
-        scenes_added = result.get("scenes_added", 0)
-        total_found = result.get("total_found", 0)
+            return {"scenes_added": 0, "total_found": 0, "errors": []}
 
-        update_progress(100, 100, f"Search completed! Added {scenes_added} of {total_found} scenes")
+        if "error" not in result:
+            scenes_added = result.get("scenes_added", 0)
+            total_found = result.get("total_found", 0)
+            update_progress(
+                100, 100, f"Search completed! Added {scenes_added} of {total_found} scenes"
+            )
 
         return result
 
+    except JobCancelledError:
+        raise
+
     except Exception as e:
         error_msg = f"Search failed: {str(e)}"
         logger.error(error_msg)
@@ -294,22 +529,9 @@ def add_new_scenes_to_whisparr_with_progress(
 # ============================================================================
 
 
-@one_time_search_bp.route("/")
-def one_time_search_page():
-    """Main one-time search page"""
-    set_active_page("one_time_search")
-    db = get_database()
-
-    # Get recent searches
-    recent_searches = db.get_recent_one_time_searches(limit=10)
-
-    # Get current job status
-    current_job = get_job_details("one_time_search")
-    job_progress = get_job_progress("one_time_search")
-
-    # Get date presets
-    today = datetime.now().date()
-    presets = {
+def _build_presets(today):
+    """Date range presets relative to today"""
+    return {
         "today": {
             "label": "Today",
             "start_date": today.isoformat(),
@@ -332,6 +554,27 @@ def one_time_search_page():
         },
     }
 
+
+@one_time_search_bp.route("/")
+def one_time_search_page():
+    """Main one-time search page"""
+    set_active_page("one_time_search")
+    db = get_database()
+
+    # Get recent searches
+    recent_searches = db.get_recent_one_time_searches(limit=10)
+
+    # Get current job status
+    job_progress = _progress_for_response(get_job_progress("one_time_search"))
+    current_job = job_progress.get("details", {})
+
+    # Get date presets (rebuilt only when the day changes)
+    global _presets_cache
+    today = date.today()
+    if _presets_cache[0] != today:
+        _presets_cache = (today, _build_presets(today))
+    presets = _presets_cache[1]
+
     return render_template(
         "one_time_search.html",
         recent_searches=recent_searches,
@@ -345,47 +588,48 @@ def one_time_search_page():
 def start_one_time_search():
     """Start a new one-time search"""
     try:
+        # Cheapest check first: a double-click while a search runs needs no parsing
+        if is_job_running("one_time_search"):
+            return _json_response({"success": False, "message": "One-time search already running"})
+
         start_date = request.form.get("start_date")
         end_date = request.form.get("end_date")
         dry_run = request.form.get("dry_run") == "on"
 
         # Validation
         if not start_date or not end_date:
-            return jsonify({"success": False, "message": "Both start and end dates are required"})
+            return _json_response(
+                {"success": False, "message": "Both start and end dates are required"}
+            )
 
         try:
-            start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-            end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+            start_dt = _parse_iso_date(start_date)
+            end_dt = _parse_iso_date(end_date)
 
             if start_dt > end_dt:
-                return jsonify({"success": False, "message": "Start date must be before end date"})
+                return _json_response(
+                    {"success": False, "message": "Start date must be before end date"}
+                )
 
-            if end_dt > datetime.now():
-                return jsonify({"success": False, "message": "End date cannot be in the future"})
+            if end_dt > date.today():
+                return _json_response(
+                    {"success": False, "message": "End date cannot be in the future"}
+                )
 
         except ValueError:
-            return jsonify({"success": False, "message": "Invalid date format"})
-
-        # Check for conflicts
-        if is_job_running("one_time_search"):
-            return jsonify({"success": False, "message": "One-time search already running"})
+            return _json_response({"success": False, "message": "Invalid date format"})
 
         # Check if main app has any scheduled jobs running
         # Import this from your main app if you want to check conflicts
         # if main_app.is_job_running("add_new_scenes_scheduled"):
-        #     return jsonify({'success': False, 'message': 'Scheduled add scenes job is running'})
+        #     return _json_response({'success': False, 'message': 'Scheduled add scenes job is running'})
 
         # Start the search
         search_config = {"dry_run": dry_run}
-        job_thread = threading.Thread(
-            target=one_time_search_job,
-            args=(start_date, end_date, search_config),
-            name=f"OneTimeSearch-{start_date}-{end_date}",
-        )
-        job_thread.daemon = True
-        job_thread.start()
+        if not _submit_search(start_date, end_date, search_config):
+            return _json_response({"success": False, "message": "One-time search already running"})
 
-        return jsonify(
+        return _json_response(
             {
                 "success": True,
                 "message": f"Search started for {start_date} to {end_date}",
@@ -395,29 +639,65 @@ def start_one_time_search():
 
     except Exception as e:
         logger.error(f"Error starting one-time search: {e}")
-        return jsonify({"success": False, "message": str(e)})
+        return _json_response({"success": False, "message": str(e)})
 
 
 @one_time_search_bp.route("/progress")
 def one_time_search_progress():
     """Get current progress of one-time search"""
-    job_progress = get_job_progress("one_time_search")
+    job_progress = _progress_for_response(get_job_progress("one_time_search"))
     is_running = is_job_running("one_time_search")
 
-    return jsonify({"is_running": is_running, "progress": job_progress})
+    return _json_response({"is_running": is_running, "progress": job_progress})
+
+
+@one_time_search_bp.route("/stream")
+def one_time_search_stream():
+    """Push one-time search progress as Server-Sent Events
+
+    Sends the same payload as /progress whenever it changes, and ends the stream
+    once no search is running. /progress remains for clients without SSE.
+    """
+
+    def generate():
+        seen = None
+        while True:
+            with _progress_changed:
+                # Bind this iteration's seen; wait_for calls the predicate repeatedly
+                _progress_changed.wait_for(
+                    lambda seen=seen: _progress_seq != seen, STREAM_KEEPALIVE
+                )
+                seq = _progress_seq
+            if seq == seen:
+                yield ": keep-alive\n\n"
+                continue
+            seen = seq
+
+            is_running = is_job_running("one_time_search")
+            payload = {
+                "is_running": is_running,
+                "progress": _progress_for_response(get_job_progress("one_time_search")),
+            }
+            yield f"data: {json.dumps(payload)}\n\n"
+            if not is_running:
+                return
+
+    return Response(
+        generate(),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @one_time_search_bp.route("/cancel")
 def cancel_one_time_search():
     """Cancel running one-time search"""
-    if is_job_running("one_time_search"):
-        release_job_lock("one_time_search")
-        update_job_progress(
-            "one_time_search", status="cancelled", message="Search cancelled by user"
-        )
-        return jsonify({"success": True, "message": "Search cancelled"})
+    # The worker stops at its next progress check and releases the lock itself,
+    # so a new search cannot start while this one is still winding down
+    if request_job_cancel("one_time_search"):
+        return _json_response({"success": True, "message": "Search cancelling"})
     else:
-        return jsonify({"success": False, "message": "No search running"})
+        return _json_response({"success": False, "message": "No search running"})
 
 
 @one_time_search_bp.route("/history")
@@ -425,7 +705,7 @@ def one_time_search_history():
     """Get detailed search history"""
     db = get_database()
     searches = db.get_recent_one_time_searches(limit=50)
-    return jsonify({"searches": searches})
+    return _json_response({"searches": searches})
 
 
 @one_time_search_bp.route("/rerun/<int:search_id>")
@@ -435,21 +715,13 @@ def rerun_one_time_search(search_id):
     search = db.get_one_time_search(search_id)
 
     if not search:
-        return jsonify({"success": False, "message": "Search not found"})
-
-    if is_job_running("one_time_search"):
-        return jsonify({"success": False, "message": "Another search is already running"})
+        return _json_response({"success": False, "message": "Search not found"})
 
     # Start the same search again
-    job_thread = threading.Thread(
-        target=one_time_search_job,
-        args=(search["start_date"], search["end_date"]),
-        name=f"Rerun-{search['start_date']}-{search['end_date']}",
-    )
-    job_thread.daemon = True
-    job_thread.start()
+    if not _submit_search(search["start_date"], search["end_date"]):
+        return _json_response({"success": False, "message": "Another search is already running"})
 
-    return jsonify(
+    return _json_response(
         {
             "success": True,
             "message": f"Rerunning search for {search['start_date']} to {search['end_date']}",
@@ -1,5 +1,11 @@
 import logging
 import os
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from functools import lru_cache
+from itertools import islice
 
 from dotenv import load_dotenv
 
@@ -16,6 +22,138 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Scenes per classify_scenes call; one StashDB page
+FILTER_BATCH_SIZE = 100
+
+# Minimum seconds between progress reports while scanning StashDB scenes
+SCAN_PROGRESS_INTERVAL = 0.25
+
+# Concurrent sceneDestroy requests in the clean job
+DELETE_WORKERS = 8
+
+# Scene ids per metadataGenerate job when generating for specific scenes
+GENERATE_BATCH_SIZE = 250
+
+STASHDB_URL = "https://stashdb.org"
+
+
+@lru_cache(maxsize=1)
+def get_stashdb_api(api_key):
+    """StashDB client for api_key, shared across jobs to reuse its connections and cache"""
+    return StashAPI(url=STASHDB_URL, api_key=api_key)
+
+
+def _date_window(start_date, end_date, search_back_days):
+    """Inclusive (start, end) ISO date strings: the given range, else the last N days"""
+    if start_date and end_date:
+        # Round-trip validates the input the way strptime used to
+        start = date.fromisoformat(start_date)
+        end = date.fromisoformat(end_date)
+        return start.isoformat(), end.isoformat()
+    today = date.today()
+    return (today - timedelta(days=search_back_days)).isoformat(), today.isoformat()
+
+
+def _in_date_window(scene, start_s, end_s):
+    """Whether the scene is dated within [start_s, end_s]; ISO dates order correctly as strings"""
+    scene_date = scene.get("date")
+    if not scene_date:
+        logger.debug(
+            "Scene has no date, skipped by the date filter: %s", scene.get("title")
+        )
+        return False
+    return start_s <= scene_date <= end_s
+
+
+def _dated_batches(scenes, start_s, end_s, size=FILTER_BATCH_SIZE):
+    """Group the in-window scenes of a stream into lists for batch rule evaluation"""
+    batch = []
+    for scene in scenes:
+        if _in_date_window(scene, start_s, end_s):
+            batch.append(scene)
+            if len(batch) == size:
+                yield batch
+                batch = []
+    if batch:
+        yield batch
+
+
+def _passing_stashdb_scenes(
+    config,
+    stashdb_api,
+    start_date,
+    end_date,
+    sort_direction,
+    stats: Counter,
+    progress_callback=None,
+):
+    """Stream (scene, title) for the StashDB scenes in the job's date window that pass
+    AddScenesFilter
+
+    Shared by the Whisparr and Prowlarr add jobs. Scenes are date-checked and run
+    through the filter rules a batch at a time in a single pass; stats counts
+    "scanned" (pulled from StashDB), "found" (in the window), "passed" and
+    "filtered" as the stream is consumed. progress_callback(scanned, expected,
+    message) is called as scenes arrive, at most every SCAN_PROGRESS_INTERVAL
+    seconds; it may raise to stop the scan.
+    """
+    # Use dedicated AddScenesFilter with StashDB conditions
+    filter_engine = AddScenesFilter(config, STASHDB_CONDITIONS)
+    search_back_days = config.get("jobs", {}).get("add_new_scenes_search_back_days", 7)
+
+    start_s, end_s = _date_window(start_date, end_date, search_back_days)
+    expected = 0
+
+    def on_count(count):
+        nonlocal expected
+        expected = count
+
+    def scanned(scenes):
+        last_report = 0.0
+        for scene in scenes:
+            stats["scanned"] += 1
+            now = time.monotonic()
+            if progress_callback and now - last_report >= SCAN_PROGRESS_INTERVAL:
+                last_report = now
+                current = stats["scanned"]
+                total = max(expected, current)
+                progress_callback(
+                    current,
+                    total,
+                    f"Scanning StashDB scene {current}/{total}: {scene.get('title') or 'Untitled'}",
+                )
+            yield scene
+
+    new_scenes = stashdb_api.iter_scenes(
+        limit=500,
+        start_date=start_date,
+        end_date=end_date,
+        direction=sort_direction,
+        measurement_fields=filter_engine.required_measurement_fields(),
+        on_count=on_count,
+    )
+
+    for batch in _dated_batches(scanned(new_scenes), start_s, end_s):
+        decisions = filter_engine.classify_scenes(batch)
+        for scene, (should_add, reason) in zip(batch, decisions, strict=True):
+            stats["found"] += 1
+            scene_title = scene.get("title") or "Untitled"
+            logger.debug("Processing scene %s: %s", stats["found"], scene_title)
+
+            if should_add:
+                stats["passed"] += 1
+                # Log at INFO level with emoji for scenes that pass filter
+                logger.info("✅ PASSED FILTER: %s", scene_title)
+                logger.debug("   Reason: %s", reason)
+                yield scene, scene_title
+            else:
+                stats["filtered"] += 1
+                # Only show filtered scenes in DEBUG mode to reduce noise
+                logger.debug("❌ FILTERED: %s - %s", scene_title, reason)
+
+    logger.info("📊 === RETRIEVED %s SCENES FROM STASHDB ===", stats["found"])
+    filter_engine.save_rule_stats()
+
 
 def add_new_scenes_to_whisparr(
     config: dict,
@@ -34,115 +172,89 @@ def add_new_scenes_to_whisparr(
     logger.debug("Entering add_new_scenes_to_whisparr function.")
     logger.info("🚀 === STARTING ADD NEW SCENES JOB ===")
 
-    # Use dedicated AddScenesFilter with StashDB conditions
-    filter_engine = AddScenesFilter(config, STASHDB_CONDITIONS)
-    whisparr_api = WhisparrApi(config.get("whisparr", {}))
-
-    search_back_days = config.get("jobs", {}).get("add_new_scenes_search_back_days", 7)
-
-    logger.info(f"💧 DRY RUN MODE: {'ENABLED' if dry_run else 'DISABLED'}")
+    logger.info("💧 DRY RUN MODE: %s", "ENABLED" if dry_run else "DISABLED")
 
     logger.info("🔍 Fetching scenes from StashDB...")
     stashdb_api_key = os.environ.get("STASHDB_API_KEY")
     if not stashdb_api_key:
-        logging.error("❌ STASHDB_API_KEY environment variable not set. Cannot fetch scenes.")
-        return
-    stashdb_api = StashAPI(url="https://stashdb.org", api_key=stashdb_api_key)
-
-    new_scenes = stashdb_api.get_all_scenes(
-        limit=500, start_date=start_date, end_date=end_date, direction=sort_direction
-    )
-
-    # Add this debug logging:
-    logger.info("Sample scene dates from StashDB:")
-    for i, scene in enumerate(new_scenes[:5]):  # Log first 5 scenes
-        scene_date = scene.get("date", "No date")
-        logger.info(
-            f"  Scene {i + 1}: '{scene.get('title', 'No title')[:50]}' - Date: {scene_date}"
+        logging.error(
+            "❌ STASHDB_API_KEY environment variable not set. Cannot fetch scenes."
         )
-
-    from datetime import datetime, timedelta
-
-    if start_date and end_date:
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-    else:
-        start_date = datetime.now() - timedelta(days=search_back_days)
-        end_date = datetime.now()
-
-    filtered_scenes = []
-    for scene in new_scenes:
-        scene_date_str = scene.get("date")
-        if scene_date_str:
-            scene_date = datetime.strptime(scene_date_str, "%Y-%m-%d")
-            if start_date <= scene_date <= end_date:
-                filtered_scenes.append(scene)
-        else:
-            logger.debug(
-                f"Scene {scene.get('title', 'Untitled')} has no date, skipping date filter."
-            )
-    new_scenes = filtered_scenes
-
-    logger.info(f"📊 === RETRIEVED {len(new_scenes)} SCENES FROM STASHDB ===")
+        return
+    stashdb_api = get_stashdb_api(stashdb_api_key)
 
     # Track statistics
-    scenes_passed_filter = 0
+    stats = Counter()
     scenes_already_exist = 0
     scenes_added = 0
     scenes_failed = 0
-    scenes_filtered = 0
-
-    total_scenes_found = len(new_scenes)
-    for i, scene in enumerate(new_scenes):
-        if progress_callback:
-            progress_callback(
-                i + 1,
-                total_scenes_found,
-                f"Processing scene {i + 1}/{total_scenes_found}: {scene.get('title', 'Untitled')}",
-            )
 
-        scene_title = scene.get("title", "Untitled")
-        logger.debug(f"Processing scene {i + 1}/{len(new_scenes)}: {scene_title}")
-
-        # Use AddScenesFilter's should_add_scene method
-        should_add, reason = filter_engine.should_add_scene(scene)
-
-        if should_add:
-            scenes_passed_filter += 1
-            # Log at INFO level with emoji for scenes that pass filter
-            logger.info(f"✅ PASSED FILTER: {scene_title}")
-            logger.debug(f"   Reason: {reason}")
-
-            if not dry_run:
-                result = whisparr_api.add_series(scene.get("title"))
-                if result and result.get("status") == "added":
-                    scenes_added += 1
-                    scenes_added_to_whisparr += 1
-                    logger.info(f"🎉 ADDED TO WHISPARR: {scene_title}")
-                elif result and result.get("status") == "already_exists":
-                    scenes_already_exist += 1
-                    logger.info(f"ℹ️  ALREADY IN WHISPARR: {scene_title}")
-                else:
-                    scenes_failed += 1
-                    logger.error(f"❌ FAILED TO ADD: {scene_title}")
-            else:
-                logger.info(f"💧 DRY RUN - Would attempt to add: {scene_title}")
+    # Queue what passes the filter for Whisparr
+    to_add = []
+    for scene, scene_title in _passing_stashdb_scenes(
+        config,
+        stashdb_api,
+        start_date,
+        end_date,
+        sort_direction,
+        stats,
+        progress_callback,
+    ):
+        if not dry_run:
+            to_add.append((scene, scene_title))
         else:
-            scenes_filtered += 1
-            # Only show filtered scenes in DEBUG mode to reduce noise
-            logger.debug(f"❌ FILTERED: {scene_title} - {reason}")
+            logger.info("💧 DRY RUN - Would attempt to add: %s", scene_title)
+    total_scenes_found = stats["found"]
+
+    if progress_callback and not to_add:
+        progress_callback(
+            total_scenes_found,
+            total_scenes_found,
+            f"Filtered {total_scenes_found} scenes",
+        )
+
+    # Adds go to Whisparr in batches: one existence check, bulk imports. Progress
+    # carries on from the scan, counting each queued scene as one more step.
+    if to_add:
+        scanned = stats["scanned"]
+
+        def batch_progress(done, total):
+            if progress_callback:
+                progress_callback(
+                    scanned + done,
+                    scanned + total,
+                    f"Adding scenes to Whisparr: {done}/{total}",
+                )
+
+        with WhisparrApi(config.get("whisparr", {})) as whisparr_api:
+            results = whisparr_api.add_series_batch(
+                # The raw title, so a scene without one is not looked up as "Untitled"
+                [scene.get("title") for scene, _ in to_add],
+                progress_callback=batch_progress,
+            )
+        for (_, scene_title), result in zip(to_add, results, strict=True):
+            if result and result.get("status") == "added":
+                scenes_added += 1
+                scenes_added_to_whisparr += 1
+                logger.info("🎉 ADDED TO WHISPARR: %s", scene_title)
+            elif result and result.get("status") == "already_exists":
+                scenes_already_exist += 1
+                logger.info("ℹ️  ALREADY IN WHISPARR: %s", scene_title)
+            else:
+                scenes_failed += 1
+                logger.error("❌ FAILED TO ADD: %s", scene_title)
 
     # Summary at INFO level
     logger.info("")
     logger.info("📊 === JOB SUMMARY ===")
-    logger.info(f"🔍 Total scenes from StashDB: {len(new_scenes)}")
-    logger.info(f"✅ Scenes passed filter: {scenes_passed_filter}")
-    logger.info(f"❌ Scenes filtered out: {scenes_filtered}")
+    logger.info("🔍 Total scenes from StashDB: %s", total_scenes_found)
+    logger.info("✅ Scenes passed filter: %s", stats["passed"])
+    logger.info("❌ Scenes filtered out: %s", stats["filtered"])
 
     if not dry_run:
-        logger.info(f"🎉 New scenes added: {scenes_added}")
-        logger.info(f"ℹ️  Already existed: {scenes_already_exist}")
-        logger.info(f"💥 Failed to add: {scenes_failed}")
+        logger.info("🎉 New scenes added: %s", scenes_added)
+        logger.info("ℹ️  Already existed: %s", scenes_already_exist)
+        logger.info("💥 Failed to add: %s", scenes_failed)
     else:
         logger.info("💧 DRY RUN - No scenes were actually added")
 
@@ -162,73 +274,105 @@ def clean_existing_scenes_from_stash(config: dict, stash_api: StashAPI):
     filter_engine = CleanScenesFilter(config, LOCAL_STASH_CONDITIONS)
 
     dry_run = config.get("general", {}).get("dry_run", False)
-    logger.info(f"💧 DRY RUN MODE: {'ENABLED' if dry_run else 'DISABLED'}")
+    logger.info("💧 DRY RUN MODE: %s", "ENABLED" if dry_run else "DISABLED")
 
     logger.info("🔍 Fetching scenes from local Stash...")
-    all_scenes = stash_api.get_all_scenes()
-
-    if not all_scenes:
-        logger.info("📭 No scenes found in local Stash.")
-        return
-
-    logger.info(f"📊 Found {len(all_scenes)} scenes in local Stash")
 
     scenes_to_delete = []
-    scenes_to_keep = []
+    scenes_to_keep = 0
+    total_scenes = 0
 
     is_debug_mode = logger.isEnabledFor(logging.DEBUG)
 
-    for i, scene in enumerate(all_scenes):
-        scene_title = scene.get("title", "Untitled")
-        scene_id = scene.get("id")
-
-        if is_debug_mode:
-            logger.debug(f"🔍 Processing scene {i + 1}/{len(all_scenes)}: {scene_title}")
-
-        # Use CleanScenesFilter's should_keep_scene method
-        should_keep, reason = filter_engine.should_keep_scene(scene)
+    # Only scenes some reject rule could match need to come back from Stash
+    scene_filter = filter_engine.server_prefilter()
+    if scene_filter:
+        logger.info("🔎 Pre-filtering scenes server-side by reject rule titles")
+
+    # Evaluate each batch of scenes while the next page is still being fetched
+    scenes = stash_api.iter_scenes(scene_filter=scene_filter)
+    while batch := list(islice(scenes, FILTER_BATCH_SIZE)):
+        deletable = []
+        for scene in batch:
+            total_scenes += 1
+            if is_debug_mode:
+                logger.debug(
+                    "🔍 Processing scene %s: %s",
+                    total_scenes,
+                    scene.get("title") or "Untitled",
+                )
+            if scene.get("id"):
+                deletable.append(scene)
+            else:
+                logger.warning(
+                    "Scene %s has no ID, cannot be deleted. Skipping.",
+                    scene.get("title") or "Untitled",
+                )
+
+        # Use CleanScenesFilter's rules over the whole batch
+        for scene, (should_keep, reason) in zip(
+            deletable, filter_engine.classify_scenes(deletable), strict=True
+        ):
+            scene_title = scene.get("title") or "Untitled"
+            if should_keep:
+                logger.debug("✅ KEEP: %s - %s", scene_title, reason)
+                scenes_to_keep += 1
+            else:
+                logger.info("🔥 MARKED FOR DELETION: %s - %s", scene_title, reason)
+                scenes_to_delete.append((scene["id"], scene_title))
 
-        if not scene_id:
-            logger.warning(f"Scene {scene_title} has no ID, cannot be deleted. Skipping.")
-            continue
+    if not total_scenes:
+        logger.info("📭 No scenes found in local Stash.")
+        return
 
-        if should_keep:
-            logger.debug(f"✅ KEEP: {scene_title} - {reason}")
-            scenes_to_keep.append(scene_title)
-        else:
-            logger.info(f"🔥 MARKED FOR DELETION: {scene_title} - {reason}")
-            scenes_to_delete.append((scene_id, scene_title))
+    logger.info("📊 Found %s scenes in local Stash", total_scenes)
 
     # Summary
     logger.info("")
     logger.info("📊 === CLEANING SUMMARY ===")
-    logger.info(f"🔍 Total scenes processed: {len(all_scenes)}")
-    logger.info(f"✅ Scenes to keep: {len(scenes_to_keep)}")
-    logger.info(f"🔥 Scenes to delete: {len(scenes_to_delete)}")
+    logger.info("🔍 Total scenes processed: %s", total_scenes)
+    logger.info("✅ Scenes to keep: %s", scenes_to_keep)
+    logger.info("🔥 Scenes to delete: %s", len(scenes_to_delete))
 
     # Actually delete the scenes (if not dry run)
     if not dry_run and scenes_to_delete:
         logger.info("")
-        logger.info(f"🔥 DELETING {len(scenes_to_delete)} SCENES...")
+        logger.info("🔥 DELETING %s SCENES...", len(scenes_to_delete))
         deleted_count = 0
         failed_count = 0
 
-        for scene_id, scene_title in scenes_to_delete:
-            logger.info(f"   🗑️  Deleting: {scene_title}")
-            success = stash_api.delete_scene(scene_id, delete_file=True)
-            if success:
-                deleted_count += 1
-                logger.info("   ✅ Successfully deleted")
-            else:
-                failed_count += 1
-                logger.error("   ❌ Failed to delete")
+        # Deletions are independent round-trips, so overlap them
+        max_workers = min(DELETE_WORKERS, len(scenes_to_delete))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {}
+            for scene_id, scene_title in scenes_to_delete:
+                logger.info("   🗑️  Deleting: %s", scene_title)
+                future = executor.submit(
+                    stash_api.delete_scene, scene_id, delete_file=True
+                )
+                futures[future] = scene_title
+            for future in as_completed(futures):
+                scene_title = futures[future]
+                try:
+                    success = future.result()
+                except Exception as e:
+                    logger.error("   ❌ Error deleting %s: %s", scene_title, e)
+                    success = False
+                if success:
+                    deleted_count += 1
+                    logger.info("   ✅ Successfully deleted: %s", scene_title)
+                else:
+                    failed_count += 1
+                    logger.error("   ❌ Failed to delete: %s", scene_title)
 
         logger.info("")
-        logger.info(f"📊 Deletion results: {deleted_count} deleted, {failed_count} failed")
+        logger.info(
+            "📊 Deletion results: %s deleted, %s failed", deleted_count, failed_count
+        )
 
     elif dry_run and scenes_to_delete:
         logger.info("")
-        logger.info(f"💧 DRY RUN: Would delete {len(scenes_to_delete)} scenes")
+        logger.info("💧 DRY RUN: Would delete %s scenes", len(scenes_to_delete))
     else:
         logger.info("")
         logger.info("✅ No scenes matched the deletion criteria.")
@@ -243,21 +387,60 @@ def generate_metadata(config: dict, stash_api: StashAPI):
     logger.info("🚀 === STARTING GENERATE METADATA JOB ===")
 
     dry_run = config.get("general", {}).get("dry_run", False)
-    logger.info(f"💧 DRY RUN MODE: {'ENABLED' if dry_run else 'DISABLED'}")
+    logger.info("💧 DRY RUN MODE: %s", "ENABLED" if dry_run else "DISABLED")
 
     if not dry_run:
         try:
             job_id = stash_api.trigger_generate()
-            logger.info(f"✅ Successfully triggered metadata generation with job ID: {job_id}")
+            logger.info(
+                "✅ Successfully triggered metadata generation with job ID: %s", job_id
+            )
             stash_api.wait_for_job_completion(job_id)
         except Exception as e:
-            logger.error(f"❌ Failed to trigger metadata generation: {e}")
+            logger.error("❌ Failed to trigger metadata generation: %s", e)
     else:
         logger.info("💧 DRY RUN - Would have triggered metadata generation.")
 
     logger.info("🏁 === COMPLETED GENERATE METADATA JOB ===")
 
 
+def generate_metadata_bulk(config: dict, stash_api: StashAPI, scene_ids: list) -> list:
+    """
+    Generates metadata for specific scenes, one Stash job per GENERATE_BATCH_SIZE scenes.
+
+    Returns the scene ids whose generation job finished; none on a dry run.
+    """
+    logger.info("🚀 === STARTING GENERATE METADATA JOB (%s scenes) ===", len(scene_ids))
+
+    dry_run = config.get("general", {}).get("dry_run", False)
+    logger.info("💧 DRY RUN MODE: %s", "ENABLED" if dry_run else "DISABLED")
+
+    generated = []
+    if dry_run:
+        logger.info(
+            "💧 DRY RUN - Would have generated metadata for %s scenes.", len(scene_ids)
+        )
+    else:
+        for start in range(0, len(scene_ids), GENERATE_BATCH_SIZE):
+            batch = scene_ids[start : start + GENERATE_BATCH_SIZE]
+            try:
+                job_id = stash_api.trigger_generate(batch)
+                logger.info(
+                    "✅ Triggered metadata generation for %s scenes with job ID: %s",
+                    len(batch),
+                    job_id,
+                )
+                if stash_api.wait_for_job_completion(job_id):
+                    generated.extend(batch)
+            except Exception as e:
+                logger.error(
+                    "❌ Failed to generate metadata for %s scenes: %s", len(batch), e
+                )
+
+    logger.info("🏁 === COMPLETED GENERATE METADATA JOB ===")
+    return generated
+
+
 def add_new_scenes_with_prowlarr(
     config: dict,
     stash_api: StashAPI,
@@ -271,8 +454,6 @@ def add_new_scenes_with_prowlarr(
     Enhanced scene discovery using Prowlarr for direct torrent searching.
     Finds new scenes in StashDB, filters them, searches via Prowlarr, and downloads via qBittorrent.
     """
-    scenes_downloaded = 0
-    total_scenes_found = 0
     logger.debug("Entering add_new_scenes_with_prowlarr function.")
     logger.info("🚀 === STARTING PROWLARR SEARCH JOB ===")
 
@@ -280,111 +461,142 @@ def add_new_scenes_with_prowlarr(
     prowlarr_config = config.get("prowlarr", {})
     if not prowlarr_config.get("enabled", False):
         logger.error("❌ Prowlarr is not enabled in configuration")
-        return {"scenes_downloaded": 0, "total_found": 0, "error": "Prowlarr not enabled"}
+        return {
+            "scenes_downloaded": 0,
+            "total_found": 0,
+            "error": "Prowlarr not enabled",
+        }
 
     if not prowlarr_config.get("url") or not prowlarr_config.get("api_key"):
         logger.error("❌ Prowlarr URL or API key not configured")
-        return {"scenes_downloaded": 0, "total_found": 0, "error": "Prowlarr not configured"}
-
-    # Use dedicated AddScenesFilter with StashDB conditions
-    filter_engine = AddScenesFilter(config, STASHDB_CONDITIONS)
+        return {
+            "scenes_downloaded": 0,
+            "total_found": 0,
+            "error": "Prowlarr not configured",
+        }
 
     try:
         # Initialize Prowlarr client
         prowlarr_client = ProwlarrClient(prowlarr_config)
+    except Exception as e:
+        return _prowlarr_init_failed(e)
+
+    # Closes the client's connections on every return and if the search raises
+    with prowlarr_client:
+        return _search_scenes_with_prowlarr(
+            prowlarr_client,
+            config,
+            start_date,
+            end_date,
+            progress_callback,
+            dry_run,
+            sort_direction,
+        )
+
 
+def _prowlarr_init_failed(error):
+    logger.error("❌ Error initializing Prowlarr client: %s", error)
+    return {
+        "scenes_downloaded": 0,
+        "total_found": 0,
+        "error": f"Prowlarr initialization failed: {error}",
+    }
+
+
+def _search_scenes_with_prowlarr(
+    prowlarr_client: ProwlarrClient,
+    config: dict,
+    start_date,
+    end_date,
+    progress_callback,
+    dry_run,
+    sort_direction: str,
+):
+    """The body of add_new_scenes_with_prowlarr once its client is created"""
+    prowlarr_config = config.get("prowlarr", {})
+    try:
         # Test Prowlarr connection
         if not prowlarr_client.test_connection():
             logger.error("❌ Failed to connect to Prowlarr")
-            return {"scenes_downloaded": 0, "total_found": 0, "error": "Prowlarr connection failed"}
+            return {
+                "scenes_downloaded": 0,
+                "total_found": 0,
+                "error": "Prowlarr connection failed",
+            }
 
         logger.info("✅ Connected to Prowlarr successfully")
 
     except Exception as e:
-        logger.error(f"❌ Error initializing Prowlarr client: {e}")
-        return {
-            "scenes_downloaded": 0,
-            "total_found": 0,
-            "error": f"Prowlarr initialization failed: {e}",
-        }
-
-    search_back_days = config.get("jobs", {}).get("add_new_scenes_search_back_days", 7)
+        return _prowlarr_init_failed(e)
 
-    logger.info(f"💧 DRY RUN MODE: {'ENABLED' if dry_run else 'DISABLED'}")
+    logger.info("💧 DRY RUN MODE: %s", "ENABLED" if dry_run else "DISABLED")
 
     logger.info("🔍 Fetching scenes from StashDB...")
     stashdb_api_key = os.environ.get("STASHDB_API_KEY")
     if not stashdb_api_key:
-        logging.error("❌ STASHDB_API_KEY environment variable not set. Cannot fetch scenes.")
-        return {"scenes_downloaded": 0, "total_found": 0, "error": "StashDB API key missing"}
-
-    stashdb_api = StashAPI(url="https://stashdb.org", api_key=stashdb_api_key)
-
-    new_scenes = stashdb_api.get_all_scenes(
-        limit=500, start_date=start_date, end_date=end_date, direction=sort_direction
-    )
-
-    # Date filtering logic (same as original)
-    from datetime import datetime, timedelta
-
-    if start_date and end_date:
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-    else:
-        start_date = datetime.now() - timedelta(days=search_back_days)
-        end_date = datetime.now()
-
-    filtered_scenes = []
-    for scene in new_scenes:
-        scene_date_str = scene.get("date")
-        if scene_date_str:
-            scene_date = datetime.strptime(scene_date_str, "%Y-%m-%d")
-            if start_date <= scene_date <= end_date:
-                filtered_scenes.append(scene)
-        else:
-            logger.debug(
-                f"Scene {scene.get('title', 'Untitled')} has no date, skipping date filter."
-            )
-    new_scenes = filtered_scenes
+        logging.error(
+            "❌ STASHDB_API_KEY environment variable not set. Cannot fetch scenes."
+        )
+        return {
+            "scenes_downloaded": 0,
+            "total_found": 0,
+            "error": "StashDB API key missing",
+        }
 
-    logger.info(f"📊 === RETRIEVED {len(new_scenes)} SCENES FROM STASHDB ===")
+    stashdb_api = get_stashdb_api(stashdb_api_key)
 
     # Track statistics
-    scenes_passed_filter = 0
+    stats = Counter()
     scenes_found_on_prowlarr = 0
     scenes_downloaded = 0
     scenes_failed = 0
-    scenes_filtered = 0
-
-    total_scenes_found = len(new_scenes)
-    for i, scene in enumerate(new_scenes):
-        if progress_callback:
-            progress_callback(
-                i + 1,
-                total_scenes_found,
-                f"Processing scene {i + 1}/{total_scenes_found}: {scene.get('title', 'Untitled')}",
-            )
 
-        scene_title = scene.get("title", "Untitled")
-        logger.debug(f"Processing scene {i + 1}/{len(new_scenes)}: {scene_title}")
-
-        # Use AddScenesFilter's should_add_scene method
-        should_add, reason = filter_engine.should_add_scene(scene)
+    # Pass 1: the titles of the scenes that pass the filter
+    passed = [
+        scene_title
+        for _, scene_title in _passing_stashdb_scenes(
+            config, stashdb_api, start_date, end_date, sort_direction, stats
+        )
+    ]
+    total_scenes_found = stats["found"]
 
-        if should_add:
-            scenes_passed_filter += 1
-            logger.info(f"✅ PASSED FILTER: {scene_title}")
-            logger.debug(f"   Reason: {reason}")
+    # Pass 2: Prowlarr searches are independent network round-trips, so run them
+    # concurrently; results are handled (and downloads sent) in scene order
+    def search(scene_title):
+        logger.info("🔍 Searching Prowlarr for: %s", scene_title)
+        try:
+            return prowlarr_client.search_scene(scene_title), None
+        except Exception as e:
+            return None, e
+
+    n_passed = len(passed)
+    report_progress = progress_callback is not None
+    max_workers = max(1, min(n_passed, prowlarr_config.get("max_concurrency", 8)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        searches = executor.map(search, passed)
+        for i, (scene_title, (search_results, error)) in enumerate(
+            zip(passed, searches, strict=True), 1
+        ):
+            # The message is only formatted when someone is listening
+            if report_progress:
+                progress_callback(
+                    i, n_passed, f"Searching Prowlarr {i}/{n_passed}: {scene_title}"
+                )
+
+            if error is not None:
+                scenes_failed += 1
+                logger.error(
+                    "❌ Error searching Prowlarr for '%s': %s", scene_title, error
+                )
+                continue
 
-            # Search for scene on Prowlarr
-            logger.info(f"🔍 Searching Prowlarr for: {scene_title}")
             try:
-                search_results = prowlarr_client.search_scene(scene_title)
-
                 if search_results:
                     scenes_found_on_prowlarr += 1
                     logger.info(
-                        f"🎯 Found {len(search_results)} results on Prowlarr for: {scene_title}"
+                        "🎯 Found %s results on Prowlarr for: %s",
+                        len(search_results),
+                        scene_title,
                     )
 
                     # Get the best result
@@ -401,44 +613,53 @@ def add_new_scenes_with_prowlarr(
 
                             if success:
                                 scenes_downloaded += 1
-                                logger.info(f"🎉 DOWNLOADED VIA PROWLARR: {scene_title}")
-                                logger.info(f"   From: {best_result.get('indexer_name')}")
-                                logger.info(f"   Seeders: {best_result.get('seeders')}")
-                                size_gb = best_result.get("size", 0) / (1024 * 1024 * 1024)
-                                logger.info(f"   Size: {size_gb:.2f} GB")
+                                logger.info(
+                                    "🎉 DOWNLOADED VIA PROWLARR: %s", scene_title
+                                )
+                                logger.info(
+                                    "   From: %s", best_result.get("indexer_name")
+                                )
+                                logger.info(
+                                    "   Seeders: %s", best_result.get("seeders")
+                                )
+                                size_gb = best_result.get("size", 0) / (
+                                    1024 * 1024 * 1024
+                                )
+                                logger.info("   Size: %.2f GB", size_gb)
                             else:
                                 scenes_failed += 1
-                                logger.error(f"❌ FAILED TO DOWNLOAD: {scene_title}")
+                                logger.error("❌ FAILED TO DOWNLOAD: %s", scene_title)
                         else:
-                            logger.info(f"💧 DRY RUN - Would download: {best_result.get('title')}")
-                            logger.info(f"   From: {best_result.get('indexer_name')}")
+                            logger.info(
+                                "💧 DRY RUN - Would download: %s",
+                                best_result.get("title"),
+                            )
+                            logger.info("   From: %s", best_result.get("indexer_name"))
                     else:
                         logger.warning(
-                            f"⚠️  No suitable results for: {scene_title} "
-                            "(quality/seeder criteria not met)"
+                            "⚠️  No suitable results for: %s (quality/seeder criteria not met)",
+                            scene_title,
                         )
                 else:
-                    logger.warning(f"❌ No results found on Prowlarr for: {scene_title}")
+                    logger.warning(
+                        "❌ No results found on Prowlarr for: %s", scene_title
+                    )
 
             except Exception as e:
                 scenes_failed += 1
-                logger.error(f"❌ Error searching Prowlarr for '{scene_title}': {e}")
-
-        else:
-            scenes_filtered += 1
-            logger.debug(f"❌ FILTERED: {scene_title} - {reason}")
+                logger.error("❌ Error searching Prowlarr for '%s': %s", scene_title, e)
 
     # Summary at INFO level
     logger.info("")
     logger.info("📊 === PROWLARR SEARCH JOB SUMMARY ===")
-    logger.info(f"🔍 Total scenes from StashDB: {len(new_scenes)}")
-    logger.info(f"✅ Scenes passed filter: {scenes_passed_filter}")
-    logger.info(f"❌ Scenes filtered out: {scenes_filtered}")
-    logger.info(f"🎯 Scenes found on Prowlarr: {scenes_found_on_prowlarr}")
+    logger.info("🔍 Total scenes from StashDB: %s", total_scenes_found)
+    logger.info("✅ Scenes passed filter: %s", stats["passed"])
+    logger.info("❌ Scenes filtered out: %s", stats["filtered"])
+    logger.info("🎯 Scenes found on Prowlarr: %s", scenes_found_on_prowlarr)
 
     if not dry_run:
-        logger.info(f"🎉 Scenes downloaded: {scenes_downloaded}")
-        logger.info(f"💥 Failed downloads: {scenes_failed}")
+        logger.info("🎉 Scenes downloaded: %s", scenes_downloaded)
+        logger.info("💥 Failed downloads: %s", scenes_failed)
     else:
         logger.info("💧 DRY RUN - No scenes were actually downloaded")
 
@@ -4,7 +4,7 @@ from flask import Blueprint, flash, jsonify, redirect, request, url_for
 
 from src.config.config import get_filter_rules, save_filter_rules
 from src.core.validation import ValidationError, validate_filter_rule
-from src.services.rule_sync_manager import RuleSyncManager
+from src.services.rule_sync_manager import get_rule_sync_manager
 
 filter_bp = Blueprint("filters", __name__)
 
@@ -12,7 +12,7 @@ filter_bp = Blueprint("filters", __name__)
 def _check_context_read_only(context: str) -> bool:
     """Check if context is read-only and flash error if so."""
     try:
-        sync_manager = RuleSyncManager()
+        sync_manager = get_rule_sync_manager()
         if sync_manager.is_context_read_only(context):
             flash(
                 (
@@ -28,13 +28,15 @@ def _check_context_read_only(context: str) -> bool:
     return False
 
 
-def _sync_if_enabled(source_context: str):
-    """Check if sync is enabled and trigger it if necessary."""
+def _sync_if_enabled(source_context: str, rules: list):
+    """Check if sync is enabled and trigger it if necessary.
+
+    rules is the source context's rule list as just saved.
+    """
     try:
-        sync_manager = RuleSyncManager()
+        sync_manager = get_rule_sync_manager()
         if sync_manager.should_sync_rule(source_context):
             logging.info(f"Auto-syncing rules from {source_context}...")
-            rules = get_filter_rules(source_context)
             sync_manager.sync_rules(source_context, rules)
             flash("Rules automatically synced to the other context.", "info")
     except Exception as e:
@@ -98,7 +100,7 @@ def _add_rule(context):
         rules.append(validated_rule)
         save_filter_rules(rules, context)
         flash("Filter rule added successfully", "success")
-        _sync_if_enabled(context)
+        _sync_if_enabled(context, rules)
     except ValidationError as e:
         logging.error(f"Validation error: {e}")
         flash(f"Validation error: {e}", "error")
@@ -126,7 +128,7 @@ def _edit_rule(context, rule_index):
         rules[rule_index] = validated_rule
         save_filter_rules(rules, context)
         flash("Filter rule updated successfully", "success")
-        _sync_if_enabled(context)
+        _sync_if_enabled(context, rules)
     except ValidationError as e:
         flash(f"Validation error: {e}", "error")
     except Exception as e:
@@ -146,7 +148,7 @@ def _delete_rule(context, rule_index):
     if 0 <= rule_index < len(rules):
         del rules[rule_index]
         save_filter_rules(rules, context)
-        _sync_if_enabled(context)
+        _sync_if_enabled(context, rules)
 
     return redirect(url_for(f"main.{context}"))
 
@@ -154,7 +156,7 @@ def _delete_rule(context, rule_index):
 def _reorder_rules(context):
     """Reorder filter rules based on new order"""
     # Check if context is read-only
-    sync_manager = RuleSyncManager()
+    sync_manager = get_rule_sync_manager()
     if sync_manager.is_context_read_only(context):
         return jsonify(
             {
@@ -169,10 +171,12 @@ def _reorder_rules(context):
     rules = get_filter_rules(context)
     new_order = request.json.get("order", [])
 
-    if len(new_order) == len(rules):
-        reordered_rules = [rules[i] for i in new_order if 0 <= i < len(rules)]
-        save_filter_rules(reordered_rules, context)
-        _sync_if_enabled(context)
-        return jsonify({"success": True})
+    # Only a permutation of the current positions is saved; anything else would
+    # drop or duplicate rules
+    if len(new_order) != len(rules) or set(new_order) != set(range(len(rules))):
+        return jsonify({"success": False, "error": "Invalid order"}), 400
 
-    return jsonify({"success": False, "error": "Invalid order"})
+    reordered_rules = [rules[i] for i in new_order]
+    save_filter_rules(reordered_rules, context)
+    _sync_if_enabled(context, reordered_rules)
+    return jsonify({"success": True})
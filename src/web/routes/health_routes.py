@@ -1,15 +1,38 @@
+# Optional dependency: orjson, when installed, encodes the probe responses.
+
+import hashlib
+import json
 import logging
 import os
 
-from flask import Blueprint, jsonify
+from flask import Blueprint, current_app, jsonify, request
+
+try:
+    import orjson
+except ImportError:  # Optional fast JSON codec; fall back to Flask's jsonify
+    orjson = None
 
-from src.core.database_manager import DatabaseManager
+from src.config.config import get_database
 from src.core.scheduler import scheduler
 
 health_bp = Blueprint("health", __name__)
 
 logger = logging.getLogger(__name__)
 
+# /ready always answers with the same body when ready, so encode it once and let
+# probes that send If-None-Match get a bodiless 304
+_READY_BODY = (
+    orjson.dumps({"status": "ready"}) if orjson else json.dumps({"status": "ready"}).encode()
+)
+_READY_ETAG = hashlib.md5(_READY_BODY, usedforsecurity=False).hexdigest()
+
+
+def _json_response(obj, status: int = 200):
+    """JSON probe response encoded with orjson when available"""
+    if orjson is None:
+        return jsonify(obj), status
+    return current_app.response_class(orjson.dumps(obj), status=status, mimetype="application/json")
+
 
 @health_bp.route("/health")
 def health_check():
@@ -17,21 +40,21 @@ def health_check():
     status = "healthy"
     checks = {}
 
-    # Check database connectivity
+    # Check database connectivity on the shared connection. DatabaseManager is a
+    # per-path singleton, so closing it here would drop the app's own connection.
     try:
-        db_path = os.environ.get("DATABASE_PATH", "/config/stash_manager.db")
-        db = DatabaseManager(db_path)
+        db = get_database()
         db.execute_query("SELECT 1", fetch="one")
-        checks["database"] = {"status": "ok", "path": db_path}
-        db.close()
+        checks["database"] = {"status": "ok", "path": db.db_path}
     except Exception as e:
         checks["database"] = {"status": "error", "error": str(e)}
         status = "unhealthy"
 
-    # Check job scheduler
+    # Check job scheduler, taking one snapshot of the job list for the count and timestamp
+    jobs = []
     try:
-        job_count = len(scheduler.get_jobs())
-        checks["scheduler"] = {"status": "ok", "jobs": job_count}
+        jobs = scheduler.get_jobs()
+        checks["scheduler"] = {"status": "ok", "jobs": len(jobs)}
     except Exception as e:
         checks["scheduler"] = {"status": "error", "error": str(e)}
         status = "unhealthy"
@@ -46,25 +69,27 @@ def health_check():
     except Exception as e:
         checks["logs"] = {"status": "error", "error": str(e)}
 
+    next_run = jobs[0].next_run if jobs else None
     response = {
         "status": status,
-        "timestamp": scheduler.get_jobs()[0].next_run.isoformat() if scheduler.get_jobs() else None,
+        "timestamp": next_run.isoformat() if next_run else None,
         "checks": checks,
     }
 
-    return jsonify(response), 200 if status == "healthy" else 503
+    return _json_response(response, 200 if status == "healthy" else 503)
 
 
 @health_bp.route("/ready")
 def readiness_check():
     """Readiness check - simpler version for container startup"""
     try:
-        # Just check if we can connect to database
-        db_path = os.environ.get("DATABASE_PATH", "/config/stash_manager.db")
-        db = DatabaseManager(db_path)
-        db.execute_query("SELECT 1", fetch="one")
-        db.close()
-        return jsonify({"status": "ready"}), 200
+        # Just check if we can reach the database
+        get_database().execute_query("SELECT 1", fetch="one")
+        if request.if_none_match.contains(_READY_ETAG):
+            return current_app.response_class(status=304, headers={"ETag": f'"{_READY_ETAG}"'})
+        return current_app.response_class(
+            _READY_BODY, mimetype="application/json", headers={"ETag": f'"{_READY_ETAG}"'}
+        )
     except Exception as e:
         logger.error(f"Readiness check failed: {e}")
-        return jsonify({"status": "not ready", "error": str(e)}), 503
+        return _json_response({"status": "not ready", "error": str(e)}, 503)
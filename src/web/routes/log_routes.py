@@ -2,13 +2,22 @@ import json
 import os
 from datetime import datetime
 
-from flask import Blueprint, Response, jsonify, render_template, request
-
-from src.core.logging_config import add_log_listener, get_log_buffer, remove_log_listener
+from flask import Blueprint, Response, jsonify, render_template, request, send_file
+from werkzeug.wsgi import FileWrapper
+
+from src.core.logging_config import (
+    clear_log_buffer,
+    get_encoded_log_buffer,
+    get_log_tail,
+    read_logs_since,
+)
 from src.core.utils import set_active_page
 
 log_bp = Blueprint("logs", __name__)
 
+# Bytes per read when the log download is copied through Python
+DOWNLOAD_CHUNK_SIZE = 256 * 1024
+
 
 @log_bp.route("/logs")
 def logs():
@@ -20,46 +29,24 @@ def logs():
 @log_bp.route("/api/logs/stream")
 def stream_logs():
     """Server-Sent Events endpoint for real-time log streaming."""
-    import queue
 
     def event_stream():
-        # Create a queue for this client
-        client_queue = queue.Queue(maxsize=100)
-
-        # Send initial logs
-        buffer_logs = get_log_buffer(limit=50)
-        for log_entry in buffer_logs:
-            yield f"data: {json.dumps(log_entry)}\n\n"
-
-        # Create listener for new logs
-        def new_log_listener(log_entry):
-            try:
-                if not client_queue.full():
-                    client_queue.put(log_entry)
-            except Exception:
-                pass
-
-        # Add listener
-        add_log_listener(new_log_listener)
-
-        try:
-            # Send logs from queue
-            while True:
-                try:
-                    # Try to get a log entry with timeout
-                    log_entry = client_queue.get(timeout=10.0)
-                    yield f"data: {json.dumps(log_entry)}\n\n"
-                except queue.Empty:
-                    # Send ping to keep connection alive
-                    ping_data = {"type": "ping", "timestamp": datetime.now().isoformat()}
-                    yield f"data: {json.dumps(ping_data)}\n\n"
-
-        except GeneratorExit:
-            # Clean up when client disconnects
-            remove_log_listener(new_log_listener)
-        finally:
-            # Clean up
-            remove_log_listener(new_log_listener)
+        # Send initial logs, remembering where they end in the shared buffer
+        cursor, buffer_logs = get_log_tail(50)
+        for encoded in buffer_logs:
+            yield b"data: " + encoded + b"\n\n"
+
+        # Read new logs from the shared buffer; nothing is registered per client,
+        # so a disconnect needs no cleanup
+        while True:
+            cursor, new_logs = read_logs_since(cursor, timeout=10.0)
+            if not new_logs:
+                # Send ping to keep connection alive
+                ping_data = {"type": "ping", "timestamp": datetime.now().isoformat()}
+                yield f"data: {json.dumps(ping_data)}\n\n"
+                continue
+            for encoded in new_logs:
+                yield b"data: " + encoded + b"\n\n"
 
     response = Response(event_stream(), mimetype="text/event-stream")
     response.headers["Cache-Control"] = "no-cache"
@@ -80,29 +67,19 @@ def get_log_history():
         # Limit the limit to reasonable bounds
         limit = min(limit, 1000)
 
-        # Get logs from buffer
-        logs = get_log_buffer(level_filter=level_filter)
-
-        # Apply search filter if provided
-        if search_query:
-            logs = [
-                log
-                for log in logs
-                if search_query in log["message"].lower() or search_query in log["logger"].lower()
-            ]
-
-        # Apply limit
-        logs = logs[-limit:]
-
-        return jsonify(
+        # Filter against the lower-cased fields stored with each entry, and splice
+        # the entries' stored JSON into the response instead of re-encoding
+        logs = get_encoded_log_buffer(limit=limit, level_filter=level_filter, search=search_query)
+        meta = json.dumps(
             {
-                "logs": logs,
                 "total": len(logs),
                 "limit": limit,
                 "level_filter": level_filter,
                 "search_query": search_query,
             }
-        )
+        ).encode("utf-8")
+        body = b'{"logs":[' + b",".join(logs) + b"]," + meta[1:]
+        return Response(body, mimetype="application/json")
 
     except Exception as e:
         return jsonify({"error": str(e)}), 500
@@ -117,18 +94,18 @@ def download_logs():
         if not os.path.exists(log_file_path):
             return jsonify({"error": "Log file not found"}), 404
 
-        def generate():
-            with open(log_file_path, "r", encoding="utf-8") as f:
-                while True:
-                    data = f.read(4096)
-                    if not data:
-                        break
-                    yield data
-
-        response = Response(generate(), mimetype="text/plain")
-        response.headers["Content-Disposition"] = (
-            f"attachment; filename=stash-manager-{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        # send_file hands the file to the server's file wrapper (sendfile where
+        # supported) and answers Range requests, rather than copying it in Python
+        response = send_file(
+            log_file_path,
+            mimetype="text/plain",
+            as_attachment=True,
+            download_name=f"stash-manager-{datetime.now().strftime('%Y%m%d_%H%M%S')}.log",
+            conditional=True,
         )
+        # Without a server file wrapper werkzeug copies the file in 8 KiB reads
+        if isinstance(response.response, FileWrapper):
+            response.response.buffer_size = DOWNLOAD_CHUNK_SIZE
         return response
 
     except Exception as e:
@@ -139,10 +116,7 @@ def download_logs():
 def clear_buffer():
     """Clear the in-memory log buffer (admin function)."""
     try:
-        from src.core.logging_config import _log_buffer, _log_buffer_lock
-
-        with _log_buffer_lock:
-            _log_buffer.clear()
+        clear_log_buffer()
 
         return jsonify({"success": True, "message": "Log buffer cleared"})
 
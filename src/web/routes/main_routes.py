@@ -1,12 +1,20 @@
+import logging
+
 from flask import Blueprint, redirect, render_template, url_for
+from jinja2.utils import htmlsafe_json_dumps
 
 from src.config.config import get_filter_rules
 from src.filters.conditions.local_stash_conditions import LOCAL_STASH_CONDITIONS
 from src.filters.conditions.stashdb_conditions import STASHDB_CONDITIONS
-from src.services.rule_sync_manager import RuleSyncManager
+from src.services.rule_sync_manager import get_rule_sync_manager
 
 main_bp = Blueprint("main", __name__)
 
+# The condition tables are constant; encode them for the page scripts once, as
+# the tojson filter would, instead of on every render
+STASHDB_CONDITIONS_JSON = htmlsafe_json_dumps(STASHDB_CONDITIONS)
+LOCAL_STASH_CONDITIONS_JSON = htmlsafe_json_dumps(LOCAL_STASH_CONDITIONS)
+
 # Filter contexts for different operations
 FILTER_CONTEXTS = {
     "add_scenes": {
@@ -34,7 +42,7 @@ def index():
 @main_bp.route("/add-scenes")
 def add_scenes():
     filter_rules = get_filter_rules("add_scenes")
-    sync_manager = RuleSyncManager()
+    sync_manager = get_rule_sync_manager()
     is_read_only = sync_manager.is_context_read_only("add_scenes")
     sync_settings = sync_manager.get_sync_settings()
 
@@ -42,6 +50,7 @@ def add_scenes():
         "add_scenes.html",
         filter_rules=filter_rules,
         conditions=STASHDB_CONDITIONS,
+        conditions_json=STASHDB_CONDITIONS_JSON,
         filter_context=FILTER_CONTEXTS["add_scenes"],
         active_page="add_scenes",
         is_read_only=is_read_only,
@@ -52,17 +61,16 @@ def add_scenes():
 @main_bp.route("/clean-scenes")
 def clean_scenes():
     filter_rules = get_filter_rules("clean_scenes")
-    sync_manager = RuleSyncManager()
+    sync_manager = get_rule_sync_manager()
     is_read_only = sync_manager.is_context_read_only("clean_scenes")
     sync_settings = sync_manager.get_sync_settings()
 
-    import logging
-
     logging.info(f"Rendering clean_scenes.html with {len(filter_rules)} rules: {filter_rules}")
     return render_template(
         "clean_scenes.html",
         rules=filter_rules,
         conditions=LOCAL_STASH_CONDITIONS,
+        conditions_json=LOCAL_STASH_CONDITIONS_JSON,
         active_page="clean_scenes",
         filter_context=FILTER_CONTEXTS["clean_scenes"],
         is_read_only=is_read_only,
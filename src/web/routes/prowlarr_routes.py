@@ -2,14 +2,18 @@
 Prowlarr job management routes
 """
 
+import json
 import logging
+import os
+import re
 import threading
-from datetime import datetime
+import time
+from datetime import date, datetime
 
-from flask import Blueprint, jsonify, render_template, request
+from flask import Blueprint, Response, jsonify, render_template, request
 
 from src.api.stash_api import StashAPI
-from src.config.config import get_config
+from src.config.config import get_config_cached
 from src.core.utils import set_active_page
 from src.web.processor import add_new_scenes_with_prowlarr
 
@@ -18,10 +22,32 @@ logger = logging.getLogger("stash_manager.prowlarr_routes")
 # Create the blueprint
 prowlarr_bp = Blueprint("prowlarr", __name__, url_prefix="/prowlarr")
 
-# Job tracking for Prowlarr searches
+# Minimum seconds between progress updates that do not change the percentage
+PROGRESS_UPDATE_INTERVAL = 0.25
+# Seconds a progress stream waits for a change before sending a keep-alive
+PROGRESS_STREAM_PING_INTERVAL = 10.0
+
+# Form dates must be exactly YYYY-MM-DD
+_ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+# Job tracking for Prowlarr searches. The lock is only taken to start and finish
+# a job; progress writes are a single dict.update of the job's entry, atomic
+# under the GIL, and readers take a copy.
 _prowlarr_job_lock = threading.Lock()
 _prowlarr_active_jobs = {}
 _prowlarr_job_progress = {}
+# Bumped on every progress change; progress streams wait on the condition and
+# /progress uses it, with a per-process prefix, as its ETag
+_prowlarr_progress_version = 0
+_PROGRESS_ETAG_PREFIX = os.urandom(4).hex()
+_prowlarr_progress_changed = threading.Condition()
+
+
+def _notify_progress_changed():
+    global _prowlarr_progress_version
+    with _prowlarr_progress_changed:
+        _prowlarr_progress_version += 1
+        _prowlarr_progress_changed.notify_all()
 
 
 def is_prowlarr_job_running(job_name):
@@ -44,27 +70,31 @@ def acquire_prowlarr_job_lock(job_name, job_details=None):
             "scenes_downloaded": 0,
             "errors": [],
         }
-        return True
+    _notify_progress_changed()
+    return True
 
 
 def update_prowlarr_job_progress(job_name, **kwargs):
     """Update Prowlarr job progress information"""
-    with _prowlarr_job_lock:
-        if job_name in _prowlarr_job_progress:
-            _prowlarr_job_progress[job_name].update(kwargs)
+    entry = _prowlarr_job_progress.get(job_name)
+    if entry is not None:
+        entry.update(kwargs)
+        _notify_progress_changed()
 
 
 def release_prowlarr_job_lock(job_name):
     """Release lock for a Prowlarr job"""
     with _prowlarr_job_lock:
         _prowlarr_active_jobs.pop(job_name, None)
-        if job_name in _prowlarr_job_progress:
-            _prowlarr_job_progress[job_name]["end_time"] = datetime.now().isoformat()
+        entry = _prowlarr_job_progress.get(job_name)
+        if entry is not None:
+            entry["end_time"] = datetime.now().isoformat()
+    _notify_progress_changed()
 
 
 def get_prowlarr_job_progress(job_name):
-    """Get current progress for a Prowlarr job"""
-    return _prowlarr_job_progress.get(job_name, {})
+    """Get a snapshot of current progress for a Prowlarr job"""
+    return dict(_prowlarr_job_progress.get(job_name, {}))
 
 
 def prowlarr_search_job(start_date=None, end_date=None, dry_run=False):
@@ -91,7 +121,7 @@ def prowlarr_search_job(start_date=None, end_date=None, dry_run=False):
             dry_run=dry_run,
         )
 
-        config = get_config(strict=True)
+        config = get_config_cached(strict=True)
         if not config:
             raise Exception("Could not load configuration")
 
@@ -107,8 +137,6 @@ def prowlarr_search_job(start_date=None, end_date=None, dry_run=False):
             dry_run=dry_run,
         )
 
-        import os
-
         stash_url = os.environ.get("STASH_URL")
         stash_api_key = os.environ.get("STASH_API_KEY")
 
@@ -117,9 +145,23 @@ def prowlarr_search_job(start_date=None, end_date=None, dry_run=False):
 
         stash_api = StashAPI(url=stash_url, api_key=stash_api_key)
 
-        # Progress callback for the processor
+        # Progress callback for the processor. It fires once per scene, far more
+        # often than the UI polls, so updates are coalesced to the progress
+        # percentage changing or PROGRESS_UPDATE_INTERVAL passing; the last one
+        # always goes through.
+        last_update = [0.0, -1]  # monotonic time, progress
+
         def progress_callback(current, total, message=""):
             progress = 10 + int((current / total) * 80) if total > 0 else 10
+            now = time.monotonic()
+            if (
+                current != total
+                and progress == last_update[1]
+                and now - last_update[0] < PROGRESS_UPDATE_INTERVAL
+            ):
+                return
+            last_update[0] = now
+            last_update[1] = progress
             update_prowlarr_job_progress(
                 job_name,
                 progress=progress,
@@ -189,7 +231,7 @@ def prowlarr_dashboard():
     job_progress = get_prowlarr_job_progress("prowlarr_search")
 
     # Check if Prowlarr is configured
-    config = get_config(strict=False)
+    config = get_config_cached(strict=False)
     prowlarr_config = config.get("prowlarr", {}) if config else {}
 
     prowlarr_enabled = prowlarr_config.get("enabled", False)
@@ -204,6 +246,14 @@ def prowlarr_dashboard():
     )
 
 
+def _parse_iso_date(value):
+    """Parse a strict YYYY-MM-DD string, raising ValueError otherwise"""
+    # date.fromisoformat also accepts forms like "20240101" since Python 3.11
+    if not _ISO_DATE.fullmatch(value):
+        raise ValueError(f"Invalid date: {value!r}")
+    return date.fromisoformat(value)
+
+
 @prowlarr_bp.route("/start", methods=["POST"])
 def start_prowlarr_search():
     """Start a new Prowlarr search job"""
@@ -215,15 +265,15 @@ def start_prowlarr_search():
         # Validation
         if start_date and end_date:
             try:
-                start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-                end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+                start_dt = _parse_iso_date(start_date)
+                end_dt = _parse_iso_date(end_date)
 
                 if start_dt > end_dt:
                     return jsonify(
                         {"success": False, "message": "Start date must be before end date"}
                     )
 
-                if end_dt > datetime.now():
+                if end_dt > date.today():
                     return jsonify(
                         {"success": False, "message": "End date cannot be in the future"}
                     )
@@ -263,10 +313,49 @@ def start_prowlarr_search():
 @prowlarr_bp.route("/progress")
 def prowlarr_search_progress():
     """Get current progress of Prowlarr search"""
+    # Read before the state, so a change in between leaves the ETag behind it
+    etag = f"{_PROGRESS_ETAG_PREFIX}-{_prowlarr_progress_version}"
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
     job_progress = get_prowlarr_job_progress("prowlarr_search")
     is_running = is_prowlarr_job_running("prowlarr_search")
 
-    return jsonify({"is_running": is_running, "progress": job_progress})
+    response = jsonify({"is_running": is_running, "progress": job_progress})
+    response.set_etag(etag)
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+@prowlarr_bp.route("/progress-stream")
+def prowlarr_search_progress_stream():
+    """Server-Sent Events stream of Prowlarr search progress, sent as it changes"""
+
+    def event_stream():
+        version = None
+        while True:
+            with _prowlarr_progress_changed:
+                if _prowlarr_progress_version == version:
+                    _prowlarr_progress_changed.wait(PROGRESS_STREAM_PING_INTERVAL)
+                changed = _prowlarr_progress_version != version
+                version = _prowlarr_progress_version
+
+            if not changed:
+                yield ": ping\n\n"
+                continue
+
+            is_running = is_prowlarr_job_running("prowlarr_search")
+            job_progress = get_prowlarr_job_progress("prowlarr_search")
+            yield f"data: {json.dumps({'is_running': is_running, 'progress': job_progress})}\n\n"
+            if not is_running:
+                return
+
+    response = Response(event_stream(), mimetype="text/event-stream")
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
 
 @prowlarr_bp.route("/cancel")
@@ -286,7 +375,7 @@ def cancel_prowlarr_search():
 def test_prowlarr_connection():
     """Test connection to Prowlarr"""
     try:
-        config = get_config(strict=False)
+        config = get_config_cached(strict=False)
         prowlarr_config = config.get("prowlarr", {}) if config else {}
 
         if not prowlarr_config.get("enabled", False):
@@ -297,14 +386,13 @@ def test_prowlarr_connection():
 
         from src.api.prowlarr_client import ProwlarrClient
 
-        prowlarr_client = ProwlarrClient(prowlarr_config)
-
-        if prowlarr_client.test_connection():
-            indexers = prowlarr_client.get_indexers()
-            message = f"Connected successfully. Found {len(indexers)} enabled torrent indexers."
-            return jsonify({"success": True, "message": message})
-        else:
-            return jsonify({"success": False, "message": "Failed to connect to Prowlarr"})
+        with ProwlarrClient(prowlarr_config) as prowlarr_client:
+            if prowlarr_client.test_connection():
+                indexers = prowlarr_client.get_indexers()
+                message = f"Connected successfully. Found {len(indexers)} enabled torrent indexers."
+                return jsonify({"success": True, "message": message})
+            else:
+                return jsonify({"success": False, "message": "Failed to connect to Prowlarr"})
 
     except Exception as e:
         logger.error(f"Error testing Prowlarr connection: {e}")
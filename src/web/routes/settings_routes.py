@@ -2,10 +2,10 @@ import logging
 
 from flask import Blueprint, flash, jsonify, redirect, render_template, request, url_for
 
-from src.config.config import get_config, set_setting
+from src.config.config import get_config_cached, set_settings
 from src.core.logging_config import reconfigure_logging
 from src.core.utils import set_active_page
-from src.services.rule_sync_manager import RuleSyncManager
+from src.services.rule_sync_manager import get_rule_sync_manager
 
 settings_bp = Blueprint("settings", __name__)
 logger = logging.getLogger(__name__)
@@ -14,7 +14,7 @@ logger = logging.getLogger(__name__)
 @settings_bp.route("/sync-settings", methods=["GET", "POST"])
 def sync_settings():
     set_active_page("sync_settings")
-    sync_manager = RuleSyncManager()
+    sync_manager = get_rule_sync_manager()
 
     if request.method == "POST":
         try:
@@ -45,73 +45,82 @@ def sync_settings():
 @settings_bp.route("/settings", methods=["GET", "POST"])
 def settings():
     set_active_page("settings")
-    config = get_config()
+    config = get_config_cached()
 
     if request.method == "POST":
+        # One plain-dict snapshot of the form for the lookups below
+        form = request.form.to_dict()
         try:
             # Process job enable/disable settings
             jobs_updates = {}
 
             # Handle individual job enables
-            add_new_scenes_enabled = "enable_add_new_scenes" in request.form
-            clean_existing_scenes_enabled = "enable_clean_existing_scenes" in request.form
-            identify_enabled = "enable_identify" in request.form
-            generate_metadata_enabled = "enable_generate_metadata" in request.form
+            add_new_scenes_enabled = "enable_add_new_scenes" in form
+            clean_existing_scenes_enabled = "enable_clean_existing_scenes" in form
+            identify_enabled = "enable_identify" in form
+            generate_metadata_enabled = "enable_generate_metadata" in form
 
             # Update job configurations
             jobs_updates["add_new_scenes"] = {
                 "enabled": add_new_scenes_enabled,
-                "schedule": request.form.get("add_new_scenes_schedule", "daily"),
-                "search_back_days": int(request.form.get("add_new_scenes_search_back_days", 7)),
+                "schedule": form.get("add_new_scenes_schedule", "daily"),
+                "search_back_days": int(form.get("add_new_scenes_search_back_days", 7)),
             }
 
             jobs_updates["clean_existing_scenes"] = {
                 "enabled": clean_existing_scenes_enabled,
-                "schedule": request.form.get("clean_existing_scenes_schedule", "daily"),
+                "schedule": form.get("clean_existing_scenes_schedule", "daily"),
             }
 
             jobs_updates["scan_and_identify"] = {
                 "enabled": identify_enabled,
-                "schedule": request.form.get("scan_and_identify_schedule", "daily"),
+                "schedule": form.get("scan_and_identify_schedule", "daily"),
             }
 
             jobs_updates["generate_metadata"] = {
                 "enabled": generate_metadata_enabled,
-                "schedule": request.form.get("generate_metadata_schedule", "daily"),
+                "schedule": form.get("generate_metadata_schedule", "daily"),
             }
 
             # Handle identification sources
             identify_sources = []
-            if "identify_source_stashdb" in request.form:
+            if "identify_source_stashdb" in form:
                 identify_sources.append("stashdb")
-            if "identify_source_tpdb" in request.form:
+            if "identify_source_tpdb" in form:
                 identify_sources.append("tpdb")
 
             # Update general settings
-            general_updates = {"dry_run": "dry_run" in request.form}
+            general_updates = {"dry_run": "dry_run" in form}
 
             # Update logs settings
-            logs_updates = {"level": request.form.get("log_level", "INFO")}
+            logs_updates = {"level": form.get("log_level", "INFO")}
 
             # Update identify settings
             identify_updates = {"sources": identify_sources}
 
-            # Apply all updates
-            for key, value in jobs_updates.items():
-                set_setting("jobs", key, value)
-
-            for key, value in general_updates.items():
-                set_setting("general", key, value)
-
-            for key, value in logs_updates.items():
-                set_setting("logs", key, value)
-
-            for key, value in identify_updates.items():
-                set_setting("identify", key, value)
+            # Apply the updates that change something, in one write
+            saved = config or {}
+            changed = {}
+            for section, updates in (
+                ("jobs", jobs_updates),
+                ("general", general_updates),
+                ("logs", logs_updates),
+                ("identify", identify_updates),
+            ):
+                saved_section = saved.get(section, {})
+                section_changes = {
+                    key: value
+                    for key, value in updates.items()
+                    if key not in saved_section or saved_section[key] != value
+                }
+                if section_changes:
+                    changed[section] = section_changes
+            set_settings(changed)
 
             # Reconfigure logging if level changed
-            if "level" in logs_updates:
-                reconfigure_logging(logs_updates["level"])
+            log_level = logs_updates["level"].upper()
+            if logging.getLevelName(logging.getLogger().level) != log_level:
+                reconfigure_logging(log_level)
 
             flash("Settings updated successfully!", "success")
             logger.info("Settings updated successfully")
@@ -129,7 +138,7 @@ def settings():
 def check_sync_status():
     """Check if sync is enabled and return status"""
     try:
-        sync_manager = RuleSyncManager()
+        sync_manager = get_rule_sync_manager()
         in_sync, reason = sync_manager.are_rules_in_sync()
 
         return jsonify(
@@ -168,7 +177,7 @@ def manual_sync():
 
         source_rules = get_filter_rules(source_context)
 
-        sync_manager = RuleSyncManager()
+        sync_manager = get_rule_sync_manager()
 
         # Perform the sync
         sync_manager.sync_rules(source_context, source_rules)
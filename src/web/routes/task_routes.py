@@ -1,28 +1,110 @@
 import logging
-import threading
-from zoneinfo import ZoneInfo
+import os
+import time
 
-from flask import Blueprint, jsonify, render_template, request
+from flask import Blueprint, jsonify, render_template, request, session
 
 from src.api.stash_api import StashAPI
-from src.config.config import get_config
+from src.config.config import get_config_cached, get_database, typed_config
 from src.core.scheduler import scheduler
 from src.core.utils import set_active_page
 from src.core.validation import ValidationError, validate_job_parameters
 from src.core.database_manager import DatabaseManager
+from src.web.executor import get_job_status, submit_job
 from src.web.one_time_search import is_one_time_search_running
-from src.web.processor import add_new_scenes_to_whisparr, generate_metadata
+from src.web.processor import (
+    add_new_scenes_to_whisparr,
+    clean_existing_scenes_from_stash,
+    generate_metadata_bulk,
+    get_stashdb_api,
+)
 
 task_bp = Blueprint("tasks", __name__)
 
 logger = logging.getLogger(__name__)
 
+# Seconds a rendered tasks page is reused for polls while nothing it shows changed
+TASKS_PAGE_TTL = 3.0
+
+# (expires at, cache key, page)
+_tasks_page_cache = (0.0, None, "")
+
+
+def _invalidate_tasks_page():
+    global _tasks_page_cache
+    _tasks_page_cache = (0.0, None, "")
+
+
+# Attempts at reading the scheduler before falling back to the last good read
+SCHEDULER_READ_ATTEMPTS = 3
+
+_last_jobs_by_tag = {}
+
+
+def _jobs_by_tag():
+    """The first (and should be only) scheduled job per tag, from one scheduler pass
+
+    A failed read is retried with a short back-off; if every attempt fails the
+    last successful read is used, so the page still renders.
+    """
+    global _last_jobs_by_tag
+    for attempt in range(SCHEDULER_READ_ATTEMPTS):
+        try:
+            jobs_by_tag = {}
+            for scheduled_job in scheduler.get_jobs():
+                for tag in scheduled_job.tags:
+                    jobs_by_tag.setdefault(tag, scheduled_job)
+        except Exception as e:
+            logger.warning(f"Reading scheduled jobs failed (attempt {attempt + 1}): {e}")
+            if attempt < SCHEDULER_READ_ATTEMPTS - 1:
+                time.sleep(0.05 * 2**attempt)
+            continue
+        _last_jobs_by_tag = jobs_by_tag
+        return jobs_by_tag
+    return _last_jobs_by_tag
+
+
+# job tag -> ((last run, next run, timezone), (formatted last run, formatted next run))
+_formatted_run_times = {}
+
+
+def _format_run_times(tag, job, timezone):
+    """A job's last and next run times as display strings
+
+    schedule has no job listeners, so the strings are reformatted only when the
+    job's run times or the timezone differ from those they were formatted from.
+    """
+    state = (job.last_run, job.next_run, timezone)
+    cached = _formatted_run_times.get(tag)
+    if cached is not None and cached[0] == state:
+        return cached[1]
+
+    last_run = job.last_run.astimezone(timezone) if job.last_run else None
+    next_run = job.next_run.astimezone(timezone) if job.next_run else None
+    formatted = (
+        last_run.strftime("%Y-%m-%d %H:%M:%S") if last_run else "N/A",
+        next_run.strftime("%Y-%m-%d %H:%M:%S") if next_run else "Not Scheduled",
+    )
+    # A single dict assignment, so concurrent requests at worst format twice
+    _formatted_run_times[tag] = (state, formatted)
+    return formatted
+
 
 @task_bp.route("/tasks")
 def tasks():
     set_active_page("tasks")
 
-    config = get_config()
+    global _tasks_page_cache
+    search_running = is_one_time_search_running()
+    page_key = (get_database().config_version, search_running)
+    # Pending flash messages are rendered into the page, so it is neither served
+    # from nor stored in the cache
+    has_flashes = "_flashes" in session
+    expires, cached_key, page = _tasks_page_cache
+    if not has_flashes and cached_key == page_key and time.monotonic() < expires:
+        return page
+
+    config = get_config_cached()
 
     job_keys = {
         "add_new_scenes": "add_new_scenes_to_whisparr",
@@ -34,50 +116,36 @@ def tasks():
     last_run_times = {}
     next_run_times = {}
 
+    timezone = typed_config().timezone
+    jobs_by_tag = _jobs_by_tag()
+
     for key, job_name in job_keys.items():
-        jobs = scheduler.get_jobs(job_name)
-        if jobs:
-            job = jobs[0]  # Get the first (and should be only) job with this tag
-            last_run = (
-                job.last_run.astimezone(
-                    ZoneInfo(config.get("main", {}).get("timezone", "UTC"))
-                )
-                if job.last_run
-                else None
-            )
-            next_run = (
-                job.next_run.astimezone(
-                    ZoneInfo(config.get("main", {}).get("timezone", "UTC"))
-                )
-                if job.next_run
-                else None
-            )
-            last_run_times[key] = (
-                last_run.strftime("%Y-%m-%d %H:%M:%S") if last_run else "N/A"
-            )
-            next_run_times[key] = (
-                next_run.strftime("%Y-%m-%d %H:%M:%S")
-                if next_run
-                else "Not Scheduled"
+        job = jobs_by_tag.get(job_name)
+        if job:
+            last_run_times[key], next_run_times[key] = _format_run_times(
+                job_name, job, timezone
             )
         else:
             last_run_times[key] = "N/A"
             next_run_times[key] = "Not Scheduled"
 
-    return render_template(
+    page = render_template(
         "tasks.html",
         config=config,
         last_run_times=last_run_times,
         next_run_times=next_run_times,
-        is_one_time_search_running=is_one_time_search_running(),
+        is_one_time_search_running=search_running,
     )
+    if not has_flashes:
+        _tasks_page_cache = (time.monotonic() + TASKS_PAGE_TTL, page_key, page)
+    return page
 
 
 @task_bp.route("/run_job/<job_name>")
 def run_job(job_name):
     """Run a specific job manually"""
     try:
-        config = get_config()
+        config = get_config_cached()
 
         if job_name == "add_new_scenes_to_whisparr":
             # Validate parameters from query string
@@ -101,40 +169,42 @@ def run_job(job_name):
             sort_direction = validated_params["sort_direction"]
 
             # Setup APIs
-            import os
-
             stashdb_api_key = os.environ.get("STASHDB_API_KEY")
             if not stashdb_api_key:
                 return jsonify(
                     {"success": False, "message": "StashDB API key not configured"}
                 )
 
-            stashdb_api = StashAPI(url="https://stashdb.org", api_key=stashdb_api_key)
-
-            # Run the job in a background thread
-            thread = threading.Thread(
-                target=add_new_scenes_to_whisparr,
-                args=(config, stashdb_api),
-                kwargs={
-                    "start_date": start_date,
-                    "end_date": end_date,
-                    "dry_run": dry_run,
-                    "sort_direction": sort_direction,
-                },
+            stashdb_api = get_stashdb_api(stashdb_api_key)
+
+            # Run the job on the background job pool
+            job_id, submitted = submit_job(
+                job_name,
+                add_new_scenes_to_whisparr,
+                config,
+                stashdb_api,
+                start_date=start_date,
+                end_date=end_date,
+                dry_run=dry_run,
+                sort_direction=sort_direction,
             )
-            thread.start()
+            if not submitted:
+                return _already_running(job_id)
+            _invalidate_tasks_page()
 
             return jsonify(
                 {
                     "success": True,
+                    "job_id": job_id,
                     "message": "Job started. Scenes will be added to Whisparr in the background.",
                 }
             )
 
         elif job_name == "clean_existing_scenes":
             # Setup local Stash API
-            local_stash_url = config.get("stash", {}).get("url")
-            local_stash_api_key = config.get("stash", {}).get("api_key")
+            settings = typed_config()
+            local_stash_url = settings.stash_url
+            local_stash_api_key = settings.stash_api_key
 
             if not local_stash_url or not local_stash_api_key:
                 return jsonify(
@@ -145,18 +215,18 @@ def run_job(job_name):
                 url=local_stash_url, api_key=local_stash_api_key
             )
 
-            # Run the job in a background thread
-            from src.web.processor import clean_existing_scenes_from_stash
-
-            thread = threading.Thread(
-                target=clean_existing_scenes_from_stash,
-                args=(config, local_stash_api),
+            # Run the job on the background job pool
+            job_id, submitted = submit_job(
+                job_name, clean_existing_scenes_from_stash, config, local_stash_api
             )
-            thread.start()
+            if not submitted:
+                return _already_running(job_id)
+            _invalidate_tasks_page()
 
             return jsonify(
                 {
                     "success": True,
+                    "job_id": job_id,
                     "message": "Job started. Scenes will be cleaned from Stash in the background.",
                 }
             )
@@ -172,18 +242,41 @@ def run_job(job_name):
         elif job_name == "generate_metadata":
             # Get pending metadata tasks
             db = DatabaseManager()
-            tasks = db.get_pending_tasks("generate_metadata")
+            queued = db.count_pending_tasks("generate_metadata")
+            if not queued:
+                return jsonify(
+                    {"success": True, "queued": 0, "message": "No pending metadata tasks."}
+                )
+
+            settings = typed_config()
+            local_stash_url = settings.stash_url
+            local_stash_api_key = settings.stash_api_key
+            if not local_stash_url or not local_stash_api_key:
+                return jsonify(
+                    {"success": False, "message": "Local Stash configuration missing"}
+                )
+
+            local_stash_api = StashAPI(
+                url=local_stash_url, api_key=local_stash_api_key
+            )
 
-            scenes_processed = 0
-            for task in tasks:
-                if task["type"] == "generate_metadata":
-                    generate_metadata(config, task["scene_id"])
-                    scenes_processed += 1
+            # Generate on the background job pool rather than in this request
+            job_id, submitted = submit_job(
+                job_name, _run_metadata_batch, config, local_stash_api
+            )
+            if not submitted:
+                return _already_running(job_id)
+            _invalidate_tasks_page()
 
             return jsonify(
                 {
                     "success": True,
-                    "message": f"Generated metadata for {scenes_processed} scenes.",
+                    "job_id": job_id,
+                    "queued": queued,
+                    "message": (
+                        f"Generating metadata for {queued} scenes "
+                        "in the background."
+                    ),
                 }
             )
 
@@ -193,3 +286,40 @@ def run_job(job_name):
     except Exception as e:
         logger.error(f"Error running job {job_name}: {e}", exc_info=True)
         return jsonify({"success": False, "message": f"Job failed: {str(e)}"})
+
+
+def _run_metadata_batch(config, stash_api):
+    """Generate metadata for the pending tasks' scenes and mark the finished tasks done
+
+    Tasks are read and marked a chunk at a time, so memory does not grow with the
+    backlog.
+    """
+    db = DatabaseManager()
+    for tasks in db.iter_pending_tasks("generate_metadata"):
+        generated = set(
+            generate_metadata_bulk(
+                config, stash_api, [task["scene_id"] for task in tasks]
+            )
+        )
+        db.mark_tasks_done(
+            [task["id"] for task in tasks if task["scene_id"] in generated]
+        )
+
+
+def _already_running(job_id):
+    return jsonify(
+        {
+            "success": False,
+            "job_id": job_id,
+            "message": "This job is already queued or running.",
+        }
+    )
+
+
+@task_bp.route("/job_status/<job_id>")
+def job_status(job_id):
+    """Status of a job started from run_job"""
+    status = get_job_status(job_id)
+    if status is None:
+        return jsonify({"success": False, "message": f"Unknown job: {job_id}"}), 404
+    return jsonify({"success": True, **status})
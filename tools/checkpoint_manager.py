@@ -4,13 +4,19 @@ Checkpoint Manager - Save and restore code states
 Manages git stash-based checkpoints for easy rollback
 """
 
+import os
 import subprocess
 import sys
+import tempfile
 from datetime import datetime
 from pathlib import Path
 from typing import List, Optional
 
 
+class CheckpointError(Exception):
+    """A checkpoint operation failed."""
+
+
 class CheckpointManager:
     """Manages code checkpoints using git stash."""
 
@@ -27,9 +33,8 @@ class CheckpointManager:
                 check=True,
                 capture_output=True,
             )
-        except subprocess.CalledProcessError:
-            print("Error: Not in a git repository", file=sys.stderr)
-            sys.exit(1)
+        except subprocess.CalledProcessError as e:
+            raise CheckpointError("Error: Not in a git repository") from e
 
     def create(self, message: Optional[str] = None) -> str:
         """Create a new checkpoint."""
@@ -39,51 +44,98 @@ class CheckpointManager:
             checkpoint_msg += f" - {message}"
 
         try:
-            # Stash all changes including untracked files
-            result = subprocess.run(
-                ["git", "stash", "push", "-u", "-m", checkpoint_msg],
-                check=True,
-                capture_output=True,
-                text=True,
-            )
+            # Write the stash commits without touching HEAD, the index or the
+            # working tree, so nothing has to be re-applied afterwards
+            stash_sha = self._git("stash", "create", checkpoint_msg).strip()
+            untracked = self._git("ls-files", "--others", "--exclude-standard", "-z")
+            if untracked:
+                stash_sha = self._add_untracked(
+                    stash_sha, untracked.split("\0")[:-1], checkpoint_msg
+                )
 
-            print(f"✅ Checkpoint created: {checkpoint_msg}")
+            if not stash_sha:
+                print("Nothing to checkpoint")
+                return ""
 
-            # Immediately pop to restore working state
-            subprocess.run(
-                ["git", "stash", "apply", "stash@{0}"],
-                check=True,
-                capture_output=True,
-            )
+            self._git("stash", "store", "-m", checkpoint_msg, stash_sha)
+
+            print(f"✅ Checkpoint created: {checkpoint_msg}")
 
             return checkpoint_msg
 
         except subprocess.CalledProcessError as e:
-            print(f"Error creating checkpoint: {e.stderr}", file=sys.stderr)
-            sys.exit(1)
+            raise CheckpointError(f"Error creating checkpoint: {e.stderr}") from e
+
+    def _git(self, *args: str, **kwargs) -> str:
+        """Run a git command, returning its stdout."""
+        result = subprocess.run(
+            ["git", *args], check=True, capture_output=True, text=True, **kwargs
+        )
+        return result.stdout
+
+    def _add_untracked(self, stash_sha: str, paths: List[str], message: str) -> str:
+        """Stash commit with untracked paths as its third parent, like push -u."""
+        # Stage the untracked files into a scratch index, leaving the real one alone
+        with tempfile.TemporaryDirectory() as scratch:
+            env = {**os.environ, "GIT_INDEX_FILE": str(Path(scratch) / "index")}
+            self._git(
+                "update-index",
+                "--add",
+                "-z",
+                "--stdin",
+                input="".join(f"{path}\0" for path in paths),
+                env=env,
+            )
+            untracked_tree = self._git("write-tree", env=env).strip()
+        untracked_commit = self._git(
+            "commit-tree", untracked_tree, "-m", f"untracked files: {message}"
+        ).strip()
+
+        if stash_sha:
+            tree, head, index = (
+                f"{stash_sha}^{{tree}}",
+                f"{stash_sha}^1",
+                f"{stash_sha}^2",
+            )
+        else:
+            # No tracked changes: the working tree and index both match HEAD
+            tree, head = "HEAD^{tree}", "HEAD"
+            index = self._git(
+                "commit-tree", tree, "-p", head, "-m", f"index: {message}"
+            ).strip()
+
+        return self._git(
+            "commit-tree",
+            tree,
+            "-p",
+            head,
+            "-p",
+            index,
+            "-p",
+            untracked_commit,
+            "-m",
+            message,
+        ).strip()
 
     def list(self) -> List[dict]:
         """List all checkpoints."""
         try:
+            # One NUL-separated "ref, subject" pair per line
             result = subprocess.run(
-                ["git", "stash", "list"],
+                ["git", "stash", "list", "--format=%gd%x00%gs"],
                 check=True,
                 capture_output=True,
                 text=True,
             )
 
             checkpoints = []
-            for line in result.stdout.strip().split("\n"):
-                if not line:
-                    continue
-
-                if self.prefix in line:
-                    # Parse: stash@{0}: On branch: claude-checkpoint: 2025-10-01_...
-                    parts = line.split(": ", 2)
-                    if len(parts) >= 3:
-                        stash_ref = parts[0]
-                        message = parts[2]
-                        checkpoints.append({"ref": stash_ref, "message": message})
+            for line in result.stdout.splitlines():
+                stash_ref, _, subject = line.partition("\0")
+                # Subject: claude-checkpoint: 2025-10-01_..., or for checkpoints
+                # made with stash push, On branch: claude-checkpoint: 2025-10-01_...
+                start = subject.find(self.prefix)
+                if start != -1:
+                    checkpoints.append({"ref": stash_ref, "message": subject[start:]})
 
             return checkpoints
 
@@ -106,8 +158,7 @@ class CheckpointManager:
             print(f"✅ Checkpoint restored: {stash_ref}")
 
         except subprocess.CalledProcessError as e:
-            print(f"Error restoring checkpoint: {e}", file=sys.stderr)
-            sys.exit(1)
+            raise CheckpointError(f"Error restoring checkpoint: {e}") from e
 
     def delete(self, stash_ref: str) -> None:
         """Delete a specific checkpoint."""
@@ -116,13 +167,13 @@ class CheckpointManager:
                 ["git", "stash", "drop", stash_ref],
                 check=True,
                 capture_output=True,
+                text=True,
             )
 
             print(f"✅ Checkpoint deleted: {stash_ref}")
 
         except subprocess.CalledProcessError as e:
-            print(f"Error deleting checkpoint: {e.stderr}", file=sys.stderr)
-            sys.exit(1)
+            raise CheckpointError(f"Error deleting checkpoint: {e.stderr}") from e
 
     def clean(self, keep_latest: int = 5) -> None:
         """Clean old checkpoints, keeping only the latest N."""
@@ -136,8 +187,26 @@ class CheckpointManager:
 
         print(f"Deleting {len(to_delete)} old checkpoints...")
 
-        for checkpoint in to_delete:
-            self.delete(checkpoint["ref"])
+        # What git stash drop runs, for every ref in one process. Each deletion
+        # renumbers the entries above it, so the oldest go first.
+        refs = sorted(
+            (checkpoint["ref"] for checkpoint in to_delete),
+            key=lambda ref: int(ref[len("stash@{") : -1]),
+            reverse=True,
+        )
+        try:
+            subprocess.run(
+                ["git", "reflog", "delete", "--updateref", "--rewrite"]
+                + [f"refs/{ref}" for ref in refs],
+                check=True,
+                capture_output=True,
+                text=True,
+            )
+        except subprocess.CalledProcessError as e:
+            raise CheckpointError(f"Error deleting checkpoints: {e.stderr}") from e
+
+        for ref in refs:
+            print(f"✅ Checkpoint deleted: {ref}")
 
         print(f"✅ Kept {keep_latest} latest checkpoints")
 
@@ -182,24 +251,28 @@ def main() -> None:
         parser.print_help()
         sys.exit(1)
 
-    manager = CheckpointManager()
-
-    if args.command == "create":
-        manager.create(args.message)
-    elif args.command == "list":
-        checkpoints = manager.list()
-        if not checkpoints:
-            print("No checkpoints found")
-        else:
-            print("\nCheckpoints:")
-            for cp in checkpoints:
-                print(f"  {cp['ref']}: {cp['message']}")
-    elif args.command == "restore":
-        manager.restore(args.ref)
-    elif args.command == "delete":
-        manager.delete(args.ref)
-    elif args.command == "clean":
-        manager.clean(args.keep)
+    try:
+        manager = CheckpointManager()
+
+        if args.command == "create":
+            manager.create(args.message)
+        elif args.command == "list":
+            checkpoints = manager.list()
+            if not checkpoints:
+                print("No checkpoints found")
+            else:
+                print("\nCheckpoints:")
+                for cp in checkpoints:
+                    print(f"  {cp['ref']}: {cp['message']}")
+        elif args.command == "restore":
+            manager.restore(args.ref)
+        elif args.command == "delete":
+            manager.delete(args.ref)
+        elif args.command == "clean":
+            manager.clean(args.keep)
+    except CheckpointError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
 
 
 if __name__ == "__main__":
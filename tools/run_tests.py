@@ -6,9 +6,29 @@ Runs Ruff, mypy, and pytest to ensure code quality.
 
 import subprocess
 import sys
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from importlib.metadata import PackageNotFoundError, version
 from pathlib import Path
-from typing import Any
+
+# Output lines kept per validator for the detailed results
+MAX_OUTPUT_LINES = 2000
+VALIDATOR_TIMEOUT = 120
+
+
+@dataclass(slots=True)
+class ValidatorResult:
+    """Outcome of one validator run."""
+
+    description: str
+    passed: bool
+    stdout: str
+    stderr: str
+    duration: float
+    blocking: bool
 
 
 class ValidationTestRunner:
@@ -18,7 +38,7 @@ class ValidationTestRunner:
         """Initialize the test runner."""
         self.project_dir = Path(project_dir).resolve()
         self.venv_dir = self.project_dir / "venv"
-        self.results: dict[str, dict[str, Any]] = {}
+        self.results: list[ValidatorResult] = []
 
     def get_python_executable(self) -> str:
         """Get the Python executable from venv if available."""
@@ -28,44 +48,88 @@ class ValidationTestRunner:
         return sys.executable
 
     def run_validator(
-        self, command: list[str], description: str
+        self, command: list[str], description: str, verbose: bool = False
     ) -> tuple[bool, str, str, float]:
-        """Run a single validator command."""
+        """Run a single validator command.
+
+        Output (stderr merged into stdout) is read line by line, echoed live when
+        verbose, and only its last MAX_OUTPUT_LINES lines are kept.
+        """
         start_time = time.time()
         try:
-            result = subprocess.run(
-                command, capture_output=True, text=True, timeout=120, cwd=self.project_dir
+            process = subprocess.Popen(
+                command,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                cwd=self.project_dir,
             )
+        except Exception as e:
             end_time = time.time()
             duration = end_time - start_time
+            return (False, "", f"Failed to run validator: {e}", duration)
 
-            return (
-                result.returncode == 0,
-                result.stdout,
-                result.stderr,
-                duration,
-            )
+        timed_out = threading.Event()
 
-        except subprocess.TimeoutExpired:
-            end_time = time.time()
-            duration = end_time - start_time
+        def kill() -> None:
+            timed_out.set()
+            process.kill()
+
+        # Reading blocks until the process exits, so the timeout has to kill it
+        timer = threading.Timer(VALIDATOR_TIMEOUT, kill)
+        timer.start()
+        tail: deque[str] = deque(maxlen=MAX_OUTPUT_LINES)
+        try:
+            assert process.stdout is not None
+            for line in process.stdout:
+                tail.append(line)
+                if verbose:
+                    sys.stdout.write(line)
+            returncode = process.wait()
+        finally:
+            timer.cancel()
+        end_time = time.time()
+        duration = end_time - start_time
+
+        if timed_out.is_set():
             return (
                 False,
-                "",
-                "Validator timed out after 120 seconds",
+                "".join(tail),
+                f"Validator timed out after {VALIDATOR_TIMEOUT} seconds",
                 duration,
             )
 
-        except Exception as e:
-            end_time = time.time()
-            duration = end_time - start_time
-            return (False, "", f"Failed to run validator: {e}", duration)
+        return (returncode == 0, "".join(tail), "", duration)
+
+    def record_result(
+        self, description: str, blocking: bool, outcome: tuple[bool, str, str, float]
+    ) -> bool:
+        """Store and print one validator's outcome; False if a blocking one failed."""
+        passed, stdout, stderr, duration = outcome
+        self.results.append(
+            ValidatorResult(description, passed, stdout, stderr, duration, blocking)
+        )
+
+        print(f"{description}:")
+        if passed:
+            print(f"  ✅ PASSED ({duration:.2f}s)")
+        elif blocking:
+            print(f"  ❌ FAILED ({duration:.2f}s)")
+        else:
+            print(f"  ⚠️  FAILED (non-blocking - {duration:.2f}s)")
+        print()
+
+        return passed or not blocking
 
     def run_all_tests(self) -> bool:
-        """Run all validation tests."""
+        """Run all validation tests.
+
+        The read-only analyses run concurrently; pytest runs after them on its own.
+        """
         python_exe = self.get_python_executable()
 
-        validators = [
+        concurrent_validators = [
             (
                 [python_exe, "-m", "ruff", "check", "."],
                 "Ruff Linting",
@@ -81,72 +145,69 @@ class ValidationTestRunner:
                 "Mypy Type Checking",
                 False,
             ),  # non-blocking
-            (
-                [python_exe, "-m", "pytest"],
-                "Pytest Test Suite",
-                True,
-            ),  # blocking
         ]
+        # May write caches and import project modules, so it runs alone
+        pytest_validator = (
+            [python_exe, "-m", "pytest"],
+            "Pytest Test Suite",
+            True,
+        )  # blocking
 
         all_passed = True
-        total_duration = 0.0
+        start_time = time.time()
 
         print("🔍 Running Python Code Quality Validation")
         print("=" * 60)
         print()
 
-        for command, description, blocking in validators:
-            print(f"Running {description}...")
-
-            passed, stdout, stderr, duration = self.run_validator(command, description)
-            total_duration += duration
-
-            self.results[description] = {
-                "description": description,
-                "passed": passed,
-                "stdout": stdout,
-                "stderr": stderr,
-                "duration": duration,
-                "blocking": blocking,
-            }
-
-            if passed:
-                print(f"  ✅ PASSED ({duration:.2f}s)")
-            else:
-                if blocking:
-                    print(f"  ❌ FAILED ({duration:.2f}s)")
-                    all_passed = False
-                else:
-                    print(f"  ⚠️  FAILED (non-blocking - {duration:.2f}s)")
-
-            print()
+        print(f"Running {', '.join(v[1] for v in concurrent_validators)}...")
+        print()
+        with ThreadPoolExecutor(max_workers=len(concurrent_validators)) as executor:
+            outcomes = list(
+                executor.map(
+                    lambda v: self.run_validator(v[0], v[1]), concurrent_validators
+                )
+            )
+        # Reported in list order, whichever finished first
+        for (_, description, blocking), outcome in zip(
+            concurrent_validators, outcomes, strict=True
+        ):
+            if not self.record_result(description, blocking, outcome):
+                all_passed = False
+
+        command, description, blocking = pytest_validator
+        print(f"Running {description}...")
+        print()
+        outcome = self.run_validator(command, description, verbose=True)
+        if not self.record_result(description, blocking, outcome):
+            all_passed = False
 
-        print(f"Total execution time: {total_duration:.2f}s")
+        print(f"Total execution time: {time.time() - start_time:.2f}s")
         print("=" * 60)
 
         return all_passed
 
     def print_detailed_results(self) -> None:
         """Print detailed results for each validator."""
-        for result in self.results.values():
-            print(f"\n📋 {result['description']}")
+        for result in self.results:
+            print(f"\n📋 {result.description}")
             print("-" * 50)
 
-            if result["passed"]:
+            if result.passed:
                 print("Status: ✅ PASSED")
             else:
                 print("Status: ❌ FAILED")
 
-            print(f"Duration: {result['duration']:.2f}s")
+            print(f"Duration: {result.duration:.2f}s")
 
-            if result["stdout"].strip():
+            if result.stdout.strip():
                 print("\nOutput:")
-                for line in result["stdout"].strip().split("\n"):
+                for line in result.stdout.strip().split("\n"):
                     print(f"  {line}")
 
-            if result["stderr"].strip():
+            if result.stderr.strip():
                 print("\nErrors:")
-                for line in result["stderr"].strip().split("\n"):
+                for line in result.stderr.strip().split("\n"):
                     print(f"  {line}")
 
             print()
@@ -154,7 +215,7 @@ class ValidationTestRunner:
     def print_summary(self) -> None:
         """Print test summary."""
         total_tests = len(self.results)
-        passed_tests = sum(1 for r in self.results.values() if r["passed"])
+        passed_tests = sum(1 for r in self.results if r.passed)
         failed_tests = total_tests - passed_tests
 
         print("\n📊 TEST SUMMARY")
@@ -179,17 +240,33 @@ class ValidationTestRunner:
         required_modules = ["ruff", "mypy", "pytest"]
         missing_modules = []
 
-        for module in required_modules:
+        if python_exe == sys.executable:
+            # Installed distributions are readable in-process
+            for module in required_modules:
+                try:
+                    version(module)
+                except PackageNotFoundError:
+                    missing_modules.append(module)
+        else:
+            # The project venv's interpreter: one probe reports every missing module
+            probe = (
+                "import importlib.util, sys; "
+                "print(' '.join(m for m in sys.argv[1:] "
+                "if importlib.util.find_spec(m) is None))"
+            )
             try:
                 result = subprocess.run(
-                    [python_exe, "-m", module, "--version"],
+                    [python_exe, "-c", probe, *required_modules],
                     capture_output=True,
+                    text=True,
                     timeout=10,
                 )
-                if result.returncode != 0:
-                    missing_modules.append(module)
+                if result.returncode == 0:
+                    missing_modules = result.stdout.split()
+                else:
+                    missing_modules = required_modules
             except Exception:
-                missing_modules.append(module)
+                missing_modules = required_modules
 
         if missing_modules:
             modules_str = ", ".join(missing_modules)
@@ -4,20 +4,226 @@ Session Tracker - Track Claude Code sessions and changes
 Records what files were modified, decisions made, and changes implemented
 """
 
+import atexit
+import gc
 import json
+import mmap
+import os
 import sys
+import time
+import weakref
+from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+# Optional dependency: orjson, when installed, encodes and parses the JSONL lines
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Update records appended before the file is rewritten as one line per session
+COMPACT_AFTER_UPDATES = 500
+APPEND_BUFFER_SIZE = 65536
+# First window list_sessions reads from the end of the file; doubled until it
+# holds enough sessions
+TAIL_READ_SIZE = 64 * 1024
+# Files at least this large are loaded with the cyclic garbage collector paused
+LARGE_LOG_SIZE = 1024 * 1024
+
+# Trackers whose append handles a forked child must not share
+_trackers: "weakref.WeakSet[SessionTracker]" = weakref.WeakSet()
+
+
+def _drop_append_handles() -> None:
+    """In a forked child, make each tracker open its own append handle."""
+    for tracker in _trackers:
+        tracker._fh = None
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_append_handles)
+
+
+def _encode(record: Dict[str, Any]) -> bytes:
+    """One JSONL line, without the newline."""
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record).encode()
+
+
+# Both accept the raw bytes of a line
+_decode = orjson.loads if orjson is not None else json.loads
+
+
+def _mapped_records(mm: mmap.mmap) -> Iterator[Dict[str, Any]]:
+    """The records of a mapped JSONL file, skipping blank and whitespace-only lines.
+
+    Lines are sliced straight out of the mapping instead of going through the
+    buffered file iterator.
+    """
+    pos = 0
+    end = len(mm)
+    while pos < end:
+        newline = mm.find(b"\n", pos)
+        if newline < 0:
+            newline = end  # Last line without a newline
+        if newline > pos:
+            line = mm[pos:newline]
+            # Records start with "{"; only lines starting with whitespace need
+            # the copy strip makes to tell whether they are blank
+            if line[0] > 0x20 or line.strip():
+                yield _decode(line)
+        pos = newline + 1
+
+
+# (epoch second, its local time formatted to the second) for _now_iso
+_second_prefix = (-1, "")
+
+
+def _now_iso() -> str:
+    """The local time like datetime.now().isoformat(), always with microseconds.
+
+    The date and time up to the second are formatted once per second; each call
+    only appends the microseconds.
+    """
+    global _second_prefix
+    second, nanos = divmod(time.time_ns(), 1_000_000_000)
+    if _second_prefix[0] != second:
+        formatted = datetime.fromtimestamp(second).strftime("%Y-%m-%dT%H:%M:%S")
+        _second_prefix = (second, formatted)
+    return f"{_second_prefix[1]}.{nanos // 1000:06d}"
+
+
+@dataclass
+class _SessionLog:
+    """Sessions folded from the JSONL event log.
+
+    A line without a "type" is a full session snapshot (the original format, and
+    what compact writes); session_end, file_add and decision_add lines update
+    the session named by their session_id.
+    """
+
+    key: Optional[Tuple[int, int]]
+    sessions: List[Dict[str, Any]]
+    by_id: Dict[str, Dict[str, Any]]
+    updates: int = 0
+    # Encoded line per session, keyed by id() of the session dict, so compact
+    # only re-encodes sessions updated since they were last written
+    encoded: Dict[int, bytes] = field(default_factory=dict)
+
+    def apply(self, record: Dict[str, Any]) -> None:
+        """Fold one record into the sessions."""
+        kind = record.get("type")
+        if kind is None:
+            self.sessions.append(record)
+            # Sessions started within the same second share an id; like the
+            # list scans this index replaced, resolve it to the first
+            self.by_id.setdefault(record["session_id"], record)
+            return
+
+        self.updates += 1
+        session = self.by_id.get(record["session_id"])
+        if session is None:
+            return
+        self.encoded.pop(id(session), None)
+        entry = {k: v for k, v in record.items() if k not in ("type", "session_id")}
+        if kind == "session_end":
+            session["status"] = "completed"
+            session.update(entry)
+        elif kind == "file_add":
+            session["files_modified"].append(entry)
+        elif kind == "decision_add":
+            session["decisions"].append(entry)
+
+    def fold(self, records: Iterable[Dict[str, Any]]) -> None:
+        """Fold many records, as apply would one at a time.
+
+        The loop behind a full load, so it keeps its lookups in locals and
+        handles the common snapshot and list-append records inline.
+        """
+        append_session = self.sessions.append
+        setdefault = self.by_id.setdefault
+        find = self.by_id.get
+        forget = self.encoded.pop
+        lists = {"file_add": "files_modified", "decision_add": "decisions"}
+        updates = 0
+        for record in records:
+            kind = record.get("type")
+            if kind is None:
+                append_session(record)
+                setdefault(record["session_id"], record)
+                continue
+            updates += 1
+            session = find(record["session_id"])
+            if session is None:
+                continue
+            forget(id(session), None)
+            del record["type"], record["session_id"]
+            field = lists.get(kind)
+            if field is not None:
+                session[field].append(record)
+            elif kind == "session_end":
+                session["status"] = "completed"
+                session.update(record)
+        self.updates += updates
 
 
 class SessionTracker:
     """Tracks Claude Code sessions and changes."""
 
+    # Session directories already created by this process
+    _created_dirs: Set[Path] = set()
+
     def __init__(self, sessions_file: str = ".claude/sessions.jsonl"):
         """Initialize session tracker."""
         self.sessions_file = Path(sessions_file)
-        self.sessions_file.parent.mkdir(parents=True, exist_ok=True)
+        # Absolute, so a relative path is not mistaken for one made from another cwd
+        directory = self.sessions_file.parent.absolute()
+        if directory not in SessionTracker._created_dirs:
+            directory.mkdir(parents=True, exist_ok=True)
+            SessionTracker._created_dirs.add(directory)
+        # Sessions folded from the file, reused while the file is unchanged
+        self._log: Optional[_SessionLog] = None
+        # Records are appended through one handle, opened on first use;
+        # flush() makes them durable
+        self._fh: Optional[BinaryIO] = None
+        _trackers.add(self)
+        atexit.register(self.close)
+
+    def _get_append_fh(self) -> BinaryIO:
+        if self._fh is not None and not self._fh_is_current():
+            # compact() elsewhere replaced the file; writes to the old inode would be lost
+            self._fh.close()
+            self._fh = None
+        if self._fh is None:
+            self._fh = open(  # noqa: SIM115
+                self.sessions_file, "ab", buffering=APPEND_BUFFER_SIZE
+            )
+        return self._fh
+
+    def _fh_is_current(self) -> bool:
+        """True if the append handle still refers to the file at sessions_file."""
+        try:
+            path_stat = self.sessions_file.stat()
+        except FileNotFoundError:
+            return False
+        fh_stat = os.fstat(self._fh.fileno())
+        return (fh_stat.st_ino, fh_stat.st_dev) == (path_stat.st_ino, path_stat.st_dev)
+
+    def flush(self) -> None:
+        """fsync the records appended so far."""
+        if self._fh is not None:
+            self._fh.flush()
+            os.fsync(self._fh.fileno())
+
+    def close(self) -> None:
+        """flush, then close the append handle."""
+        if self._fh is not None:
+            self.flush()
+            self._fh.close()
+            self._fh = None
 
     def start_session(self, description: Optional[str] = None) -> str:
         """Start a new session."""
@@ -25,7 +231,7 @@ class SessionTracker:
 
         session = {
             "session_id": session_id,
-            "start_time": datetime.now().isoformat(),
+            "start_time": _now_iso(),
             "description": description or "New Claude Code session",
             "files_modified": [],
             "decisions": [],
@@ -42,137 +248,253 @@ class SessionTracker:
 
     def end_session(self, session_id: str, summary: Optional[str] = None) -> None:
         """End a session."""
-        sessions = self._load_sessions()
-
-        for session in sessions:
-            if session["session_id"] == session_id:
-                session["end_time"] = datetime.now().isoformat()
-                session["status"] = "completed"
-                if summary:
-                    session["summary"] = summary
+        if self._find_session(session_id) is None:
+            print(f"Error: Session {session_id} not found", file=sys.stderr)
+            return
 
-                self._save_sessions(sessions)
-
-                print(f"✅ Ended session: {session_id}")
-                if summary:
-                    print(f"   Summary: {summary}")
-
-                return
+        record = {
+            "type": "session_end",
+            "session_id": session_id,
+            "end_time": _now_iso(),
+        }
+        if summary:
+            record["summary"] = summary
+        self._append_record(record)
 
-        print(f"Error: Session {session_id} not found", file=sys.stderr)
+        print(f"✅ Ended session: {session_id}")
+        if summary:
+            print(f"   Summary: {summary}")
 
     def add_file(self, session_id: str, file_path: str, action: str) -> None:
         """Add a file modification to session."""
-        sessions = self._load_sessions()
-
-        for session in sessions:
-            if session["session_id"] == session_id:
-                file_entry = {
-                    "file": file_path,
-                    "action": action,
-                    "timestamp": datetime.now().isoformat(),
-                }
-
-                session["files_modified"].append(file_entry)
-
-                self._save_sessions(sessions)
-                print(f"📝 Tracked: {action} {file_path}")
-                return
-
-        print(f"Error: Session {session_id} not found", file=sys.stderr)
+        if self._find_session(session_id) is None:
+            print(f"Error: Session {session_id} not found", file=sys.stderr)
+            return
+
+        self._append_record(
+            {
+                "type": "file_add",
+                "session_id": session_id,
+                "file": file_path,
+                "action": action,
+                "timestamp": _now_iso(),
+            }
+        )
+        print(f"📝 Tracked: {action} {file_path}")
 
     def add_decision(
         self, session_id: str, decision: str, rationale: Optional[str] = None
     ) -> None:
         """Add a decision to session."""
-        sessions = self._load_sessions()
-
-        for session in sessions:
-            if session["session_id"] == session_id:
-                decision_entry = {
-                    "decision": decision,
-                    "rationale": rationale,
-                    "timestamp": datetime.now().isoformat(),
-                }
-
-                session["decisions"].append(decision_entry)
-
-                self._save_sessions(sessions)
-                print(f"💡 Decision tracked: {decision}")
-                if rationale:
-                    print(f"   Rationale: {rationale}")
-                return
-
-        print(f"Error: Session {session_id} not found", file=sys.stderr)
+        if self._find_session(session_id) is None:
+            print(f"Error: Session {session_id} not found", file=sys.stderr)
+            return
+
+        self._append_record(
+            {
+                "type": "decision_add",
+                "session_id": session_id,
+                "decision": decision,
+                "rationale": rationale,
+                "timestamp": _now_iso(),
+            }
+        )
+        print(f"💡 Decision tracked: {decision}")
+        if rationale:
+            print(f"   Rationale: {rationale}")
 
     def get_session(self, session_id: str) -> Optional[Dict[str, Any]]:
-        """Get a specific session."""
-        sessions = self._load_sessions()
+        """Get a specific session.
 
-        for session in sessions:
-            if session["session_id"] == session_id:
-                return session
-
-        return None
+        A dict lookup while the file is unchanged since it was last read or
+        appended to by this tracker.
+        """
+        return self._find_session(session_id)
 
     def list_sessions(self, limit: int = 10) -> List[Dict[str, Any]]:
         """List recent sessions."""
-        sessions = self._load_sessions()
+        key = self._file_key()
+        if key is None:
+            return []
+        if limit <= 0 or (self._log is not None and self._log.key == key):
+            sessions = self._load_log().sessions
+        else:
+            sessions = self._tail_log(limit).sessions
         return sessions[-limit:][::-1]  # Most recent first
 
+    def compact(self) -> None:
+        """Rewrite the file as one snapshot line per session, dropping update records."""
+        log = self._load_log()
+        tmp_file = self.sessions_file.with_name(self.sessions_file.name + ".tmp")
+        encoded = log.encoded
+        lines = []
+        for session in log.sessions:
+            line = encoded.get(id(session))
+            if line is None:
+                line = encoded[id(session)] = _encode(session)
+            lines.append(line)
+        # One buffer and one write rather than a write per session
+        payload = b"".join(line + b"\n" for line in lines)
+        with open(tmp_file, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        # Atomic: a crash leaves either the old file or the new one, never a mix
+        tmp_file.replace(self.sessions_file)
+
+        # The append handle still points at the replaced file
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+
+        self._log = _SessionLog(self._file_key(), log.sessions, log.by_id, 0, encoded)
+
+    def _find_session(self, session_id: str) -> Optional[Dict[str, Any]]:
+        return self._load_log().by_id.get(session_id)
+
+    def _file_key(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the sessions file, or None if it does not exist."""
+        try:
+            stat = self.sessions_file.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
     def _append_session(self, session: Dict[str, Any]) -> None:
         """Append a session to the JSONL file."""
-        with open(self.sessions_file, "a", encoding="utf-8") as f:
-            f.write(json.dumps(session) + "\n")
-
-    def _load_sessions(self) -> List[Dict[str, Any]]:
-        """Load all sessions from JSONL file."""
-        if not self.sessions_file.exists():
-            return []
-
-        sessions = []
-
-        with open(self.sessions_file, "r", encoding="utf-8") as f:
-            for line in f:
-                if line.strip():
-                    sessions.append(json.loads(line))
-
-        return sessions
-
-    def _save_sessions(self, sessions: List[Dict[str, Any]]) -> None:
-        """Save all sessions to JSONL file."""
-        with open(self.sessions_file, "w", encoding="utf-8") as f:
-            for session in sessions:
-                f.write(json.dumps(session) + "\n")
+        self._append_record(session)
+
+    def _append_record(self, record: Dict[str, Any]) -> None:
+        """Append a session snapshot or update record to the JSONL file."""
+        log = self._log
+        key = self._file_key()
+        log_valid = log is not None and log.key == key
+        if not log_valid and (key is None or key[1] == 0):
+            # Nothing to read back yet, so this record starts the index
+            log = _SessionLog(key, [], {})
+            log_valid = True
+
+        # Handed to the OS right away, so the file's stat reflects it, but only
+        # fsynced by flush()
+        line = _encode(record)
+        fh = self._get_append_fh()
+        fh.write(line + b"\n")
+        fh.flush()
+
+        if not log_valid:
+            self._log = None
+            return
+
+        log.apply(record)
+        if "type" not in record:
+            log.encoded[id(record)] = line
+        log.key = self._file_key()
+        self._log = log
+        if log.updates > COMPACT_AFTER_UPDATES:
+            self.compact()
+
+    def _tail_log(self, count: int) -> "_SessionLog":
+        """Sessions folded from only the end of the file, enough to hold the last
+        count sessions.
+
+        Updates always follow their session's snapshot, so once the window reaches
+        back to the count-th last snapshot it holds every update for those sessions.
+        """
+        records: List[Dict[str, Any]] = []
+        snapshots = 0
+        with open(self.sessions_file, "rb") as f:
+            size = f.seek(0, os.SEEK_END)
+            window = TAIL_READ_SIZE
+            # Each larger window only reads and decodes the bytes before the
+            # previous one, plus the line the previous window started inside
+            end = size
+            partial = b""
+            while True:
+                start = max(0, size - window)
+                f.seek(start)
+                lines = (f.read(end - start) + partial).split(b"\n")
+                if start > 0:
+                    partial = lines.pop(0)  # Starts mid-line
+                earlier = [
+                    _decode(line)
+                    for line in lines
+                    if line and (line[0] > 0x20 or line.strip())
+                ]
+                snapshots += sum(1 for record in earlier if "type" not in record)
+                records = earlier + records
+                end = start
+                if snapshots >= count or start == 0:
+                    break
+                window *= 2
+
+        log = _SessionLog(None, [], {})
+        log.fold(records)
+        return log
+
+    def _load_log(self) -> "_SessionLog":
+        """Sessions folded from the JSONL file.
+
+        Reused while the file is unchanged, so callers must not modify the sessions.
+        """
+        key = self._file_key()
+        if key is None:
+            self._log = None
+            return _SessionLog(None, [], {})
+        if self._log is not None and self._log.key == key:
+            return self._log
+
+        log = _SessionLog(key, [], {})
+        with open(self.sessions_file, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            # mmap cannot map an empty file
+            if size:
+                # Parsing allocates a container per record, which sets off
+                # collections that find nothing: records never form cycles
+                pause_gc = size >= LARGE_LOG_SIZE and gc.isenabled()
+                if pause_gc:
+                    gc.disable()
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        log.fold(_mapped_records(mm))
+                finally:
+                    if pause_gc:
+                        gc.enable()
+
+        self._log = log
+        return log
 
     def print_session(self, session: Dict[str, Any]) -> None:
         """Print session details."""
-        print(f"\n📊 Session: {session['session_id']}")
-        print(f"   Status: {session['status']}")
-        print(f"   Started: {session['start_time']}")
+        # Collected and written once rather than a print per line
+        lines = [
+            f"\n📊 Session: {session['session_id']}",
+            f"   Status: {session['status']}",
+            f"   Started: {session['start_time']}",
+        ]
 
         if "end_time" in session:
-            print(f"   Ended: {session['end_time']}")
+            lines.append(f"   Ended: {session['end_time']}")
 
         if "description" in session:
-            print(f"   Description: {session['description']}")
+            lines.append(f"   Description: {session['description']}")
 
         if session.get("files_modified"):
-            print(f"\n   Files Modified ({len(session['files_modified'])}):")
+            lines.append(f"\n   Files Modified ({len(session['files_modified'])}):")
             for file_entry in session["files_modified"]:
-                print(f"      {file_entry['action']}: {file_entry['file']}")
+                lines.append(f"      {file_entry['action']}: {file_entry['file']}")
 
         if session.get("decisions"):
-            print(f"\n   Decisions ({len(session['decisions'])}):")
+            lines.append(f"\n   Decisions ({len(session['decisions'])}):")
             for decision in session["decisions"]:
-                print(f"      - {decision['decision']}")
+                lines.append(f"      - {decision['decision']}")
                 if decision.get("rationale"):
-                    print(f"        Rationale: {decision['rationale']}")
+                    lines.append(f"        Rationale: {decision['rationale']}")
 
         if "summary" in session:
-            print(f"\n   Summary: {session['summary']}")
+            lines.append(f"\n   Summary: {session['summary']}")
 
-        print()
+        lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> None:
@@ -213,6 +535,9 @@ def main() -> None:
         "-n", "--limit", type=int, default=10, help="Number of sessions to show"
     )
 
+    # Compact the sessions file
+    subparsers.add_parser("compact", help="Rewrite the sessions file without updates")
+
     args = parser.parse_args()
 
     if not args.command:
@@ -235,19 +560,24 @@ def main() -> None:
             tracker.print_session(session)
         else:
             print(f"Error: Session {args.session_id} not found", file=sys.stderr)
+    elif args.command == "compact":
+        tracker.compact()
     elif args.command == "list":
         sessions = tracker.list_sessions(args.limit)
         if not sessions:
             print("No sessions found")
         else:
-            print("\nRecent Sessions:")
+            lines = ["\nRecent Sessions:"]
             for session in sessions:
                 status_icon = "✅" if session["status"] == "completed" else "🔄"
-                print(
-                    f"  {status_icon} {session['session_id']}: {session.get('description', 'No description')}"
+                description = session.get("description", "No description")
+                lines.append(f"  {status_icon} {session['session_id']}: {description}")
+                lines.append(
+                    f"      Files: {len(session.get('files_modified', []))}, "
+                    f"Decisions: {len(session.get('decisions', []))}"
                 )
-                print(f"      Files: {len(session.get('files_modified', []))}, "
-                      f"Decisions: {len(session.get('decisions', []))}")
+            sys.stdout.write("\n".join(lines) + "\n")
+            sys.stdout.flush()
 
 
 if __name__ == "__main__":